@@ -6,32 +6,101 @@ Author: Learning Developer
 
 import kivy
 from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager, Screen
+from kivy.uix.screenmanager import ScreenManager, Screen, SlideTransition, NoTransition
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.textinput import TextInput
 from kivy.uix.progressbar import ProgressBar
+from kivy.uix.slider import Slider
 from kivy.uix.popup import Popup
 from kivy.uix.image import Image
+from kivy.uix.stencilview import StencilView
+from kivy.uix.widget import Widget
 from kivy.uix.card import MDCard
 from kivy.clock import Clock
+from kivy.core.image import ImageLoader
+from kivy.core.window import Window
+from kivy.factory import Factory
 from kivy.animation import Animation
-from kivy.graphics import Color, Rectangle, RoundedRectangle
-from kivy.metrics import dp
-from kivy.utils import get_color_from_hex
+from kivy.graphics import (
+    Color, InstructionGroup, Line, Mesh, PopMatrix, PushMatrix, Rectangle, RenderContext, RoundedRectangle, Scale, Translate
+)
+from kivy.metrics import Metrics, dp
+from kivy.properties import ColorProperty, StringProperty
+from kivy.utils import get_color_from_hex, platform
 import requests
+from datetime import datetime, timezone
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import bisect
 import json
-from datetime import datetime
+import math
+import os
+import tempfile
 import threading
+import time
+import weakref
+
+from f1_data import (
+    ATLAS_DIR, AlertQueue, ChampionshipSimulator, CircuitGeometry, F1DataManager, NewsFeed, PrefetchWorker, RaceTimeline,
+    SERIES, SETTINGS_SCHEMA, SeriesHub, SessionClock, SettingsStore, StrategyAnalysis, asset_id, density_bucket, format_bytes, format_countdown,
+    format_relative_time, lttb, parse_lap_time, project_rejoin
+)
 
 # Require minimum Kivy version
 kivy.require('2.0.0')
 
-class CustomCard(BoxLayout):
+class ThemedBehavior:
+    """Mixin for widgets whose colours follow the app theme
+    
+    THEMED maps each colour property to the property naming its palette
+    role. Changing a role recolours the widget; an empty role leaves the
+    widget's own colour alone.
+    """
+    
+    THEMED = {}
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bind(**{role_property: self.on_role for role_property in self.THEMED.values()})
+        App.get_running_app().theme.register(self)
+    
+    def on_role(self, *args):
+        self.apply_theme(App.get_running_app().theme.palette)
+    
+    def apply_theme(self, palette):
+        for color_property, role_property in self.THEMED.items():
+            role = getattr(self, role_property)
+            if role:
+                setattr(self, color_property, palette[role])
+
+class ThemedLabel(ThemedBehavior, Label):
+    """Label whose text colour is a theme role"""
+    
+    THEMED = {'color': 'color_role'}
+    color_role = StringProperty('TEXT_PRIMARY')
+
+class ThemedButton(ThemedBehavior, Button):
+    """Button whose text and background colours are theme roles"""
+    
+    THEMED = {'color': 'color_role', 'background_color': 'background_role'}
+    color_role = StringProperty('')
+    background_role = StringProperty('')
+
+class CustomCard(ThemedBehavior, BoxLayout):
     """Custom card widget for professional UI components"""
     
+    THEMED = {'background_color': 'background_role'}
+    background_color = ColorProperty([1, 1, 1, 1])
+    background_role = StringProperty('CARD_BACKGROUND')
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.orientation = 'vertical'
@@ -42,19 +111,20 @@ class CustomCard(BoxLayout):
         
         # Add background with rounded corners
         with self.canvas.before:
-            Color(1, 1, 1, 1)  # White background
+            self.bg_color = Color(*self.background_color)
             self.bg_rect = RoundedRectangle(
                 pos=self.pos, 
                 size=self.size,
                 radius=[dp(10)]
             )
         
-        # Update background when size/position changes
-        self.bind(pos=self.update_bg, size=self.update_bg)
+        # Update background when size/position/colour changes
+        self.bind(pos=self.update_bg, size=self.update_bg, background_color=self.update_bg)
     
     def update_bg(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
+        self.bg_color.rgba = self.background_color
 
 class DriverCard(CustomCard):
     """Professional driver standings card component"""
@@ -67,119 +137,131 @@ class DriverCard(CustomCard):
         
         # Position circle
         pos_layout = BoxLayout(size_hint_x=0.2)
-        position_label = Label(
-            text=str(driver_data['position']),
+        self.position_label = ThemedLabel(
             font_size=dp(18),
             bold=True,
-            color=get_color_from_hex('#1a1a1a')
+            color_role='TEXT_PRIMARY'
         )
-        pos_layout.add_widget(position_label)
+        pos_layout.add_widget(self.position_label)
         
         # Driver info
         driver_info = BoxLayout(orientation='vertical', size_hint_x=0.6)
-        name_label = Label(
-            text=driver_data['name'],
+        self.name_label = ThemedLabel(
             font_size=dp(16),
             bold=True,
             text_size=(None, None),
             halign='left',
-            color=get_color_from_hex('#1a1a1a')
+            color_role='TEXT_PRIMARY'
         )
-        team_label = Label(
-            text=driver_data['team'],
+        self.team_label = ThemedLabel(
             font_size=dp(12),
             text_size=(None, None),
             halign='left',
-            color=get_color_from_hex('#666666')
+            color_role='TEXT_SECONDARY'
         )
-        driver_info.add_widget(name_label)
-        driver_info.add_widget(team_label)
+        driver_info.add_widget(self.name_label)
+        driver_info.add_widget(self.team_label)
+        
+        # Headshot, when the atlas has one for this driver
+        photo = App.get_running_app().asset_atlas.image('drivers', driver_data['name'], size_hint_x=0.15)
         
         # Points
         points_layout = BoxLayout(orientation='vertical', size_hint_x=0.2)
-        points_label = Label(
-            text=str(driver_data['points']),
+        self.points_label = ThemedLabel(
             font_size=dp(20),
             bold=True,
-            color=get_color_from_hex('#e10600')
+            color_role='PRIMARY_COLOR'
         )
-        pts_text = Label(
+        pts_text = ThemedLabel(
             text='PTS',
             font_size=dp(10),
-            color=get_color_from_hex('#666666')
+            color_role='TEXT_SECONDARY'
         )
-        points_layout.add_widget(points_label)
+        points_layout.add_widget(self.points_label)
         points_layout.add_widget(pts_text)
         
         header.add_widget(pos_layout)
+        if photo is not None:
+            driver_info.size_hint_x = 0.45
+            header.add_widget(photo)
         header.add_widget(driver_info)
         header.add_widget(points_layout)
         
         # Stats row
         stats_row = BoxLayout(orientation='horizontal', size_hint_y=0.3)
-        wins_label = Label(
-            text=f"Wins: {driver_data['wins']}",
+        self.wins_label = ThemedLabel(
             font_size=dp(12),
-            color=get_color_from_hex('#666666')
+            color_role='TEXT_SECONDARY'
         )
-        podiums_label = Label(
-            text=f"Podiums: {driver_data['podiums']}",
+        self.podiums_label = ThemedLabel(
             font_size=dp(12),
-            color=get_color_from_hex('#666666')
+            color_role='TEXT_SECONDARY'
         )
-        stats_row.add_widget(wins_label)
-        stats_row.add_widget(podiums_label)
+        stats_row.add_widget(self.wins_label)
+        stats_row.add_widget(self.podiums_label)
         
         self.add_widget(header)
         self.add_widget(stats_row)
+        self.show(driver_data)
+    
+    def show(self, driver_data):
+        """Fill in the figures, again whenever this driver's standings row changes"""
+        self.data = driver_data
+        self.position_label.text = str(driver_data['position'])
+        self.name_label.text = driver_data['name']
+        self.team_label.text = driver_data['team']
+        self.points_label.text = str(driver_data['points'])
+        self.wins_label.text = f"Wins: {driver_data['wins']}"
+        self.podiums_label.text = f"Podiums: {driver_data.get('podiums', 0)}"
 
 class RaceCard(CustomCard):
     """Professional race schedule card component"""
     
-    def __init__(self, race_data, **kwargs):
+    def __init__(self, race_data, weekend=None, on_details=None, **kwargs):
         super().__init__(**kwargs)
+        weekend = weekend or {}
         
         # Race header
         header = BoxLayout(orientation='horizontal', size_hint_y=0.4)
         
         # Round number
         round_layout = BoxLayout(size_hint_x=0.15)
-        round_label = Label(
+        round_label = ThemedLabel(
             text=f"R{race_data['round']}",
             font_size=dp(14),
             bold=True,
-            color=get_color_from_hex('#e10600')
+            color_role='PRIMARY_COLOR'
         )
         round_layout.add_widget(round_label)
         
         # Race info
         race_info = BoxLayout(orientation='vertical', size_hint_x=0.7)
-        name_label = Label(
+        name_label = ThemedLabel(
             text=race_data['name'],
             font_size=dp(14),
             bold=True,
             text_size=(None, None),
             halign='left',
-            color=get_color_from_hex('#1a1a1a')
+            color_role='TEXT_PRIMARY'
         )
-        circuit_label = Label(
+        circuit_label = ThemedLabel(
             text=race_data['circuit'],
             font_size=dp(11),
             text_size=(None, None),
             halign='left',
-            color=get_color_from_hex('#666666')
+            color_role='TEXT_SECONDARY'
         )
         race_info.add_widget(name_label)
         race_info.add_widget(circuit_label)
         
         # Status
         status_layout = BoxLayout(size_hint_x=0.15)
-        status_color = '#28a745' if race_data['status'] == 'completed' else '#007bff'
-        status_label = Label(
+        status_role = 'SUCCESS_COLOR' if race_data['status'] == 'completed' else 'INFO_COLOR'
+        status_label = ThemedLabel(
             text=race_data['status'].upper(),
             font_size=dp(10),
             bold=True,
-            color=get_color_from_hex(status_color)
+            color_role=status_role
         )
         status_layout.add_widget(status_label)
         
@@ -189,22 +271,52 @@ class RaceCard(CustomCard):
         
         # Date and winner
         bottom_row = BoxLayout(orientation='horizontal', size_hint_y=0.3)
-        date_label = Label(
+        date_label = ThemedLabel(
             text=race_data['date'],
             font_size=dp(12),
-            color=get_color_from_hex('#666666')
+            color_role='TEXT_SECONDARY'
         )
-        winner_text = f"Winner: {race_data.get('winner', 'TBD')}"
-        winner_label = Label(
-            text=winner_text,
+        race = weekend.get('Race')
+        winner = race['rows'][0]['name'] if race and race['rows'] else race_data.get('winner', 'TBD')
+        winner_label = ThemedLabel(
+            text=f"Winner: {winner}",
             font_size=dp(12),
-            color=get_color_from_hex('#666666')
+            color_role='TEXT_SECONDARY'
         )
         bottom_row.add_widget(date_label)
         bottom_row.add_widget(winner_label)
         
         self.add_widget(header)
         self.add_widget(bottom_row)
+        
+        # Pole and sprint winner, straight from the prefetched weekend
+        if weekend:
+            detail_row = BoxLayout(orientation='horizontal', size_hint_y=0.3)
+            summary = []
+            qualifying = weekend.get('Qualifying')
+            if qualifying and qualifying['rows']:
+                summary.append(f"Pole: {qualifying['rows'][0]['name']}")
+            sprint = weekend.get('Sprint')
+            if sprint and sprint['rows']:
+                summary.append(f"Sprint: {sprint['rows'][0]['name']}")
+            detail_row.add_widget(ThemedLabel(
+                text='   '.join(summary),
+                font_size=dp(11),
+                size_hint_x=0.65,
+                color_role='TEXT_SECONDARY'
+            ))
+            details_btn = ThemedButton(
+                text='Weekend',
+                font_size=dp(11),
+                size_hint_x=0.35,
+                background_normal='',
+                background_role='NAV_INACTIVE'
+            )
+            if on_details is not None:
+                details_btn.bind(on_press=lambda instance: on_details(race_data, weekend))
+            detail_row.add_widget(details_btn)
+            self.height = dp(150)
+            self.add_widget(detail_row)
 
 class StandingsScreen(Screen):
     """Driver and Constructor Standings Screen"""
@@ -218,129 +330,225 @@ class StandingsScreen(Screen):
         
         # Header
         header = BoxLayout(orientation='horizontal', size_hint_y=0.1)
-        title = Label(
+        title = ThemedLabel(
             text='Championship Standings',
             font_size=dp(20),
             bold=True,
-            color=get_color_from_hex('#1a1a1a')
+            size_hint_x=0.7,
+            color_role='TEXT_PRIMARY'
         )
         header.add_widget(title)
         
+        # Series switch, steps through the followed series
+        self.series_button = ThemedButton(
+            text=dict(SERIES)['f1'],
+            font_size=dp(12),
+            size_hint_x=0.3,
+            background_normal='',
+            background_role='NAV_INACTIVE'
+        )
+        self.series_button.bind(on_press=self.next_series)
+        header.add_widget(self.series_button)
+        
         # Tab buttons
         tab_layout = BoxLayout(orientation='horizontal', size_hint_y=0.08, spacing=dp(5))
         
-        drivers_btn = Button(
+        drivers_btn = ThemedButton(
             text='Drivers',
-            background_color=get_color_from_hex('#e10600'),
+            background_normal='',
+            background_role='PRIMARY_COLOR',
             font_size=dp(14),
             bold=True
         )
-        constructors_btn = Button(
+        constructors_btn = ThemedButton(
             text='Constructors',
             background_normal='',
-            background_color=get_color_from_hex('#cccccc'),
+            background_role='NAV_INACTIVE',
             font_size=dp(14)
         )
         
         drivers_btn.bind(on_press=self.show_drivers)
         constructors_btn.bind(on_press=self.show_constructors)
+        self.tab_buttons = {'drivers': drivers_btn, 'constructors': constructors_btn}
         
         tab_layout.add_widget(drivers_btn)
         tab_layout.add_widget(constructors_btn)
         
-        # Scrollable content
-        scroll = ScrollView()
-        self.content_layout = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None)
-        self.content_layout.bind(minimum_height=self.content_layout.setter('height'))
-        
-        scroll.add_widget(self.content_layout)
+        # Scrollable content - each tab's cards live in their own cached subtree
+        self.scroll = ScrollView()
+        self.subtrees = {}  # (series, tab) -> laid out card layout
+        self.cards = {}     # (series, tab) -> {driver or team name: card}
+        self.loading = set()
+        self.current_tab = 'drivers'
         
         main_layout.add_widget(header)
         main_layout.add_widget(tab_layout)
-        main_layout.add_widget(scroll)
+        main_layout.add_widget(self.scroll)
         
         self.add_widget(main_layout)
         
+        # Standings changes are pushed from each series' store, whoever fetched or synced them
+        season = App.get_running_app().data_manager.current_season
+        self.slices = {'drivers': f"standings/drivers/{season}", 'constructors': f"standings/constructors/{season}"}
+        self.series = 'f1'
+        self.watched = set()
+        self.watch_series('f1')
+        
         # Load initial data
         self.show_drivers(None)
     
+    def watch_series(self, series):
+        """Subscribe to a series' standings, the first time it's shown"""
+        if series in self.watched:
+            return
+        self.watched.add(series)
+        store = App.get_running_app().series.manager(series).store
+        for tab, name in self.slices.items():
+            store.subscribe(name, lambda standings, tab=tab: self.show_standings(series, tab, standings))
+    
+    def next_series(self, instance):
+        enabled = App.get_running_app().series.enabled()
+        self.series = enabled[(enabled.index(self.series) + 1) % len(enabled)] if self.series in enabled else 'f1'
+        self.series_button.text = dict(SERIES)[self.series]
+        self.watch_series(self.series)
+        self.show_tab(self.current_tab)
+    
     def show_drivers(self, instance):
         """Display driver standings"""
-        self.content_layout.clear_widgets()
-        
-        # Mock driver data - In production, fetch from F1 API
-        drivers_data = [
-            {'position': 1, 'name': 'Max Verstappen', 'team': 'Red Bull Racing', 'points': 575, 'wins': 19, 'podiums': 21},
-            {'position': 2, 'name': 'Sergio Pérez', 'team': 'Red Bull Racing', 'points': 285, 'wins': 2, 'podiums': 8},
-            {'position': 3, 'name': 'Lewis Hamilton', 'team': 'Mercedes', 'points': 234, 'wins': 3, 'podiums': 7},
-            {'position': 4, 'name': 'Fernando Alonso', 'team': 'Aston Martin', 'points': 206, 'wins': 0, 'podiums': 8},
-            {'position': 5, 'name': 'Charles Leclerc', 'team': 'Ferrari', 'points': 206, 'wins': 1, 'podiums': 6},
-            {'position': 6, 'name': 'Lando Norris', 'team': 'McLaren', 'points': 205, 'wins': 0, 'podiums': 7},
-            {'position': 7, 'name': 'Carlos Sainz Jr.', 'team': 'Ferrari', 'points': 200, 'wins': 1, 'podiums': 4},
-            {'position': 8, 'name': 'George Russell', 'team': 'Mercedes', 'points': 175, 'wins': 1, 'podiums': 4}
-        ]
-        
-        for driver in drivers_data:
-            card = DriverCard(driver)
-            self.content_layout.add_widget(card)
+        self.show_tab('drivers')
     
     def show_constructors(self, instance):
         """Display constructor standings"""
-        self.content_layout.clear_widgets()
-        
-        # Mock constructor data
-        constructors_data = [
-            {'position': 1, 'name': 'Red Bull Racing Honda RBPT', 'points': 860, 'wins': 21},
-            {'position': 2, 'name': 'Mercedes', 'points': 409, 'wins': 4},
-            {'position': 3, 'name': 'Ferrari', 'points': 406, 'wins': 2},
-            {'position': 4, 'name': 'McLaren Mercedes', 'points': 302, 'wins': 0},
-            {'position': 5, 'name': 'Aston Martin Aramco Mercedes', 'points': 280, 'wins': 0},
-            {'position': 6, 'name': 'Alpine Renault', 'points': 120, 'wins': 0},
-            {'position': 7, 'name': 'Williams Mercedes', 'points': 28, 'wins': 0},
-            {'position': 8, 'name': 'AlphaTauri Honda RBPT', 'points': 25, 'wins': 0}
-        ]
+        self.show_tab('constructors')
+    
+    def on_enter(self, *args):
+        self.show_tab(self.current_tab)
+    
+    def show_tab(self, tab):
+        """Swap in the tab's subtree, loading the standings only when nothing has published them yet"""
+        self.current_tab = tab
+        for name, button in self.tab_buttons.items():
+            if name == tab:
+                button.background_role = 'PRIMARY_COLOR'
+            else:
+                button.background_normal = ''
+                button.background_role = 'NAV_INACTIVE'
+        
+        key = (self.series, tab)
+        if key in self.subtrees:
+            self.show_subtree(self.subtrees[key])
+            return
+        
+        standings = App.get_running_app().series.manager(self.series).store.get(self.slices[tab])
+        if standings is not None:
+            self.show_standings(self.series, tab, standings)
+        elif key not in self.loading:
+            self.loading.add(key)
+            threading.Thread(target=self.load_standings, args=key, daemon=True).start()
+    
+    def show_subtree(self, subtree):
+        if self.scroll.children and self.scroll.children[0] is subtree:
+            return
+        self.scroll.clear_widgets()
+        self.scroll.add_widget(subtree)
+    
+    def load_standings(self, series, tab):
+        """Fetch a tab's standings; they arrive through the store subscription"""
+        data_manager = App.get_running_app().series.manager(series)
+        if tab == 'drivers':
+            data_manager.get_driver_standings()
+        else:
+            data_manager.get_constructor_standings()
+        Clock.schedule_once(lambda dt: self.loading.discard((series, tab)))
+    
+    def show_standings(self, series, tab, standings):
+        """Bring a tab's cards up to date, touching only the rows that changed
+        
+        Cards are kept per driver or team, so a changed row is patched in
+        place and rows that swapped places are only re-ordered.
+        """
+        key = (series, tab)
+        subtree = self.subtrees.get(key)
+        if subtree is None:
+            subtree = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None)
+            subtree.bind(minimum_height=subtree.setter('height'))
+            self.subtrees[key] = subtree
+        
+        cards = self.cards.setdefault(key, {})
+        card_class = DriverCard if tab == 'drivers' else ConstructorCard
+        ordered = []
+        for entry in standings:
+            card = cards.get(entry['name'])
+            if card is None:
+                card = cards[entry['name']] = card_class(entry)
+            elif card.data != entry:
+                card.show(entry)
+            ordered.append(card)
+        
+        for name in set(cards) - {entry['name'] for entry in standings}:
+            del cards[name]
+        if subtree.children[::-1] != ordered:  # Kivy keeps children last-added first
+            subtree.clear_widgets()
+            for card in ordered:
+                subtree.add_widget(card)
+        
+        if key == (self.series, self.current_tab):
+            self.show_subtree(subtree)
+
+class ConstructorCard(CustomCard):
+    """Constructor standings row"""
+    
+    def __init__(self, constructor_data, **kwargs):
+        super().__init__(**kwargs)
         
-        for constructor in constructors_data:
-            card = CustomCard()
-            
-            # Constructor info layout
-            info_layout = BoxLayout(orientation='horizontal')
-            
-            # Position
-            pos_label = Label(
-                text=str(constructor['position']),
-                font_size=dp(18),
-                bold=True,
-                size_hint_x=0.1,
-                color=get_color_from_hex('#1a1a1a')
-            )
-            
-            # Name
-            name_label = Label(
-                text=constructor['name'],
-                font_size=dp(14),
-                bold=True,
-                text_size=(None, None),
-                halign='left',
-                size_hint_x=0.6,
-                color=get_color_from_hex('#1a1a1a')
-            )
-            
-            # Points
-            points_label = Label(
-                text=f"{constructor['points']} PTS",
-                font_size=dp(16),
-                bold=True,
-                size_hint_x=0.3,
-                color=get_color_from_hex('#e10600')
-            )
-            
-            info_layout.add_widget(pos_label)
-            info_layout.add_widget(name_label)
-            info_layout.add_widget(points_label)
-            
-            card.add_widget(info_layout)
-            self.content_layout.add_widget(card)
+        # Constructor info layout
+        info_layout = BoxLayout(orientation='horizontal')
+        
+        # Position
+        self.position_label = ThemedLabel(
+            font_size=dp(18),
+            bold=True,
+            size_hint_x=0.1,
+            color_role='TEXT_PRIMARY'
+        )
+        
+        # Name
+        name_label = ThemedLabel(
+            text=constructor_data['name'],
+            font_size=dp(14),
+            bold=True,
+            text_size=(None, None),
+            halign='left',
+            size_hint_x=0.6,
+            color_role='TEXT_PRIMARY'
+        )
+        
+        # Points
+        self.points_label = ThemedLabel(
+            font_size=dp(16),
+            bold=True,
+            size_hint_x=0.3,
+            color_role='PRIMARY_COLOR'
+        )
+        
+        # Team logo, when the atlas has one
+        logo = App.get_running_app().asset_atlas.image('teams', constructor_data['name'], size_hint_x=0.15)
+        
+        info_layout.add_widget(self.position_label)
+        if logo is not None:
+            name_label.size_hint_x = 0.45
+            info_layout.add_widget(logo)
+        info_layout.add_widget(name_label)
+        info_layout.add_widget(self.points_label)
+        
+        self.add_widget(info_layout)
+        self.show(constructor_data)
+    
+    def show(self, constructor_data):
+        """Fill in the figures, again whenever this team's standings row changes"""
+        self.data = constructor_data
+        self.position_label.text = str(constructor_data['position'])
+        self.points_label.text = f"{constructor_data['points']} PTS"
 
 class ScheduleScreen(Screen):
     """Race Schedule Screen"""
@@ -354,38 +562,462 @@ class ScheduleScreen(Screen):
         
         # Header
         header = BoxLayout(orientation='horizontal', size_hint_y=0.1)
-        title = Label(
-            text='2023 Race Schedule',
+        self.title_label = ThemedLabel(
+            text='Race Schedule',
             font_size=dp(20),
             bold=True,
-            color=get_color_from_hex('#1a1a1a')
+            color_role='TEXT_PRIMARY'
         )
-        header.add_widget(title)
+        header.add_widget(self.title_label)
         
         # Scrollable race list
         scroll = ScrollView()
-        content_layout = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None)
-        content_layout.bind(minimum_height=content_layout.setter('height'))
-        
-        # Mock race data
-        races_data = [
-            {'round': 22, 'name': 'Abu Dhabi Grand Prix', 'circuit': 'Yas Marina Circuit', 'date': 'Nov 26, 2023', 'status': 'upcoming'},
-            {'round': 21, 'name': 'Las Vegas Grand Prix', 'circuit': 'Las Vegas Street Circuit', 'date': 'Nov 19, 2023', 'status': 'completed', 'winner': 'Max Verstappen'},
-            {'round': 20, 'name': 'Brazilian Grand Prix', 'circuit': 'Autódromo José Carlos Pace', 'date': 'Nov 05, 2023', 'status': 'completed', 'winner': 'Max Verstappen'},
-            {'round': 19, 'name': 'United States Grand Prix', 'circuit': 'Circuit of The Americas', 'date': 'Oct 22, 2023', 'status': 'completed', 'winner': 'Max Verstappen'},
-            {'round': 18, 'name': 'Mexico City Grand Prix', 'circuit': 'Autódromo Hermanos Rodríguez', 'date': 'Oct 29, 2023', 'status': 'completed', 'winner': 'Max Verstappen'},
-            {'round': 17, 'name': 'Japanese Grand Prix', 'circuit': 'Suzuka International Racing Course', 'date': 'Sep 24, 2023', 'status': 'completed', 'winner': 'Max Verstappen'}
-        ]
-        
-        for race in races_data:
-            card = RaceCard(race)
-            content_layout.add_widget(card)
+        self.content_layout = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None)
+        self.content_layout.bind(minimum_height=self.content_layout.setter('height'))
+        self.loading = False
         
-        scroll.add_widget(content_layout)
+        scroll.add_widget(self.content_layout)
         main_layout.add_widget(header)
         main_layout.add_widget(scroll)
         
         self.add_widget(main_layout)
+        
+        # Cards follow the season's published schedule and weekend results
+        store = App.get_running_app().data_manager.store
+        self.season = App.get_running_app().data_manager.current_season
+        self.title_label.text = f"{self.season} Race Schedule"
+        self.schedule = []
+        self.weekends = {}
+        self.cards = {}  # round -> (race, weekend, card)
+        store.subscribe(f"schedule/{self.season}", self.on_schedule, call_now=True)
+        store.subscribe(f"weekends/{self.season}", self.on_weekends, call_now=True)
+    
+    def on_enter(self, *args):
+        if not self.schedule and not self.loading:
+            self.loading = True
+            threading.Thread(target=self.load_schedule, daemon=True).start()
+    
+    def load_schedule(self):
+        """Fetch the schedule and every finished weekend of the season in one batch"""
+        data_manager = App.get_running_app().data_manager
+        data_manager.get_race_schedule(self.season)
+        try:
+            data_manager.prefetch_weekends(self.season)
+        except (requests.RequestException, KeyError, ValueError):
+            pass  # Cards still show the schedule, just without weekend detail
+        Clock.schedule_once(lambda dt: setattr(self, 'loading', False))
+    
+    def on_schedule(self, schedule):
+        self.schedule = schedule
+        self.show_schedule()
+    
+    def on_weekends(self, weekends):
+        self.weekends = weekends
+        self.show_schedule()
+    
+    def show_schedule(self):
+        """Rebuild only the cards whose race or weekend results changed"""
+        ordered = []
+        for race in sorted(self.schedule, key=lambda race: race['round'], reverse=True):
+            weekend = self.weekends.get(race['round'])
+            cached = self.cards.get(race['round'])
+            if cached is None or cached[0] != race or cached[1] != weekend:
+                cached = self.cards[race['round']] = (race, weekend, RaceCard(race, weekend, on_details=self.show_weekend))
+            ordered.append(cached[2])
+        
+        if self.content_layout.children[::-1] != ordered:
+            self.content_layout.clear_widgets()
+            for card in ordered:
+                self.content_layout.add_widget(card)
+    
+    def show_weekend(self, race, weekend):
+        """Popup with each session's classification, qualifying split at its cutoff lines"""
+        content = BoxLayout(orientation='vertical', spacing=dp(5))
+        scroll = ScrollView()
+        rows = BoxLayout(orientation='vertical', spacing=dp(2), size_hint_y=None)
+        rows.bind(minimum_height=rows.setter('height'))
+        
+        def add_row(text, color_role='TEXT_PRIMARY', bold=False):
+            rows.add_widget(ThemedLabel(
+                text=text,
+                font_size=dp(12),
+                bold=bold,
+                size_hint_y=None,
+                height=dp(22),
+                color_role=color_role
+            ))
+        
+        qualifying = weekend.get('Qualifying')
+        if qualifying:
+            add_row('Qualifying', 'PRIMARY_COLOR', bold=True)
+            cutoffs = {cutoff['position']: (part, cutoff) for part, cutoff in qualifying['cutoffs'].items()}
+            for row in qualifying['rows']:
+                # Times and gaps are from the last part each driver ran, Q1 knockouts against the Q1 fastest
+                gap = 'POLE' if row['position'] == 1 else f"+{row['gap']:.3f}" if row['gap'] is not None else ''
+                time_set = f"{row['gap_part']} {row[row['gap_part'].lower()]}" if row.get('gap_part') else '-'
+                add_row(f"P{row['position']}  {row['code'] or row['name']}  {time_set}  {gap}")
+                # Qualifying order puts the knockout line just below the last car through
+                cutoff = cutoffs.get(row['position'])
+                if cutoff is not None:
+                    part, line = cutoff
+                    add_row(f"{part} cutoff {line['time']}  (next car +{line['margin']:.3f})", 'WARNING_COLOR')
+        
+        for session, shown in (('Sprint', 8), ('Race', 10)):
+            record = weekend.get(session)
+            if record:
+                add_row(session, 'PRIMARY_COLOR', bold=True)
+                for row in record['rows'][:shown]:
+                    add_row(f"P{row['position']}  {row['code'] or row['name']}  {row['team']}  {row['gap']}")
+        
+        scroll.add_widget(rows)
+        close_btn = ThemedButton(
+            text='Close',
+            size_hint_y=None,
+            height=dp(40),
+            background_role='PRIMARY_COLOR',
+            font_size=dp(12)
+        )
+        content.add_widget(scroll)
+        content.add_widget(close_btn)
+        
+        popup = Popup(
+            title=race['name'],
+            content=content,
+            size_hint=(0.9, 0.8)
+        )
+        close_btn.bind(on_press=popup.dismiss)
+        popup.open()
+
+class LineChart(ThemedBehavior, StencilView):
+    """Multi-series line chart drawn as one Line instruction per series
+    
+    Each series keeps a level-of-detail pyramid built with LTTB, so a
+    redraw only slices the visible range from the coarsest level that
+    still has enough points and decimates it to about one point per two
+    pixels. Drag pans, pinch or mouse wheel zooms; redraws are coalesced
+    to at most one per frame.
+    """
+    
+    THEMED = {'axis_color': 'axis_role'}
+    axis_color = ColorProperty([0.4, 0.4, 0.4, 1])
+    axis_role = StringProperty('TEXT_SECONDARY')
+    
+    SERIES_COLORS = [
+        '#e10600', '#007bff', '#28a745', '#ffc107', '#6f42c1', '#fd7e14', '#20c997', '#e83e8c', '#17a2b8', '#795548'
+    ]
+    MIN_LEVEL_POINTS = 256
+    MIN_SPAN = 2
+    
+    def __init__(self, y_from_zero=True, **kwargs):
+        super().__init__(**kwargs)
+        self.y_from_zero = y_from_zero
+        self.series = []
+        self.x_range = (0, 1)
+        self.y_range = (0, 1)
+        self.view = [0, 1]
+        self.touches = []
+        self.pinch_distance = None
+        self.colors = [tuple(get_color_from_hex(color)) for color in self.SERIES_COLORS]
+        self._redraw = Clock.create_trigger(self.redraw)
+        
+        with self.canvas:
+            self.axis_instruction = Color(*self.axis_color)
+            self.axes = Line(points=[], width=1)
+        self.series_group = InstructionGroup()
+        self.canvas.add(self.series_group)
+        
+        self.bind(pos=self._redraw, size=self._redraw, axis_color=self.update_axis_color)
+    
+    def update_axis_color(self, *args):
+        self.axis_instruction.rgba = self.axis_color
+    
+    def set_series(self, series):
+        """Replace the plotted data; series is a list of {'name', 'points': [(x, y), ...]} sorted by x"""
+        self.series_group.clear()
+        self.series = []
+        xs, ys = [], []
+        
+        for index, entry in enumerate(series):
+            points = entry['points']
+            if not points:
+                continue
+            
+            # Coarser copies for zoomed-out views, each a quarter of the one before
+            levels = [points]
+            while len(levels[-1]) > self.MIN_LEVEL_POINTS * 4:
+                levels.append(lttb(levels[-1], len(levels[-1]) // 4))
+            
+            color = self.colors[index % len(self.colors)]
+            self.series_group.add(Color(*color))
+            line = Line(points=[], width=dp(1.2))
+            self.series_group.add(line)
+            
+            self.series.append({
+                'name': entry['name'],
+                'color': color,
+                'points': points,
+                'levels': [(level, [point[0] for point in level]) for level in levels],
+                'line': line
+            })
+            xs.extend((points[0][0], points[-1][0]))
+            ys.extend((min(point[1] for point in points), max(point[1] for point in points)))
+        
+        if xs:
+            low, high = min(ys), max(ys)
+            padding = (high - low) * 0.05 or 1
+            self.x_range = (min(xs), max(xs))
+            self.y_range = (min(low, 0) if self.y_from_zero else low - padding, high + padding)
+            self.view = list(self.x_range)
+        self._redraw()
+    
+    def redraw(self, *args):
+        x0, x1 = self.view
+        y0, y1 = self.y_range
+        x_scale = self.width / ((x1 - x0) or 1)
+        y_scale = self.height / ((y1 - y0) or 1)
+        left, bottom = self.x, self.y
+        max_points = max(int(self.width / 2), 16)
+        
+        for entry in self.series:
+            # Finest level whose visible slice isn't far more than the screen can show
+            for points, xs in entry['levels']:
+                start = max(bisect.bisect_left(xs, x0) - 1, 0)
+                end = min(bisect.bisect_right(xs, x1) + 1, len(xs))
+                if end - start <= max_points * 4:
+                    break
+            
+            visible = points[start:end]
+            if len(visible) > max_points:
+                visible = lttb(visible, max_points)
+            
+            flat = []
+            for x, y in visible:
+                flat.append(left + (x - x0) * x_scale)
+                flat.append(bottom + (y - y0) * y_scale)
+            entry['line'].points = flat
+        
+        self.axes.points = [left, self.top, left, bottom, self.right, bottom]
+    
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos) or not self.series:
+            return super().on_touch_down(touch)
+        
+        if touch.is_mouse_scrolling:
+            factor = 0.8 if touch.button == 'scrollup' else 1.25
+            self.zoom(factor, touch.x)
+            return True
+        
+        touch.grab(self)
+        self.touches.append(touch)
+        self.pinch_distance = None
+        return True
+    
+    def on_touch_move(self, touch):
+        if touch.grab_current is not self:
+            return super().on_touch_move(touch)
+        
+        if len(self.touches) == 1:
+            span = self.view[1] - self.view[0]
+            self.pan(-touch.dx / max(self.width, 1) * span)
+        elif len(self.touches) == 2:
+            first, second = self.touches
+            distance = abs(first.x - second.x) or 1
+            if self.pinch_distance:
+                self.zoom(self.pinch_distance / distance, (first.x + second.x) / 2)
+            self.pinch_distance = distance
+        return True
+    
+    def on_touch_up(self, touch):
+        if touch.grab_current is not self:
+            return super().on_touch_up(touch)
+        touch.ungrab(self)
+        if touch in self.touches:
+            self.touches.remove(touch)
+        self.pinch_distance = None
+        return True
+    
+    def pan(self, delta):
+        span = self.view[1] - self.view[0]
+        start = min(max(self.view[0] + delta, self.x_range[0]), self.x_range[1] - span)
+        self.view = [start, start + span]
+        self._redraw()
+    
+    def zoom(self, factor, anchor_x):
+        """Scale the visible span by factor, keeping the data under anchor_x in place"""
+        x0, x1 = self.view
+        anchor = x0 + (anchor_x - self.x) / max(self.width, 1) * (x1 - x0)
+        full = self.x_range[1] - self.x_range[0]
+        span = min(max((x1 - x0) * factor, min(self.MIN_SPAN, full)), full)
+        
+        start = anchor - (anchor - x0) * span / ((x1 - x0) or 1)
+        start = min(max(start, self.x_range[0]), self.x_range[1] - span)
+        self.view = [start, start + span]
+        self._redraw()
+
+class CircuitMap(ThemedBehavior, Widget):
+    """Track outline drawn as one Mesh, with car dots moved by the GPU
+    
+    Cars live in a second Mesh whose vertices carry each dot's previous
+    and next position. A position update rewrites that one mesh; in
+    between, only the 'progress' uniform changes each frame and the
+    vertex shader interpolates, so moving cars never touch the widget
+    tree or trigger a layout pass.
+    """
+    
+    THEMED = {'track_color': 'track_role'}
+    track_color = ColorProperty([0.4, 0.4, 0.4, 1])
+    track_role = StringProperty('TEXT_SECONDARY')
+    
+    TRACK_WIDTH = dp(4)
+    DOT_RADIUS = dp(5)
+    CAR_FORMAT = [
+        (b'vPosition', 2, 'float'),
+        (b'vTexCoords0', 2, 'float'),
+        (b'v_from', 2, 'float'),
+        (b'v_to', 2, 'float'),
+        (b'v_color', 4, 'float')
+    ]
+    CAR_VERTEX_SHADER = '''
+$HEADER$
+attribute vec2 v_from;
+attribute vec2 v_to;
+attribute vec4 v_color;
+uniform float progress;
+uniform float dot_radius;
+
+void main(void) {
+    frag_color = v_color;
+    tex_coord0 = vTexCoords0;
+    vec2 center = mix(v_from, v_to, progress);
+    gl_Position = projection_mat * modelview_mat * vec4(center + vPosition * dot_radius, 0.0, 1.0);
+}
+'''
+    CAR_FRAGMENT_SHADER = '''
+$HEADER$
+
+void main(void) {
+    vec2 offset = tex_coord0 * 2.0 - 1.0;
+    if (dot(offset, offset) > 1.0)
+        discard;
+    gl_FragColor = frag_color;
+}
+'''
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.track = None
+        self.cars = {}  # code -> {'from', 'to', 'color'}
+        self.scale_factor = 1
+        self.started = 0
+        self.duration = 1
+        self._animation = None
+        
+        self.car_context = RenderContext(use_parent_projection=True, use_parent_modelview=True)
+        self.car_context.shader.vs = self.CAR_VERTEX_SHADER
+        self.car_context.shader.fs = self.CAR_FRAGMENT_SHADER
+        self.car_context['progress'] = 1.0
+        with self.car_context:
+            self.car_mesh = Mesh(fmt=self.CAR_FORMAT, mode='triangles')
+        
+        # Everything is drawn in the track's unit coordinates, fitted to the widget by one transform
+        with self.canvas:
+            PushMatrix()
+            self.translate = Translate()
+            self.scale = Scale(1)
+            self.track_instruction = Color(*self.track_color)
+            self.track_mesh = Mesh(mode='triangle_strip')
+        self.canvas.add(self.car_context)
+        self.canvas.add(PopMatrix())
+        
+        self.bind(pos=self.fit, size=self.fit, track_color=self.update_track_color)
+    
+    def update_track_color(self, *args):
+        self.track_instruction.rgba = self.track_color
+    
+    def set_track(self, track):
+        """Show a CircuitGeometry track, or nothing for None"""
+        self.track = track
+        self.cars = {}
+        self.car_mesh.vertices = []
+        self.car_mesh.indices = []
+        self.fit()
+    
+    def fit(self, *args):
+        if self.track is None:
+            self.track_mesh.vertices = []
+            self.track_mesh.indices = []
+            return
+        
+        scale = min(self.width / (self.track['width'] or 1), self.height / (self.track['height'] or 1)) * 0.9
+        self.scale_factor = max(scale, 1e-6)
+        self.scale.xyz = (self.scale_factor, self.scale_factor, 1)
+        self.translate.xy = (
+            self.x + (self.width - self.track['width'] * self.scale_factor) / 2,
+            self.y + (self.height - self.track['height'] * self.scale_factor) / 2
+        )
+        self.car_context['dot_radius'] = float(self.DOT_RADIUS / self.scale_factor)
+        self.build_track_mesh(self.TRACK_WIDTH / self.scale_factor)
+    
+    def build_track_mesh(self, width):
+        """Closed triangle strip along the outline, width wide in track units"""
+        points = self.track['points']
+        count = len(points)
+        vertices = []
+        
+        for index in range(count + 1):
+            x, y = points[index % count]
+            before = points[(index - 1) % count]
+            after = points[(index + 1) % count]
+            dx, dy = after[0] - before[0], after[1] - before[1]
+            length = math.hypot(dx, dy) or 1
+            nx, ny = -dy / length * width / 2, dx / length * width / 2
+            vertices.extend((x + nx, y + ny, 0, 0, x - nx, y - ny, 0, 0))
+        
+        self.track_mesh.vertices = vertices
+        self.track_mesh.indices = list(range(len(vertices) // 4))
+    
+    def set_positions(self, positions, interval):
+        """Move cars to {code: (fraction of the lap, rgba)} over interval seconds"""
+        if self.track is None:
+            return
+        
+        progress = self.progress()
+        cars = {}
+        for code, (fraction, color) in positions.items():
+            target = CircuitGeometry.position(self.track, fraction)
+            previous = self.cars.get(code)
+            if previous is None:
+                start = target
+            else:
+                # Start from where the dot is drawn right now, so an early update doesn't jump
+                start = tuple(a + (b - a) * progress for a, b in zip(previous['from'], previous['to']))
+            cars[code] = {'from': start, 'to': target, 'color': color}
+        self.cars = cars
+        
+        vertices, indices = [], []
+        for number, car in enumerate(cars.values()):
+            for corner, texture in (((-1, -1), (0, 0)), ((1, -1), (1, 0)), ((1, 1), (1, 1)), ((-1, 1), (0, 1))):
+                vertices.extend(corner + texture + car['from'] + car['to'] + tuple(car['color']))
+            base = number * 4
+            indices.extend((base, base + 1, base + 2, base, base + 2, base + 3))
+        self.car_mesh.vertices = vertices
+        self.car_mesh.indices = indices
+        
+        self.started = Clock.get_time()
+        self.duration = max(interval, 0.01)
+        self.car_context['progress'] = 0.0
+        if self._animation is None:
+            self._animation = Clock.schedule_interval(self.animate, 0)
+    
+    def progress(self):
+        return min((Clock.get_time() - self.started) / self.duration, 1.0)
+    
+    def animate(self, dt):
+        progress = self.progress()
+        self.car_context['progress'] = float(progress)
+        if progress >= 1:
+            self._animation = None
+            return False
 
 class StatsScreen(Screen):
     """Season Statistics Screen"""
@@ -399,11 +1031,11 @@ class StatsScreen(Screen):
         
         # Header
         header = BoxLayout(orientation='horizontal', size_hint_y=0.1)
-        title = Label(
+        title = ThemedLabel(
             text='Season Statistics',
             font_size=dp(20),
             bold=True,
-            color=get_color_from_hex('#1a1a1a')
+            color_role='TEXT_PRIMARY'
         )
         header.add_widget(title)
         
@@ -413,6 +1045,7 @@ class StatsScreen(Screen):
         stats_layout.bind(minimum_height=stats_layout.setter('height'))
         
         # Season overview stats
+        self.stat_labels = {}
         season_stats = [
             {'title': 'Total Races', 'value': '22', 'subtitle': 'Season races'},
             {'title': 'Different Winners', 'value': '6', 'subtitle': 'Unique race winners'},
@@ -442,38 +1075,259 @@ class StatsScreen(Screen):
         progress_card = CustomCard()
         progress_card.height = dp(80)
         
-        progress_title = Label(
+        progress_title = ThemedLabel(
             text='Championship Progress',
             font_size=dp(16),
             bold=True,
             size_hint_y=0.4,
-            color=get_color_from_hex('#1a1a1a')
+            color_role='TEXT_PRIMARY'
         )
         
-        progress_bar = ProgressBar(
+        self.progress_bar = ProgressBar(
             max=22,
-            value=21,
+            value=0,
             size_hint_y=0.3
         )
         
-        progress_text = Label(
-            text='21 of 22 races completed (95.5%)',
+        self.progress_text = ThemedLabel(
+            text='Loading season progress...',
             font_size=dp(12),
             size_hint_y=0.3,
-            color=get_color_from_hex('#666666')
+            color_role='TEXT_SECONDARY'
         )
         
         progress_card.add_widget(progress_title)
-        progress_card.add_widget(progress_bar)
-        progress_card.add_widget(progress_text)
+        progress_card.add_widget(self.progress_bar)
+        progress_card.add_widget(self.progress_text)
         
         stats_layout.add_widget(progress_card)
         
+        # Points progression chart
+        self.progression = {}
+        self.progression_table = 'drivers'
+        chart_card = CustomCard()
+        chart_card.height = dp(340)
+        
+        chart_header = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(30))
+        chart_header.add_widget(ThemedLabel(
+            text='Points Progression',
+            font_size=dp(16),
+            bold=True,
+            size_hint_x=0.5,
+            color_role='TEXT_PRIMARY'
+        ))
+        self.progression_buttons = {}
+        for table, text in (('drivers', 'Drivers'), ('teams', 'Teams')):
+            button = ThemedButton(
+                text=text,
+                font_size=dp(12),
+                size_hint_x=0.25,
+                background_normal='',
+                background_role='PRIMARY_COLOR' if table == self.progression_table else 'NAV_INACTIVE'
+            )
+            button.bind(on_press=lambda x, table=table: self.show_progression(table))
+            self.progression_buttons[table] = button
+            chart_header.add_widget(button)
+        
+        self.progression_chart = LineChart()
+        self.progression_legend = GridLayout(cols=2, size_hint_y=None, height=dp(90))
+        
+        chart_card.add_widget(chart_header)
+        chart_card.add_widget(self.progression_chart)
+        chart_card.add_widget(self.progression_legend)
+        stats_layout.add_widget(chart_card)
+        
+        # Title fight - filled in once the simulator has run
+        self.title_fight_card = CustomCard()
+        self.title_fight_card.height = dp(60)
+        self.title_fight_card.add_widget(ThemedLabel(
+            text='Title Fight',
+            font_size=dp(16),
+            bold=True,
+            size_hint_y=None,
+            height=dp(30),
+            color_role='TEXT_PRIMARY'
+        ))
+        stats_layout.add_widget(self.title_fight_card)
+        
+        # Strategy of the latest race - filled in once its laps and stops are analysed
+        self.strategy_card = CustomCard()
+        self.strategy_card.height = dp(60)
+        self.strategy_card.add_widget(ThemedLabel(
+            text='Race Strategy',
+            font_size=dp(16),
+            bold=True,
+            size_hint_y=None,
+            height=dp(30),
+            color_role='TEXT_PRIMARY'
+        ))
+        stats_layout.add_widget(self.strategy_card)
+        
         stats_scroll.add_widget(stats_layout)
         main_layout.add_widget(header)
         main_layout.add_widget(stats_scroll)
         
         self.add_widget(main_layout)
+        
+        # Run the championship simulation off the UI thread, and again for each new set of standings
+        self.simulator = ChampionshipSimulator()
+        data_manager = App.get_running_app().data_manager
+        self.standings_slice = f"standings/drivers/{data_manager.current_season}"
+        self.simulated_version = 0
+        data_manager.store.subscribe(self.standings_slice, self.on_standings)
+        threading.Thread(target=self.load_championship, daemon=True).start()
+    
+    def on_standings(self, standings):
+        if App.get_running_app().data_manager.store.version(self.standings_slice) != self.simulated_version:
+            threading.Thread(target=self.load_championship, daemon=True).start()
+    
+    def load_championship(self):
+        """Fetch standings and schedule, then simulate the rest of the season"""
+        data_manager = App.get_running_app().data_manager
+        driver_standings = data_manager.get_driver_standings()
+        self.simulated_version = data_manager.store.version(self.standings_slice)
+        outlook = self.simulator.simulate(
+            driver_standings,
+            data_manager.get_constructor_standings(),
+            data_manager.get_race_schedule()
+        )
+        statistics = data_manager.get_season_statistics()
+        progression = {
+            'drivers': data_manager.get_points_progression(table='drivers'),
+            'teams': data_manager.get_points_progression(table='constructors')
+        }
+        Clock.schedule_once(lambda dt: self.show_championship(outlook))
+        Clock.schedule_once(lambda dt: self.set_progression(progression))
+        if statistics['races']:
+            Clock.schedule_once(lambda dt: self.show_statistics(statistics))
+        
+        completed = [race for race in data_manager.get_race_schedule() if race['status'] == 'completed']
+        race = max(completed, key=lambda race: race['round'], default=None)
+        if race is not None:
+            try:
+                strategy = data_manager.get_strategy(data_manager.current_season, race['round'])
+            except (requests.RequestException, KeyError, ValueError):
+                return  # No lap data for it, the card keeps its title only
+            Clock.schedule_once(lambda dt: self.show_strategy(race, strategy))
+    
+    def show_statistics(self, statistics):
+        """Replace the placeholder figures with synced season statistics"""
+        updates = {
+            'Total Races': (statistics['races'], 'Races completed'),
+            'Different Winners': (statistics['different_winners'], 'Unique race winners'),
+            'Pole Positions': (statistics['poles'], statistics['pole_leader']),
+            'Fastest Laps': (statistics['fastest_laps'], statistics['fastest_lap_leader']),
+            'DNFs': (statistics['dnfs'], 'Did not finish')
+        }
+        
+        for title, (value, subtitle) in updates.items():
+            value_label, subtitle_label = self.stat_labels[title]
+            value_label.text = str(value)
+            if isinstance(subtitle, tuple):
+                subtitle = f"{subtitle[0]} leads ({subtitle[1]})"
+            if subtitle:
+                subtitle_label.text = subtitle
+    
+    def set_progression(self, progression):
+        self.progression = progression
+        self.show_progression(self.progression_table)
+    
+    def show_progression(self, table):
+        """Plot cumulative points for drivers or teams"""
+        self.progression_table = table
+        for name, button in self.progression_buttons.items():
+            button.background_role = 'PRIMARY_COLOR' if name == table else 'NAV_INACTIVE'
+        
+        series = self.progression.get(table, {}).get('series', [])
+        self.progression_chart.set_series(series)
+        
+        self.progression_legend.clear_widgets()
+        if not series:
+            self.progression_legend.add_widget(ThemedLabel(
+                text='No rounds synced yet',
+                font_size=dp(11),
+                color_role='TEXT_SECONDARY'
+            ))
+        for entry in self.progression_chart.series:
+            self.progression_legend.add_widget(Label(
+                text=f"{entry['name']} ({entry['points'][-1][1]:g})",
+                font_size=dp(10),
+                color=entry['color'],
+                shorten=True
+            ))
+    
+    def show_championship(self, outlook):
+        """Update progress and title fight cards with simulator results"""
+        completed = outlook['rounds_completed']
+        total = outlook['total_rounds']
+        
+        self.progress_bar.max = max(total, 1)
+        self.progress_bar.value = completed
+        self.progress_text.text = f"{completed} of {total} races completed ({completed / max(total, 1) * 100:.1f}%)"
+        
+        # Keep the title label, replace contender rows
+        for child in self.title_fight_card.children[:-1]:
+            self.title_fight_card.remove_widget(child)
+        
+        rows = 0
+        for championship in ('drivers', 'constructors'):
+            table = outlook[championship]
+            for entry in table['entries']:
+                if entry['eliminated']:
+                    continue
+                
+                if table['clinched']:
+                    status = 'CHAMPION'
+                elif entry['name'] == table['leader'] and table['clinch_margin'] is not None:
+                    status = f"Clinches with +{table['clinch_margin']} next round"
+                else:
+                    status = f"{entry['probability'] * 100:.1f}%"
+                
+                row = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(30))
+                row.add_widget(ThemedLabel(
+                    text=entry['name'],
+                    font_size=dp(13),
+                    size_hint_x=0.6,
+                    halign='left',
+                    color_role='TEXT_PRIMARY'
+                ))
+                row.add_widget(ThemedLabel(
+                    text=status,
+                    font_size=dp(12),
+                    bold=True,
+                    size_hint_x=0.4,
+                    color_role='PRIMARY_COLOR'
+                ))
+                self.title_fight_card.add_widget(row)
+                rows += 1
+        
+        self.title_fight_card.height = dp(60 + rows * 35)
+    
+    def show_strategy(self, race, strategy):
+        """Stints and degradation of the top finishers, and the undercuts that worked"""
+        for child in self.strategy_card.children[:-1]:
+            self.strategy_card.remove_widget(child)
+        
+        lines = [(f"{race['name']} • pit loss {strategy.pit_loss:.1f}s", 'TEXT_SECONDARY')]
+        for driver in strategy.finishing_order[:10]:
+            stints = strategy.driver_stints(driver)
+            laps = '-'.join(str(stint['laps']) for stint in stints)
+            slopes = [stint['slope'] for stint in stints if stint['slope'] is not None]
+            degradation = f" • {sum(slopes) / len(slopes):+.3f}s/lap" if slopes else ''
+            lines.append((f"{driver}  {len(stints) - 1} stop{'' if len(stints) == 2 else 's'} • {laps}{degradation}", 'TEXT_PRIMARY'))
+        for undercut in [undercut for undercut in strategy.undercuts if undercut['passed']][:3]:
+            lines.append((f"{undercut['driver']} undercut {undercut['rival']} on lap {undercut['lap']} ({undercut['delta']:+.1f}s)", 'SUCCESS_COLOR'))
+        
+        for text, role in lines:
+            self.strategy_card.add_widget(ThemedLabel(
+                text=text,
+                font_size=dp(12),
+                size_hint_y=None,
+                height=dp(24),
+                halign='left',
+                color_role=role
+            ))
+        self.strategy_card.height = dp(60 + len(lines) * 28)
     
     def create_stat_card(self, stat_data):
         """Create a statistics card"""
@@ -481,27 +1335,27 @@ class StatsScreen(Screen):
         card.size_hint_x = 0.5
         
         # Title
-        title_label = Label(
+        title_label = ThemedLabel(
             text=stat_data['title'],
             font_size=dp(12),
-            color=get_color_from_hex('#666666'),
+            color_role='TEXT_SECONDARY',
             size_hint_y=0.3
         )
         
         # Value
-        value_label = Label(
+        value_label = ThemedLabel(
             text=stat_data['value'],
             font_size=dp(24),
             bold=True,
-            color=get_color_from_hex('#e10600'),
+            color_role='PRIMARY_COLOR',
             size_hint_y=0.4
         )
         
         # Subtitle
-        subtitle_label = Label(
+        subtitle_label = ThemedLabel(
             text=stat_data['subtitle'],
             font_size=dp(10),
-            color=get_color_from_hex('#666666'),
+            color_role='TEXT_SECONDARY',
             size_hint_y=0.3
         )
         
@@ -509,6 +1363,7 @@ class StatsScreen(Screen):
         card.add_widget(value_label)
         card.add_widget(subtitle_label)
         
+        self.stat_labels[stat_data['title']] = (value_label, subtitle_label)
         return card
 
 class MainApp(App):
@@ -521,6 +1376,39 @@ class MainApp(App):
         self.title = 'F1 Hub - Professional Mobile App'
         self.icon = 'f1_icon.png'  # Add your F1 icon file
         
+        # Settings are read once here, everything else subscribes to changes
+        self.settings = SettingsStore(os.path.join(self.user_data_dir, 'settings.json'))
+        self.low_power = LowPowerMode(self.settings)
+        self.theme = ThemeEngine('dark' if self.settings.get('dark_theme') else 'light')
+        self.settings.subscribe('dark_theme', lambda enabled: self.theme.apply('dark' if enabled else 'light'))
+        
+        # Shared data layer used by every screen, its store delivers changes once per frame
+        self.data_manager = F1DataManager(data_dir=self.user_data_dir)
+        self.setup_series(self.data_manager)
+        store = self.data_manager.store
+        
+        # Feeder series only get a data manager once they're followed and first shown
+        self.series = SeriesHub(self.data_manager, self.user_data_dir, setup=self.setup_series)
+        for series, _ in SERIES[1:]:
+            self.settings.subscribe(f"{series}_feed", lambda url, series=series: self.series.enable(series, url), call_now=True)
+        self.image_cache = ImageCache(http_get=self.data_manager.fetch)
+        self.asset_atlas = AssetAtlas(self.image_cache)
+        self.session_clock = SessionClock()
+        self.countdown_ticker = CountdownTicker(self.session_clock)
+        self.prefetch = PrefetchWorker(self.data_manager, os.path.join(self.user_data_dir, 'prefetch.json'), self.session_clock)
+        
+        # Alerts queued by the last run are armed straight away, before the schedule loads
+        self.toast_backend = toast_backend = ToastBackend()
+        backend = PlatformNotificationBackend(toast_backend) if platform in ('android', 'ios') else toast_backend
+        self.notifications = NotificationScheduler(
+            AlertQueue(os.path.join(self.user_data_dir, 'alerts.json')),
+            self.data_manager,
+            backend,
+            self.settings
+        )
+        self.notifications.arm()
+        store.subscribe(f"schedule/{self.data_manager.current_season}", self.on_schedule_loaded)
+        
         # Create screen manager
         sm = ScreenManager()
         
@@ -528,10 +1416,17 @@ class MainApp(App):
         standings_screen = StandingsScreen(name='standings')
         schedule_screen = ScheduleScreen(name='schedule')
         stats_screen = StatsScreen(name='stats')
+        news_screen = NewsScreen(name='news')
+        live_screen = LiveTimingScreen(name='live')
         
         sm.add_widget(standings_screen)
         sm.add_widget(schedule_screen)
         sm.add_widget(stats_screen)
+        sm.add_widget(news_screen)
+        sm.add_widget(live_screen)
+        sm.add_widget(SettingsScreen(name='settings'))
+        sm.add_widget(DataUsageScreen(name='usage'))
+        self.screen_manager = sm
         
         # Create main layout with navigation
         main_layout = BoxLayout(orientation='vertical')
@@ -543,11 +1438,63 @@ class MainApp(App):
         # Screen content
         main_layout.add_widget(sm)
         
-        # Schedule periodic updates
-        Clock.schedule_interval(self.update_data, 60)  # Update every minute
+        # Runtime behaviour follows the settings as soon as they change
+        self.refresh_event = None
+        self.refreshing = False
+        self.settings.subscribe('auto_refresh', self.apply_auto_refresh, call_now=True)
+        self.settings.subscribe('animations', self.apply_animations, call_now=True)
+        self.low_power.bind(self.apply_animations)
+        self.settings.subscribe('offline_mode', self.apply_network_settings)
+        self.settings.subscribe('data_saver', self.apply_network_settings, call_now=True)
+        self.settings.subscribe('upstream_url', self.apply_upstream, call_now=True)
+        self.settings.subscribe('background_prefetch', self.apply_prefetch, call_now=True)
         
         return main_layout
     
+    def apply_auto_refresh(self, enabled):
+        """Start or stop the periodic data refresh"""
+        if self.refresh_event is not None:
+            self.refresh_event.cancel()
+            self.refresh_event = None
+        if enabled:
+            self.refresh_event = Clock.schedule_interval(self.update_data, 60)  # Update every minute
+    
+    def apply_animations(self, *args):
+        """Screen transitions and toast fades only with Animations on and low power off"""
+        animate = self.settings.get('animations') and not self.low_power.active
+        self.screen_manager.transition = SlideTransition() if animate else NoTransition()
+        self.toast_backend.animate = animate
+    
+    def setup_series(self, manager):
+        """Hook a series' data manager up to the frame clock and the network settings"""
+        manager.store.schedule_flush = lambda: Clock.schedule_once(manager.store.flush)
+        manager.offline = self.settings.get('offline_mode')
+        manager.data_saver = self.settings.get('data_saver')
+    
+    def apply_network_settings(self, *args):
+        """Push Offline Mode and Data Saver to the data layer and image loading"""
+        for manager in list(self.series.managers.values()):
+            manager.offline = self.settings.get('offline_mode')
+            manager.data_saver = self.settings.get('data_saver')
+        self.image_cache.allow_remote = not (self.data_manager.offline or self.data_manager.data_saver)
+        
+        # Re-bind visible news cards so thumbnails appear or disappear now
+        self.screen_manager.get_screen('news').news_view.refresh_from_data()
+    
+    def apply_prefetch(self, enabled):
+        """Let the prefetch worker download ahead of sessions, or hold it"""
+        self.prefetch.enabled = enabled
+        self.prefetch.check_now()
+    
+    def apply_upstream(self, url):
+        """Read through another node's data server, and follow its updates, when one is set"""
+        self.data_manager.upstream = url.rstrip('/') or None
+        self.data_manager.listen_upstream(lambda version: Clock.schedule_once(self.on_upstream_update))
+    
+    def on_upstream_update(self, dt):
+        """The upstream has new data; synced standings are already in the store, the schedule may have moved"""
+        threading.Thread(target=self.load_schedule, daemon=True).start()
+    
     def create_navigation_bar(self, screen_manager):
         """Create professional navigation bar"""
         nav_layout = BoxLayout(
@@ -560,13 +1507,16 @@ class MainApp(App):
         nav_buttons = [
             {'text': 'Standings', 'screen': 'standings', 'active': True},
             {'text': 'Schedule', 'screen': 'schedule', 'active': False},
-            {'text': 'Statistics', 'screen': 'stats', 'active': False}
+            {'text': 'Statistics', 'screen': 'stats', 'active': False},
+            {'text': 'News', 'screen': 'news', 'active': False},
+            {'text': 'Live', 'screen': 'live', 'active': False},
+            {'text': 'Settings', 'screen': 'settings', 'active': False}
         ]
         
         self.nav_buttons = []
         
         for btn_data in nav_buttons:
-            btn = Button(
+            btn = ThemedButton(
                 text=btn_data['text'],
                 font_size=dp(14),
                 bold=True
@@ -574,11 +1524,11 @@ class MainApp(App):
             
             # Set active/inactive colors
             if btn_data['active']:
-                btn.background_color = get_color_from_hex('#e10600')
+                btn.background_role = 'PRIMARY_COLOR'
             else:
                 btn.background_normal = ''
-                btn.background_color = get_color_from_hex('#cccccc')
-                btn.color = get_color_from_hex('#666666')
+                btn.background_role = 'NAV_INACTIVE'
+                btn.color_role = 'TEXT_SECONDARY'
             
             # Bind navigation function
             btn.bind(on_press=lambda x, screen=btn_data['screen']: self.navigate_to(screen_manager, screen, x))
@@ -595,50 +1545,78 @@ class MainApp(App):
         # Update button states
         for btn in self.nav_buttons:
             if btn == button:
-                btn.background_color = get_color_from_hex('#e10600')
-                btn.color = [1, 1, 1, 1]  # White text
+                btn.background_role = 'PRIMARY_COLOR'
+                btn.color_role = 'ACCENT_COLOR'  # White text
             else:
                 btn.background_normal = ''
-                btn.background_color = get_color_from_hex('#cccccc')
-                btn.color = get_color_from_hex('#666666')
+                btn.background_role = 'NAV_INACTIVE'
+                btn.color_role = 'TEXT_SECONDARY'
     
     def update_data(self, dt):
-        """Update data periodically (placeholder for real API calls)"""
-        # In a real app, this would fetch live data from F1 API
-        # For now, this is just a placeholder
-        print(f"Data updated at {datetime.now()}")
-        return True
+        """Refresh the current season off the UI thread, the store passes what changed on to the screens"""
+        if self.refreshing or self.data_manager.offline:
+            return
+        self.refreshing = True
+        threading.Thread(target=self.refresh_data, daemon=True).start()
+    
+    def refresh_data(self):
+        # The standings getters sync the season first, and every getter falls back on its own when Ergast fails
+        try:
+            self.data_manager.get_race_schedule()
+            self.data_manager.get_driver_standings()
+            self.data_manager.get_constructor_standings()
+        finally:
+            self.refreshing = False
     
     def on_start(self):
         """Called when the app starts"""
         print("F1 Hub Professional Mobile App Started")
         
+        # Index the season's sessions once for every countdown
+        threading.Thread(target=self.load_schedule, daemon=True).start()
+        
+        # Followed feeder series load their standings side by side, in the background
+        feeders = self.series.enabled()[1:]
+        if feeders:
+            threading.Thread(target=self.series.fetch_all, args=('get_driver_standings',), kwargs={'series': feeders}, daemon=True).start()
+        
         # Show welcome popup
         self.show_welcome_popup()
     
+    def load_schedule(self):
+        """Fetch the schedule off the UI thread, a changed one reaches on_schedule_loaded through the store"""
+        self.data_manager.get_race_schedule()
+    
+    def on_schedule_loaded(self, schedule):
+        self.session_clock.load(schedule)
+        self.countdown_ticker.refresh()
+        self.notifications.plan(self.session_clock)
+        self.prefetch.start()
+        self.prefetch.check_now()
+    
     def show_welcome_popup(self):
         """Show welcome popup with app info"""
         content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
         
-        welcome_label = Label(
+        welcome_label = ThemedLabel(
             text='Welcome to F1 Hub!',
             font_size=dp(18),
             bold=True,
-            color=get_color_from_hex('#e10600')
+            color_role='PRIMARY_COLOR'
         )
         
-        info_label = Label(
+        info_label = ThemedLabel(
             text='Your professional Formula 1 companion app.\n\nExplore championship standings, race schedules, and detailed statistics.',
             font_size=dp(14),
             text_size=(dp(250), None),
             halign='center',
-            color=get_color_from_hex('#1a1a1a')
+            color_role='TEXT_PRIMARY'
         )
         
-        close_btn = Button(
+        close_btn = ThemedButton(
             text='Get Started',
             size_hint_y=0.3,
-            background_color=get_color_from_hex('#e10600'),
+            background_role='PRIMARY_COLOR',
             font_size=dp(14),
             bold=True
         )
@@ -659,86 +1637,27 @@ class MainApp(App):
     
     def on_pause(self):
         """Handle app pause (mobile-specific)"""
+        # The OS may kill a paused app without calling on_stop
+        self.prefetch.pause()
+        self.settings.flush()
+        self.data_manager.budget.save()
+        self.data_manager.save_http_cache()
+        self.data_manager.metrics.dump(os.path.join(self.user_data_dir, 'metrics.json'))
         return True
     
+    def on_stop(self):
+        self.prefetch.pause()
+        self.settings.flush()
+        self.data_manager.budget.save()
+        self.data_manager.save_http_cache()
+        self.data_manager.metrics.dump(os.path.join(self.user_data_dir, 'metrics.json'))
+    
     def on_resume(self):
         """Handle app resume (mobile-specific)"""
-        pass
-
-# Data Management Classes
-class F1DataManager:
-    """Handles F1 data fetching and caching"""
-    
-    def __init__(self):
-        self.base_url = "http://ergast.com/api/f1"
-        self.current_season = "2023"
-        self.cache = {}
-    
-    def get_driver_standings(self):
-        """Fetch current driver standings"""
-        try:
-            url = f"{self.base_url}/{self.current_season}/driverStandings.json"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return self.parse_driver_standings(data)
-            else:
-                return self.get_mock_driver_standings()
-        except:
-            return self.get_mock_driver_standings()
-    
-    def get_constructor_standings(self):
-        """Fetch current constructor standings"""
-        try:
-            url = f"{self.base_url}/{self.current_season}/constructorStandings.json"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return self.parse_constructor_standings(data)
-            else:
-                return self.get_mock_constructor_standings()
-        except:
-            return self.get_mock_constructor_standings()
-    
-    def get_race_schedule(self):
-        """Fetch race schedule"""
-        try:
-            url = f"{self.base_url}/{self.current_season}.json"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return self.parse_race_schedule(data)
-            else:
-                return self.get_mock_race_schedule()
-        except:
-            return self.get_mock_race_schedule()
-    
-    def parse_driver_standings(self, data):
-        """Parse driver standings from API response"""
-        standings = data['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings']
-        parsed_standings = []
-        
-        for driver in standings:
-            parsed_standings.append({
-                'position': int(driver['position']),
-                'name': f"{driver['Driver']['givenName']} {driver['Driver']['familyName']}",
-                'team': driver['Constructors'][0]['name'],
-                'points': int(driver['points']),
-                'wins': int(driver['wins'])
-            })
-        
-        return parsed_standings
-    
-    def get_mock_driver_standings(self):
-        """Return mock data when API is unavailable"""
-        return [
-            {'position': 1, 'name': 'Max Verstappen', 'team': 'Red Bull Racing', 'points': 575, 'wins': 19, 'podiums': 21},
-            {'position': 2, 'name': 'Sergio Pérez', 'team': 'Red Bull Racing', 'points': 285, 'wins': 2, 'podiums': 8},
-            {'position': 3, 'name': 'Lewis Hamilton', 'team': 'Mercedes', 'points': 234, 'wins': 3, 'podiums': 7}
-        ]
+        # Battery saver may have been switched while we were in the background
+        if platform == 'android':
+            self.low_power.check_battery_saver()
+        self.prefetch.resume()
 
 # Utility Classes
 class AppTheme:
@@ -755,6 +1674,59 @@ class AppTheme:
     INFO_COLOR = '#007bff'         # Blue
     WARNING_COLOR = '#ffc107'      # Yellow
     ERROR_COLOR = '#dc3545'        # Red
+    NAV_INACTIVE = '#cccccc'       # Light Gray
+
+class DarkTheme(AppTheme):
+    """Dark palette, roles not listed here are shared with AppTheme"""
+    
+    SECONDARY_COLOR = '#3a3a3a'    # Raised Gray
+    TEXT_PRIMARY = '#f0f0f0'       # Off White
+    TEXT_SECONDARY = '#a0a0a0'     # Medium Gray
+    BACKGROUND = '#121212'         # Near Black
+    CARD_BACKGROUND = '#1e1e1e'    # Dark Gray
+    SUCCESS_COLOR = '#34c759'      # Green
+    INFO_COLOR = '#4da3ff'         # Blue
+    ERROR_COLOR = '#ff5c5c'        # Red
+    NAV_INACTIVE = '#2a2a2a'       # Dark Gray
+
+class ThemeEngine:
+    """Palettes compiled to RGBA once, applied to every themed widget in one pass
+    
+    Switching theme writes the new colours into the registered widgets'
+    existing properties, so no screen is rebuilt.
+    """
+    
+    THEMES = {'light': AppTheme, 'dark': DarkTheme}
+    
+    def __init__(self, name='light'):
+        self.palettes = {
+            theme_name: {
+                role: tuple(get_color_from_hex(getattr(theme, role)))
+                for role in dir(theme) if role.isupper()
+            }
+            for theme_name, theme in self.THEMES.items()
+        }
+        self.name = name
+        self.palette = self.palettes[name]
+        self.widgets = weakref.WeakSet()
+        Window.clearcolor = self.palette['BACKGROUND']
+    
+    def rgba(self, role):
+        return self.palette[role]
+    
+    def register(self, widget):
+        """Colour a new widget for the current theme and keep it in step with later switches"""
+        self.widgets.add(widget)
+        widget.apply_theme(self.palette)
+    
+    def apply(self, name):
+        if name == self.name:
+            return
+        self.name = name
+        self.palette = self.palettes[name]
+        Window.clearcolor = self.palette['BACKGROUND']
+        for widget in list(self.widgets):
+            widget.apply_theme(self.palette)
 
 class NotificationManager:
     """Handles in-app notifications and alerts"""
@@ -763,18 +1735,18 @@ class NotificationManager:
     def show_success(message, title="Success"):
         content = BoxLayout(orientation='vertical', spacing=dp(10))
         
-        msg_label = Label(
+        msg_label = ThemedLabel(
             text=message,
             font_size=dp(14),
-            color=get_color_from_hex(AppTheme.TEXT_PRIMARY),
+            color_role='TEXT_PRIMARY',
             text_size=(dp(250), None),
             halign='center'
         )
         
-        ok_btn = Button(
+        ok_btn = ThemedButton(
             text='OK',
             size_hint_y=0.3,
-            background_color=get_color_from_hex(AppTheme.SUCCESS_COLOR),
+            background_role='SUCCESS_COLOR',
             font_size=dp(12)
         )
         
@@ -794,18 +1766,18 @@ class NotificationManager:
     def show_error(message, title="Error"):
         content = BoxLayout(orientation='vertical', spacing=dp(10))
         
-        msg_label = Label(
+        msg_label = ThemedLabel(
             text=message,
             font_size=dp(14),
-            color=get_color_from_hex(AppTheme.ERROR_COLOR),
+            color_role='ERROR_COLOR',
             text_size=(dp(250), None),
             halign='center'
         )
         
-        ok_btn = Button(
+        ok_btn = ThemedButton(
             text='OK',
             size_hint_y=0.3,
-            background_color=get_color_from_hex(AppTheme.ERROR_COLOR),
+            background_role='ERROR_COLOR',
             font_size=dp(12)
         )
         
@@ -821,13 +1793,317 @@ class NotificationManager:
         ok_btn.bind(on_press=popup.dismiss)
         popup.open()
 
+class CountdownTicker:
+    """Drives every countdown label in the app from one coalesced Clock event
+    
+    Each label says how long until its text next changes; the ticker
+    sleeps until the soonest of those, so far-off sessions cost a wakeup
+    a day rather than one a second per widget.
+    """
+    
+    IDLE_INTERVAL = 3600
+    STALE = object()  # Forces on_session callbacks after the schedule is reloaded
+    
+    def __init__(self, session_clock):
+        self.session_clock = session_clock
+        self.entries = []
+        self._event = None
+    
+    def register(self, label, names=None, on_session=None):
+        """Count label down to the next session (or next of names); on_session(session) fires when it changes"""
+        self.entries.append({
+            'label': weakref.ref(label),
+            'names': names,
+            'on_session': on_session,
+            'session': None
+        })
+        self.tick()
+    
+    def refresh(self):
+        """Re-evaluate every label after the session index has been rebuilt"""
+        for entry in self.entries:
+            entry['session'] = self.STALE
+        self.tick()
+    
+    def tick(self, *args):
+        now = datetime.now(timezone.utc)
+        wait = self.IDLE_INTERVAL
+        
+        for entry in list(self.entries):
+            label = entry['label']()
+            if label is None:
+                self.entries.remove(entry)
+                continue
+            
+            session = self.session_clock.next_session(now, entry['names'])
+            if session is not entry['session']:
+                entry['session'] = session
+                if entry['on_session']:
+                    entry['on_session'](session)
+            
+            if session is None:
+                text, next_change = 'Season complete', None
+            else:
+                text, next_change = format_countdown((session['start'] - now).total_seconds())
+                if next_change is None:
+                    # Live - check again when the session is due to end
+                    next_change = (session['end'] - now).total_seconds()
+            
+            if label.text != text:
+                label.text = text
+            if next_change is not None:
+                wait = min(wait, next_change)
+        
+        if self._event is not None:
+            self._event.cancel()
+        self._event = Clock.schedule_once(self.tick, max(wait, 1)) if self.entries else None
+
+class LowPowerMode:
+    """Cuts frame rate and motion while the user or the OS asks to save battery
+    
+    Kivy only redraws when a canvas changed, but the event loop still
+    wakes at maxfps. While low power is on that is capped, and dropped
+    further once there has been no input for IDLE_AFTER seconds.
+    """
+    
+    ACTIVE_FPS = 30
+    IDLE_FPS = 5
+    IDLE_AFTER = 5
+    BATTERY_SAVER_CHECK = 300
+    
+    def __init__(self, settings):
+        self.settings = settings
+        self.os_saver = False
+        self.active = False
+        self.listeners = []
+        self.default_fps = Clock._max_fps
+        self._idle_trigger = Clock.create_trigger(self.go_idle, self.IDLE_AFTER)
+        
+        Window.bind(on_touch_down=self.on_input, on_touch_move=self.on_input, on_key_down=self.on_input)
+        settings.subscribe('low_power', self.update)
+        
+        # Only Android reports its battery saver so far
+        if platform == 'android':
+            self.check_battery_saver()
+            Clock.schedule_interval(self.check_battery_saver, self.BATTERY_SAVER_CHECK)
+    
+    def bind(self, callback):
+        """Call callback(active) whenever low power switches on or off"""
+        self.listeners.append(callback)
+    
+    def check_battery_saver(self, *args):
+        try:
+            from jnius import autoclass
+            activity = autoclass('org.kivy.android.PythonActivity').mActivity
+            context = autoclass('android.content.Context')
+            os_saver = bool(activity.getSystemService(context.POWER_SERVICE).isPowerSaveMode())
+        except Exception:
+            os_saver = False
+        
+        if os_saver != self.os_saver:
+            self.os_saver = os_saver
+            self.update()
+    
+    def update(self, *args):
+        active = self.settings.get('low_power') or self.os_saver
+        if active == self.active:
+            return
+        
+        self.active = active
+        if active:
+            self.on_input()
+        else:
+            self._idle_trigger.cancel()
+            Clock._max_fps = self.default_fps
+        
+        for callback in self.listeners:
+            callback(active)
+    
+    def on_input(self, *args):
+        if self.active:
+            Clock._max_fps = self.ACTIVE_FPS
+            self._idle_trigger.cancel()
+            self._idle_trigger()
+    
+    def go_idle(self, *args):
+        if self.active:
+            Clock._max_fps = self.IDLE_FPS
+
+class ToastBackend:
+    """Shows alerts as a short-lived toast over the current screen"""
+    
+    DURATION = 4
+    
+    def __init__(self):
+        self.toast = None
+        self.animate = True
+    
+    def notify(self, title, message):
+        if self.toast is not None:
+            Window.remove_widget(self.toast)
+        
+        toast = ThemedLabel(
+            text=f"[b]{title}[/b]\n{message}",
+            markup=True,
+            font_size=dp(13),
+            color_role='ACCENT_COLOR',
+            halign='center',
+            size_hint=(None, None),
+            size=(Window.width * 0.9, dp(64)),
+            pos=(Window.width * 0.05, dp(24))
+        )
+        toast.text_size = (toast.width - dp(20), None)
+        
+        with toast.canvas.before:
+            Color(*App.get_running_app().theme.rgba('SECONDARY_COLOR'))
+            RoundedRectangle(pos=toast.pos, size=toast.size, radius=[dp(10)])
+        
+        Window.add_widget(toast)
+        self.toast = toast
+        
+        if not self.animate:
+            Clock.schedule_once(lambda dt: self.dismiss(toast), self.DURATION)
+            return
+        fade = Animation(duration=self.DURATION) + Animation(opacity=0, duration=0.5)
+        fade.bind(on_complete=lambda *args: self.dismiss(toast))
+        fade.start(toast)
+    
+    def dismiss(self, toast):
+        if toast is self.toast:
+            Window.remove_widget(toast)
+            self.toast = None
+
+class PlatformNotificationBackend:
+    """System notifications through plyer, falling back to toasts
+    
+    Alerts are only delivered while the app is running; waking a closed
+    app at the due time needs a platform alarm service.
+    """
+    
+    def __init__(self, fallback):
+        self.fallback = fallback
+        try:
+            from plyer import notification
+        except ImportError:
+            notification = None
+        self.notification = notification
+    
+    def notify(self, title, message):
+        if self.notification is not None:
+            try:
+                self.notification.notify(title=title, message=message, app_name='F1 Hub', timeout=10)
+                return
+            except (NotImplementedError, OSError):
+                pass
+        self.fallback.notify(title, message)
+
+class NotificationScheduler:
+    """Delivers queued alerts from one Clock event armed for the next due time
+    
+    Nothing polls: the queue is planned from the schedule, and the only
+    network traffic is a results check around each race's expected
+    finish, retried with backoff until the classification is published.
+    """
+    
+    # Alert kind -> the setting that switches it on
+    CATEGORIES = {
+        'race_start': 'race_start_alerts',
+        'news': 'breaking_news',
+        'results': 'championship_updates'
+    }
+    
+    def __init__(self, queue, data_manager, backend, settings):
+        self.queue = queue
+        self.data_manager = data_manager
+        self.backend = backend
+        self.settings = settings
+        self._event = None
+    
+    def is_enabled(self, kind):
+        return kind in self.CATEGORIES and self.settings.get(self.CATEGORIES[kind])
+    
+    def notify(self, kind, title, message):
+        """Show an alert now if its category is switched on"""
+        if self.is_enabled(kind):
+            self.backend.notify(title, message)
+    
+    def plan(self, session_clock):
+        """Queue alerts for the sessions ahead and re-arm the timer"""
+        if self.queue.plan(session_clock.sessions, time.time()):
+            self.queue.save()
+        self.arm()
+    
+    def arm(self):
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        
+        due = self.queue.next_due()
+        if due is not None:
+            self._event = Clock.schedule_once(self.deliver, max(due - time.time(), 0))
+    
+    def deliver(self, *args):
+        self._event = None
+        
+        for key, alert in self.queue.pop_due(time.time()):
+            if alert['kind'] == 'results':
+                # Only spend a request on results when someone will be told about them
+                if self.is_enabled('results'):
+                    threading.Thread(target=self.check_results, args=(key, alert), daemon=True).start()
+            else:
+                self.notify(alert['kind'], alert['title'], alert['message'])
+        
+        self.queue.save()
+        self.arm()
+    
+    def check_results(self, key, alert):
+        results = self.data_manager.get_race_results(alert['season'], alert['round'])
+        try:
+            if results:
+                self.data_manager.sync_season(alert['season'])
+        except (requests.RequestException, LookupError, TypeError, ValueError) as error:
+            # The alert still goes out, standings catch up on the next sync
+            self.data_manager.metrics.error('sync_errors', f"{self.data_manager.base_url}/{alert['season']}/sync", error)
+        finally:
+            Clock.schedule_once(lambda dt: self.on_results(key, alert, results))
+    
+    def on_results(self, key, alert, results):
+        if results:
+            podium = [result['name'] for result in sorted(results, key=lambda result: result['position'])[:3]]
+            message = f"{podium[0]} wins" + (f", ahead of {' and '.join(podium[1:])}" if len(podium) > 1 else '')
+            self.notify('results', f"{alert['race']} result", message)
+            return
+        
+        attempt = alert['attempt']
+        if attempt < len(self.queue.RESULT_RETRIES):
+            retry = dict(alert, attempt=attempt + 1)
+            self.queue.retry(time.time() + self.queue.RESULT_RETRIES[attempt], key, retry)
+            self.queue.save()
+            self.arm()
+
 class LiveTimingScreen(Screen):
     """Live race timing and telemetry screen"""
     
+    POLL_INTERVAL = 2
+    SLOW_POLL_INTERVAL = 10  # Under Data Saver or low power
+    REPLAY_TICK = 0.25
+    REPLAY_SPEEDS = (1, 4, 16, 64)
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.timing_data = {}
+        self.timing_rows = []  # Label widgets of each table row, reused between updates
+        self.session_key = 'live'  # Recordings are filed under the session shown in the race info card
+        self.next_session = None
         self.is_live = False
+        self.shown_live = None
+        self.replay = None  # RaceTimeline while replaying, live timing is paused meanwhile
+        self.replay_time = 0.0
+        self.replay_speed = 0
+        self.replay_playing = False
+        self.replay_colors = {}  # Driver -> index into the chart colors, fixed for the whole replay
+        self.pit_loss = StrategyAnalysis.DEFAULT_PIT_LOSS  # For the rejoin column, from the replayed race when there is one
+        self.shown_lap = None
         self.build_interface()
     
     def build_interface(self):
@@ -836,18 +2112,18 @@ class LiveTimingScreen(Screen):
         # Header with live indicator
         header = BoxLayout(orientation='horizontal', size_hint_y=0.1)
         
-        title = Label(
+        title = ThemedLabel(
             text='Live Timing',
             font_size=dp(20),
             bold=True,
-            color=get_color_from_hex(AppTheme.TEXT_PRIMARY)
+            color_role='TEXT_PRIMARY'
         )
         
         # Live status indicator
-        self.live_indicator = Label(
+        self.live_indicator = ThemedLabel(
             text='● OFFLINE',
             font_size=dp(12),
-            color=get_color_from_hex(AppTheme.ERROR_COLOR),
+            color_role='ERROR_COLOR',
             size_hint_x=0.3
         )
         
@@ -856,6 +2132,7 @@ class LiveTimingScreen(Screen):
         
         # Race info card
         self.race_info_card = self.create_race_info_card()
+        replay_bar = self.create_replay_bar()
         
         # Timing table
         timing_scroll = ScrollView()
@@ -868,14 +2145,52 @@ class LiveTimingScreen(Screen):
         
         timing_scroll.add_widget(self.timing_layout)
         
+        # Track map with estimated car positions, and lap time traces per driver
+        self.circuit_map = CircuitMap(size_hint_y=0.3)
+        self.lap_history = {}
+        self.lap_chart = LineChart(y_from_zero=False, size_hint_y=0.25)
+        
         main_layout.add_widget(header)
         main_layout.add_widget(self.race_info_card)
+        main_layout.add_widget(replay_bar)
+        main_layout.add_widget(self.circuit_map)
         main_layout.add_widget(timing_scroll)
+        main_layout.add_widget(self.lap_chart)
         
         self.add_widget(main_layout)
         
-        # Start timing updates
-        Clock.schedule_interval(self.update_timing, 2)
+        # Timing is only polled while this screen is showing, less often under Data Saver or low power
+        self.timing_event = None
+        app = App.get_running_app()
+        app.settings.subscribe('data_saver', self.restart_polling)
+        app.low_power.bind(self.restart_polling)
+    
+    def on_enter(self, *args):
+        self.start_polling()
+    
+    def on_leave(self, *args):
+        self.stop_polling()
+    
+    def start_polling(self):
+        self.stop_polling()
+        app = App.get_running_app()
+        slow = app.settings.get('data_saver') or app.low_power.active
+        if self.replay is not None:
+            # Replays need no network, only low power slows their ticks
+            interval = self.REPLAY_TICK * 4 if app.low_power.active else self.REPLAY_TICK
+        else:
+            interval = self.SLOW_POLL_INTERVAL if slow else self.POLL_INTERVAL
+        self.timing_event = Clock.schedule_interval(self.update_timing, interval)
+        self.update_timing(0)
+    
+    def stop_polling(self):
+        if self.timing_event is not None:
+            self.timing_event.cancel()
+            self.timing_event = None
+    
+    def restart_polling(self, *args):
+        if self.timing_event is not None:
+            self.start_polling()
     
     def create_race_info_card(self):
         """Create race information card"""
@@ -887,36 +2202,37 @@ class LiveTimingScreen(Screen):
         
         # Circuit info
         circuit_layout = BoxLayout(orientation='vertical', size_hint_x=0.6)
-        circuit_name = Label(
-            text='Next: Abu Dhabi Grand Prix',
+        self.circuit_name = ThemedLabel(
+            text='Next: TBC',
             font_size=dp(14),
             bold=True,
-            color=get_color_from_hex(AppTheme.TEXT_PRIMARY),
+            color_role='TEXT_PRIMARY',
             halign='left'
         )
-        circuit_details = Label(
-            text='Yas Marina Circuit • Nov 26, 2023',
+        self.circuit_details = ThemedLabel(
+            text='Loading schedule...',
             font_size=dp(12),
-            color=get_color_from_hex(AppTheme.TEXT_SECONDARY),
+            color_role='TEXT_SECONDARY',
             halign='left'
         )
         
-        circuit_layout.add_widget(circuit_name)
-        circuit_layout.add_widget(circuit_details)
+        circuit_layout.add_widget(self.circuit_name)
+        circuit_layout.add_widget(self.circuit_details)
         
         # Session info
         session_layout = BoxLayout(orientation='vertical', size_hint_x=0.4)
-        self.session_label = Label(
+        self.session_label = ThemedLabel(
             text='Race Weekend',
             font_size=dp(12),
             bold=True,
-            color=get_color_from_hex(AppTheme.PRIMARY_COLOR)
+            color_role='PRIMARY_COLOR'
         )
-        self.countdown_label = Label(
-            text='5 days to go',
+        self.countdown_label = ThemedLabel(
+            text='',
             font_size=dp(11),
-            color=get_color_from_hex(AppTheme.TEXT_SECONDARY)
+            color_role='TEXT_SECONDARY'
         )
+        App.get_running_app().countdown_ticker.register(self.countdown_label, on_session=self.show_next_session)
         
         session_layout.add_widget(self.session_label)
         session_layout.add_widget(self.countdown_label)
@@ -927,17 +2243,231 @@ class LiveTimingScreen(Screen):
         card.add_widget(race_info)
         return card
     
+    def create_replay_bar(self):
+        """Replay controls, the slider scrubs by lap"""
+        replay_bar = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(36), spacing=dp(5))
+        
+        self.replay_button = ThemedButton(
+            text='Replay',
+            size_hint_x=0.2,
+            font_size=dp(12),
+            background_normal='',
+            background_role='SECONDARY_COLOR'
+        )
+        self.replay_button.bind(on_press=lambda x: self.load_replay() if self.replay is None else self.stop_replay())
+        
+        self.play_button = ThemedButton(
+            text='Pause',
+            size_hint_x=0.15,
+            font_size=dp(12),
+            disabled=True
+        )
+        self.play_button.bind(on_press=self.toggle_playback)
+        
+        self.lap_slider = Slider(min=0, max=1, step=1, value=0, disabled=True)
+        self.lap_slider.bind(value=self.on_lap_slider)
+        
+        self.speed_button = ThemedButton(
+            text=f"{self.REPLAY_SPEEDS[0]}x",
+            size_hint_x=0.15,
+            font_size=dp(12),
+            disabled=True
+        )
+        self.speed_button.bind(on_press=self.cycle_speed)
+        
+        replay_bar.add_widget(self.replay_button)
+        replay_bar.add_widget(self.play_button)
+        replay_bar.add_widget(self.lap_slider)
+        replay_bar.add_widget(self.speed_button)
+        return replay_bar
+    
+    def show_next_session(self, session):
+        """Update the race info card when the next session changes"""
+        self.next_session = session
+        if self.replay is not None:
+            return  # The card shows the replayed race until the replay ends
+        
+        if session is None:
+            self.circuit_name.text = 'No upcoming sessions'
+            self.circuit_details.text = ''
+            self.session_label.text = 'Race Weekend'
+            self.circuit_map.set_track(None)
+            return
+        
+        self.session_key = f"{App.get_running_app().data_manager.current_season}:{session['round']}:{session['name']}"
+        self.circuit_name.text = f"Next: {session['race']}"
+        self.circuit_details.text = f"{session['circuit']} • {session['local_label']}"
+        self.session_label.text = session['name']
+        
+        circuits = App.get_running_app().data_manager.circuits
+        self.circuit_map.set_track(circuits.track(session['circuit_id']) if circuits and session['circuit_id'] else None)
+    
     def update_timing(self, dt):
         """Update live timing data"""
+        if self.replay is not None:
+            if self.replay_playing:
+                self.replay_time = min(self.replay_time + dt * self.REPLAY_SPEEDS[self.replay_speed], self.replay.duration)
+                if self.replay_time >= self.replay.duration:
+                    self.replay_playing = False
+                    self.play_button.text = 'Play'
+            self.show_replay_frame()
+            return
+        
+        # Live from the start of the session in the race info card until its scheduled end
+        session = self.next_session
+        self.is_live = session is not None and session['start'] <= datetime.now(timezone.utc) < session['end']
+        
+        # Widgets are only touched when something changed, so an idle screen never redraws
+        if self.is_live != self.shown_live:
+            self.shown_live = self.is_live
+            if self.is_live:
+                self.live_indicator.text = '● LIVE'
+                self.live_indicator.color_role = 'SUCCESS_COLOR'
+            else:
+                self.live_indicator.text = '● OFFLINE'
+                self.live_indicator.color_role = 'ERROR_COLOR'
+        
         if self.is_live:
-            self.live_indicator.text = '● LIVE'
-            self.live_indicator.color = get_color_from_hex(AppTheme.SUCCESS_COLOR)
-            
             # Simulate live timing updates
             self.update_timing_table()
+            self.update_car_positions()
+    
+    # Replay
+    def load_replay(self):
+        """Load the laps of the latest finished race off the UI thread"""
+        data_manager = App.get_running_app().data_manager
+        session_key = self.session_key
+        self.replay_button.text = 'Loading...'
+        
+        def load():
+            completed = [race for race in data_manager.get_race_schedule() if race['status'] == 'completed']
+            race = max(completed, key=lambda race: race['round'], default=None)
+            timeline = None
+            pit_loss = StrategyAnalysis.DEFAULT_PIT_LOSS
+            if race is not None:
+                try:
+                    timeline = RaceTimeline(data_manager.get_lap_times(data_manager.current_season, race['round']))
+                    pit_loss = data_manager.get_strategy(data_manager.current_season, race['round']).pit_loss
+                except (requests.RequestException, KeyError, ValueError):
+                    pass
+            
+            # Without lap data from Ergast, fall back to what was recorded live this session
+            if (timeline is None or not timeline.lap_count) and data_manager.timing_recordings.get(session_key):
+                race = None
+                timeline = RaceTimeline.from_recording(data_manager.timing_recordings[session_key])
+            
+            Clock.schedule_once(lambda dt: self.start_replay(race, timeline, pit_loss))
+        
+        threading.Thread(target=load, daemon=True).start()
+    
+    def start_replay(self, race, timeline, pit_loss):
+        if timeline is None or not timeline.lap_count:
+            self.replay_button.text = 'Replay'
+            self.circuit_details.text = 'No lap data to replay'
+            return
+        
+        self.replay = timeline
+        self.replay_time = 0.0
+        self.replay_playing = True
+        self.pit_loss = pit_loss
+        self.shown_lap = None
+        self.replay_colors = {driver: index for index, driver in enumerate(timeline.drivers)}
+        
+        self.replay_button.text = 'Live'
+        self.play_button.text = 'Pause'
+        self.lap_slider.max = timeline.lap_count
+        self.play_button.disabled = self.lap_slider.disabled = self.speed_button.disabled = False
+        self.live_indicator.text = '● REPLAY'
+        self.live_indicator.color_role = 'INFO_COLOR'
+        self.shown_live = None
+        
+        if race is not None:
+            self.circuit_name.text = f"Replay: {race['name']}"
+            self.circuit_details.text = f"{race['circuit']} • {race['date']}"
+            circuits = App.get_running_app().data_manager.circuits
+            self.circuit_map.set_track(circuits.track(race['circuit_id']) if circuits and race.get('circuit_id') else None)
         else:
-            self.live_indicator.text = '● OFFLINE'
-            self.live_indicator.color = get_color_from_hex(AppTheme.ERROR_COLOR)
+            self.circuit_name.text = 'Replay: recorded session'
+        self.session_label.text = f"{timeline.lap_count} laps"
+        
+        self.restart_polling()
+    
+    def stop_replay(self):
+        """Back to live timing"""
+        self.replay = None
+        self.replay_playing = False
+        self.pit_loss = StrategyAnalysis.DEFAULT_PIT_LOSS
+        self.replay_button.text = 'Replay'
+        self.play_button.disabled = self.lap_slider.disabled = self.speed_button.disabled = True
+        self.timing_data = {}
+        self.lap_history = {}
+        self.lap_chart.set_series([])
+        self.show_timing([])
+        self.show_next_session(self.next_session)
+        self.restart_polling()
+    
+    def toggle_playback(self, instance):
+        if not self.replay_playing and self.replay_time >= self.replay.duration:
+            self.replay_time = 0.0  # Play again from the start once the end was reached
+        self.replay_playing = not self.replay_playing
+        self.play_button.text = 'Pause' if self.replay_playing else 'Play'
+    
+    def cycle_speed(self, instance):
+        self.replay_speed = (self.replay_speed + 1) % len(self.REPLAY_SPEEDS)
+        self.speed_button.text = f"{self.REPLAY_SPEEDS[self.replay_speed]}x"
+    
+    def on_lap_slider(self, slider, value):
+        # Moves made by playback itself are already showing
+        if self.replay is None or int(value) == self.shown_lap:
+            return
+        self.replay_time = self.replay.time_at_lap(int(value))
+        self.show_replay_frame()
+    
+    def show_replay_frame(self):
+        """Show the replayed race at replay_time"""
+        frame = self.replay.frame_at(self.replay_time)
+        self.show_timing(frame)
+        
+        # The slider and lap chart only move when the leader starts a new lap
+        lap = self.replay.leader_lap(self.replay_time)
+        if lap != self.shown_lap:
+            self.shown_lap = lap
+            self.lap_slider.value = lap
+            self.lap_chart.set_series(self.replay.lap_series(self.replay_time))
+        
+        colors = self.lap_chart.colors
+        self.circuit_map.set_positions(
+            {row['driver']: (row['progress'], colors[self.replay_colors[row['driver']] % len(colors)]) for row in frame},
+            self.timing_event.timeout if self.timing_event is not None else 0
+        )
+    
+    def update_car_positions(self):
+        """Estimate where each car is on the lap from its gap, and glide the map dots there"""
+        lap_times = [parse_lap_time(driver_data['best_lap']) for driver_data in self.timing_data]
+        lap_time = min((seconds for seconds in lap_times if seconds), default=None)
+        if lap_time is None or self.timing_event is None:
+            return
+        
+        colors = self.lap_chart.colors
+        leader = (Clock.get_time() / lap_time) % 1
+        positions = {}
+        for index, driver_data in enumerate(self.timing_data):
+            gap = parse_lap_time(driver_data['gap'].lstrip('+')) or 0
+            positions[driver_data['driver']] = (leader - gap / lap_time, colors[index % len(colors)])
+        
+        self.circuit_map.set_positions(positions, self.timing_event.timeout)
+    
+    def record_laps(self, timing_data):
+        """Append each driver's latest lap to their trace and replot"""
+        for driver_data in timing_data:
+            seconds = parse_lap_time(driver_data['last_lap'])
+            if seconds is not None:
+                history = self.lap_history.setdefault(driver_data['driver'], [])
+                history.append((len(history) + 1, seconds))
+        
+        self.lap_chart.set_series([
+            {'name': driver, 'points': history} for driver, history in self.lap_history.items()
+        ])
     
     def update_timing_table(self):
         """Update the timing table with live data"""
@@ -950,62 +2480,76 @@ class LiveTimingScreen(Screen):
             {'pos': 5, 'driver': 'LEC', 'gap': '+28.890', 'last_lap': '1:26.789', 'best_lap': '1:24.567'}
         ]
         
-        self.timing_layout.clear_widgets()
-        
-        # Table header
-        header = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(30))
-        headers = ['POS', 'DRIVER', 'GAP', 'LAST LAP', 'BEST LAP']
-        
-        for header_text in headers:
-            label = Label(
-                text=header_text,
-                font_size=dp(10),
-                bold=True,
-                color=get_color_from_hex(AppTheme.TEXT_SECONDARY)
-            )
-            header.add_widget(label)
-        
-        self.timing_layout.add_widget(header)
+        if timing_data == self.timing_data:
+            return
+        self.timing_data = timing_data
+        App.get_running_app().data_manager.record_timing(self.session_key, timing_data)
+        self.record_laps(timing_data)
+        self.show_timing(timing_data)
+    
+    def show_timing(self, timing_data):
+        """Fill the timing table, reusing row widgets so only cells that changed re-render"""
+        if not timing_data:
+            self.timing_layout.clear_widgets()
+            self.timing_rows = []
+            return
+        
+        if not self.timing_rows:
+            # Table header
+            header = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(30))
+            headers = ['POS', 'DRIVER', 'GAP', 'LAST LAP', 'BEST LAP', 'PIT']
+            
+            for header_text in headers:
+                label = ThemedLabel(
+                    text=header_text,
+                    font_size=dp(10),
+                    bold=True,
+                    color_role='TEXT_SECONDARY'
+                )
+                header.add_widget(label)
+            
+            self.timing_layout.add_widget(header)
         
         # Timing rows
-        for driver_data in timing_data:
+        while len(self.timing_rows) < len(timing_data):
             row = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(35))
             
             # Position
-            pos_label = Label(
-                text=str(driver_data['pos']),
+            pos_label = ThemedLabel(
                 font_size=dp(14),
                 bold=True,
-                color=get_color_from_hex(AppTheme.TEXT_PRIMARY)
+                color_role='TEXT_PRIMARY'
             )
             
             # Driver code
-            driver_label = Label(
-                text=driver_data['driver'],
+            driver_label = ThemedLabel(
                 font_size=dp(14),
                 bold=True,
-                color=get_color_from_hex(AppTheme.PRIMARY_COLOR)
+                color_role='PRIMARY_COLOR'
             )
             
             # Gap
-            gap_label = Label(
-                text=driver_data['gap'],
+            gap_label = ThemedLabel(
                 font_size=dp(12),
-                color=get_color_from_hex(AppTheme.TEXT_PRIMARY)
+                color_role='TEXT_PRIMARY'
             )
             
             # Last lap
-            last_lap_label = Label(
-                text=driver_data['last_lap'],
+            last_lap_label = ThemedLabel(
                 font_size=dp(12),
-                color=get_color_from_hex(AppTheme.TEXT_PRIMARY)
+                color_role='TEXT_PRIMARY'
             )
             
             # Best lap
-            best_lap_label = Label(
-                text=driver_data['best_lap'],
+            best_lap_label = ThemedLabel(
+                font_size=dp(12),
+                color_role='TEXT_PRIMARY'
+            )
+            
+            # Projected rejoin position after a stop this lap
+            pit_label = ThemedLabel(
                 font_size=dp(12),
-                color=get_color_from_hex(AppTheme.SUCCESS_COLOR) if driver_data['pos'] == 1 else get_color_from_hex(AppTheme.TEXT_PRIMARY)
+                color_role='TEXT_SECONDARY'
             )
             
             row.add_widget(pos_label)
@@ -1013,126 +2557,395 @@ class LiveTimingScreen(Screen):
             row.add_widget(gap_label)
             row.add_widget(last_lap_label)
             row.add_widget(best_lap_label)
+            row.add_widget(pit_label)
             
             self.timing_layout.add_widget(row)
+            self.timing_rows.append((row, pos_label, driver_label, gap_label, last_lap_label, best_lap_label, pit_label))
+        
+        while len(self.timing_rows) > len(timing_data):
+            self.timing_layout.remove_widget(self.timing_rows.pop()[0])
+        
+        rejoin = project_rejoin(timing_data, self.pit_loss)
+        for labels, driver_data in zip(self.timing_rows, timing_data):
+            _, pos_label, driver_label, gap_label, last_lap_label, best_lap_label, pit_label = labels
+            pos_label.text = str(driver_data['pos'])
+            driver_label.text = driver_data['driver']
+            gap_label.text = driver_data['gap']
+            last_lap_label.text = driver_data['last_lap']
+            best_lap_label.text = driver_data['best_lap']
+            best_lap_label.color_role = 'SUCCESS_COLOR' if driver_data['pos'] == 1 else 'TEXT_PRIMARY'
+            pit_label.text = f"P{rejoin[driver_data['driver']]}" if driver_data['driver'] in rejoin else ''
 
-class NewsScreen(Screen):
-    """F1 News and Updates Screen"""
+class ImageCache:
+    """Size-aware LRU cache of decoded thumbnails
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.build_interface()
+    Downloading and decoding happen on worker threads; only the texture
+    upload runs on the UI thread. Least recently used textures are
+    evicted once max_bytes of pixel data is held.
+    """
     
-    def build_interface(self):
-        main_layout = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
-        
-        # Header
-        header = BoxLayout(orientation='horizontal', size_hint_y=0.1)
-        title = Label(
-            text='F1 News & Updates',
-            font_size=dp(20),
-            bold=True,
-            color=get_color_from_hex(AppTheme.TEXT_PRIMARY)
-        )
-        header.add_widget(title)
-        
-        # News feed
-        news_scroll = ScrollView()
-        news_layout = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None)
-        news_layout.bind(minimum_height=news_layout.setter('height'))
-        
-        # Mock news articles
-        news_articles = [
-            {
-                'title': 'Verstappen Clinches Third Consecutive Championship',
-                'summary': 'Max Verstappen secured his third Formula 1 World Championship with a dominant performance...',
-                'time': '2 hours ago',
-                'category': 'Championship'
-            },
-            {
-                'title': 'Abu Dhabi GP: Preview and Predictions',
-                'summary': 'The season finale promises excitement as teams battle for final constructor points...',
-                'time': '5 hours ago',
-                'category': 'Race Preview'
-            },
-            {
-                'title': 'Mercedes Announces 2024 Driver Lineup',
-                'summary': 'Mercedes confirms Hamilton and Russell will continue for the 2024 season...',
-                'time': '1 day ago',
-                'category': 'Driver News'
-            },
-            {
-                'title': 'Technical Regulation Changes for 2024',
-                'summary': 'FIA announces key technical regulation updates for the upcoming season...',
-                'time': '2 days ago',
-                'category': 'Regulations'
-            }
-        ]
-        
-        for article in news_articles:
-            card = self.create_news_card(article)
-            news_layout.add_widget(card)
-        
-        news_scroll.add_widget(news_layout)
-        main_layout.add_widget(header)
-        main_layout.add_widget(news_scroll)
-        
-        self.add_widget(main_layout)
+    def __init__(self, max_bytes=16 * 1024 * 1024, workers=2, http_get=None):
+        self.max_bytes = max_bytes
+        self.http_get = http_get or requests.get
+        self.total_bytes = 0
+        self.textures = OrderedDict()  # source -> (texture, size in bytes)
+        self.pending = {}              # source -> callbacks waiting for it
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.allow_remote = True       # Cleared by Data Saver and Offline Mode
     
-    def create_news_card(self, article):
-        """Create a news article card"""
-        card = CustomCard()
-        card.height = dp(120)
+    def accepts(self, source):
+        """Whether load() will deliver this image under the current settings"""
+        return self.allow_remote or not source.startswith(('http://', 'https://')) or source in self.textures
+    
+    def load(self, source, callback):
+        """Call callback(texture) once the image is available"""
+        cached = self.textures.get(source)
+        if cached is not None:
+            self.textures.move_to_end(source)
+            callback(cached[0])
+            return
+        
+        if source in self.pending:
+            self.pending[source].append(callback)
+            return
+        
+        if not self.accepts(source):
+            return
+        self.pending[source] = [callback]
+        self.executor.submit(self._decode, source)
+    
+    def _decode(self, source):
+        image = None
+        path = source
+        try:
+            if source.startswith(('http://', 'https://')):
+                response = self.http_get(source, timeout=10)
+                response.raise_for_status()
+                suffix = os.path.splitext(urlparse(source).path)[1] or '.jpg'
+                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as handle:
+                    handle.write(response.content)
+                    path = handle.name
+            try:
+                image = ImageLoader.load(path, nocache=True)
+            except Exception:  # Kivy's loaders raise a bare Exception for an image they can't decode
+                image = None
+        except (requests.RequestException, OSError):
+            image = None  # Not downloaded or not readable, the card keeps its placeholder
+        finally:
+            if path != source:
+                os.remove(path)
+        
+        Clock.schedule_once(lambda dt: self._deliver(source, image))
+    
+    def _deliver(self, source, image):
+        callbacks = self.pending.pop(source, [])
+        if image is None:
+            return
+        
+        texture = image.texture
+        size = texture.width * texture.height * 4
+        self.textures[source] = (texture, size)
+        self.total_bytes += size
+        
+        while self.total_bytes > self.max_bytes and len(self.textures) > 1:
+            _, (_, evicted_size) = self.textures.popitem(last=False)
+            self.total_bytes -= evicted_size
+        
+        for callback in callbacks:
+            callback(texture)
+
+class AssetAtlas:
+    """Team logos and driver photos from the pre-scaled atlases for this screen's density
+    
+    A kind's atlas index is read the first time it's asked for. Pages are
+    decoded through the shared ImageCache, so a screen of cards costs one
+    texture per page and pages are evicted along with the other images.
+    """
+    
+    def __init__(self, image_cache, directory=ATLAS_DIR, density=None):
+        self.image_cache = image_cache
+        self.directory = os.path.join(directory, density_bucket(density or Metrics.density))
+        self.indexes = {}  # kind -> {asset id: (page path, region)}
+    
+    def regions(self, kind):
+        index = self.indexes.get(kind)
+        if index is None:
+            index = {}
+            try:
+                with open(os.path.join(self.directory, f"{kind}.atlas"), encoding='utf-8') as handle:
+                    pages = json.load(handle)
+            except (OSError, ValueError):
+                pages = {}  # No atlas built, cards stay text-only
+            for page, regions in pages.items():
+                for asset, region in regions.items():
+                    index[asset] = (os.path.join(self.directory, page), tuple(region))
+            self.indexes[kind] = index
+        return index
+    
+    def load(self, kind, name, callback):
+        """Call callback(texture) with the asset's region once its page is decoded"""
+        entry = self.regions(kind).get(asset_id(name))
+        if entry is not None:
+            page, region = entry
+            self.image_cache.load(page, lambda texture: callback(texture.get_region(*region)))
+    
+    def image(self, kind, name, **kwargs):
+        """Image widget that fills in once the asset is loaded, None when there's no such asset"""
+        if asset_id(name) not in self.regions(kind):
+            return None
+        image = Image(allow_stretch=True, **kwargs)
+        self.load(kind, name, lambda texture: setattr(image, 'texture', texture))
+        return image
+
+class NewsCard(RecycleDataViewBehavior, CustomCard):
+    """News article card, recycled as the feed scrolls"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.article_id = None
         
         # Article header
         header = BoxLayout(orientation='horizontal', size_hint_y=0.3)
         
-        category_label = Label(
-            text=article['category'].upper(),
+        self.category_label = ThemedLabel(
             font_size=dp(10),
-            color=get_color_from_hex(AppTheme.PRIMARY_COLOR),
+            color_role='PRIMARY_COLOR',
             bold=True,
             size_hint_x=0.7,
             halign='left'
         )
         
-        time_label = Label(
-            text=article['time'],
+        self.time_label = ThemedLabel(
             font_size=dp(10),
-            color=get_color_from_hex(AppTheme.TEXT_SECONDARY),
+            color_role='TEXT_SECONDARY',
             size_hint_x=0.3,
             halign='right'
         )
         
-        header.add_widget(category_label)
-        header.add_widget(time_label)
+        header.add_widget(self.category_label)
+        header.add_widget(self.time_label)
+        
+        # Thumbnail beside the article text
+        body = BoxLayout(orientation='horizontal', size_hint_y=0.7, spacing=dp(10))
+        self.thumbnail = Image(size_hint_x=0, allow_stretch=True)
         
-        # Article title
-        title_label = Label(
-            text=article['title'],
+        text_layout = BoxLayout(orientation='vertical')
+        self.title_label = ThemedLabel(
             font_size=dp(14),
             bold=True,
-            color=get_color_from_hex(AppTheme.TEXT_PRIMARY),
+            color_role='TEXT_PRIMARY',
             text_size=(None, None),
             halign='left',
-            size_hint_y=0.4
+            size_hint_y=0.55
         )
-        
-        # Article summary
-        summary_label = Label(
-            text=article['summary'],
+        self.summary_label = ThemedLabel(
             font_size=dp(12),
-            color=get_color_from_hex(AppTheme.TEXT_SECONDARY),
+            color_role='TEXT_SECONDARY',
             text_size=(None, None),
             halign='left',
-            size_hint_y=0.3
+            size_hint_y=0.45
         )
+        text_layout.add_widget(self.title_label)
+        text_layout.add_widget(self.summary_label)
         
-        card.add_widget(header)
-        card.add_widget(title_label)
-        card.add_widget(summary_label)
+        body.add_widget(self.thumbnail)
+        body.add_widget(text_layout)
         
-        return card
+        self.add_widget(header)
+        self.add_widget(body)
+    
+    def refresh_view_attrs(self, rv, index, data):
+        """Bind this card to an article; relative time is worked out now, not at load"""
+        self.article_id = data['id']
+        self.category_label.text = data['category'].upper()
+        self.time_label.text = format_relative_time(data['published'])
+        self.title_label.text = data['title']
+        self.summary_label.text = data['summary']
+        
+        image_cache = App.get_running_app().image_cache
+        show_image = bool(data.get('image')) and image_cache.accepts(data['image'])
+        
+        self.thumbnail.texture = None
+        self.thumbnail.size_hint_x = 0.25 if show_image else 0
+        if show_image:
+            image_cache.load(
+                data['image'],
+                lambda texture, article_id=data['id']: self.show_thumbnail(article_id, texture)
+            )
+    
+    def show_thumbnail(self, article_id, texture):
+        # The card may have been recycled for another article in the meantime
+        if article_id == self.article_id:
+            self.thumbnail.texture = texture
+
+class SearchResultCard(RecycleDataViewBehavior, CustomCard):
+    """Compact search result row"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        self.kind_label = ThemedLabel(
+            font_size=dp(10),
+            bold=True,
+            color_role='PRIMARY_COLOR',
+            size_hint_y=0.3,
+            halign='left'
+        )
+        
+        self.title_label = ThemedLabel(
+            font_size=dp(14),
+            bold=True,
+            color_role='TEXT_PRIMARY',
+            size_hint_y=0.4,
+            halign='left'
+        )
+        
+        self.subtitle_label = ThemedLabel(
+            font_size=dp(11),
+            color_role='TEXT_SECONDARY',
+            size_hint_y=0.3,
+            halign='left'
+        )
+        
+        self.add_widget(self.kind_label)
+        self.add_widget(self.title_label)
+        self.add_widget(self.subtitle_label)
+    
+    def refresh_view_attrs(self, rv, index, data):
+        self.kind_label.text = data['kind'].upper()
+        self.title_label.text = data['title']
+        self.subtitle_label.text = data['subtitle']
+
+Factory.register('NewsCard', cls=NewsCard)
+Factory.register('SearchResultCard', cls=SearchResultCard)
+
+class NewsScreen(Screen):
+    """F1 News and Updates Screen"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.data_manager = App.get_running_app().data_manager
+        self.search_index = self.data_manager.search_index
+        self.feed = NewsFeed(self.data_manager.news_source)
+        self.loading = False
+        self.shown_trimmed = 0
+        self.card_height = dp(120)
+        self.result_height = dp(70)
+        self.spacing = dp(10)
+        self.build_interface()
+    
+    def build_interface(self):
+        main_layout = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
+        
+        # Header
+        header = BoxLayout(orientation='horizontal', size_hint_y=0.1)
+        title = ThemedLabel(
+            text='F1 News & Updates',
+            font_size=dp(20),
+            bold=True,
+            color_role='TEXT_PRIMARY'
+        )
+        header.add_widget(title)
+        
+        # Search box - looks up drivers, teams, circuits and articles as you type
+        self.search_input = TextInput(
+            hint_text='Search drivers, teams, circuits, news...',
+            multiline=False,
+            size_hint_y=None,
+            height=dp(40),
+            font_size=dp(14)
+        )
+        self.search_input.bind(text=self.on_search_text)
+        
+        # News feed - a recycled view keeps the number of card widgets constant
+        self.news_view = RecycleView(viewclass='NewsCard')
+        news_layout = RecycleBoxLayout(
+            orientation='vertical',
+            spacing=self.spacing,
+            size_hint_y=None,
+            default_size=(None, self.card_height),
+            default_size_hint=(1, None),
+            key_viewclass='viewclass',
+            key_size='size'
+        )
+        news_layout.bind(minimum_height=news_layout.setter('height'))
+        self.news_view.add_widget(news_layout)
+        self.news_view.bind(scroll_y=self.on_feed_scroll)
+        
+        main_layout.add_widget(header)
+        main_layout.add_widget(self.search_input)
+        main_layout.add_widget(self.news_view)
+        
+        self.add_widget(main_layout)
+        
+        self.load_more_articles()
+    
+    def on_enter(self, *args):
+        """Refresh visible cards so relative times are current"""
+        self.news_view.refresh_from_data()
+    
+    def load_more_articles(self):
+        """Fetch the next page of the feed off the UI thread"""
+        if self.loading or self.feed.exhausted:
+            return
+        self.loading = True
+        threading.Thread(target=self._fetch_page, daemon=True).start()
+    
+    def _fetch_page(self):
+        try:
+            fresh = self.feed.load_more()
+        except (requests.RequestException, LookupError, TypeError, ValueError) as error:
+            fresh = []  # The feed isn't marked exhausted, so the next scroll tries again
+            self.data_manager.metrics.error('news_errors', self.data_manager.news_url or 'news', error)
+        self.data_manager.index_records('article', fresh)
+        Clock.schedule_once(lambda dt: self._show_page(fresh))
+    
+    def _show_page(self, fresh):
+        self.loading = False
+        if self.search_input.text.strip() or not fresh:
+            return
+        
+        # Keep the same articles in view when older ones are dropped from the top
+        dropped = self.feed.trimmed - self.shown_trimmed
+        self.shown_trimmed = self.feed.trimmed
+        view_height = self.news_view.height
+        old_scrollable = max(len(self.news_view.data) * (self.card_height + self.spacing) - view_height, 1)
+        top_offset = (1 - self.news_view.scroll_y) * old_scrollable
+        
+        self.news_view.data = [dict(article, viewclass='NewsCard') for article in self.feed.articles]
+        
+        if dropped > 0:
+            new_scrollable = max(len(self.news_view.data) * (self.card_height + self.spacing) - view_height, 1)
+            top_offset = max(top_offset - dropped * (self.card_height + self.spacing), 0)
+            self.news_view.scroll_y = 1 - min(top_offset / new_scrollable, 1)
+    
+    def on_feed_scroll(self, instance, scroll_y):
+        """Load more near the bottom; reload from the newest after scrolling back past trimmed articles"""
+        if self.search_input.text.strip():
+            return
+        if scroll_y <= 0.1:
+            self.load_more_articles()
+        elif scroll_y >= 1 and self.feed.trimmed and not self.loading:
+            self.feed.reset()
+            self.shown_trimmed = 0
+            self.news_view.data = []
+            self.load_more_articles()
+    
+    def on_search_text(self, instance, text):
+        """Replace the feed with search results while a query is entered"""
+        if not text.strip():
+            self.news_view.data = [dict(article, viewclass='NewsCard') for article in self.feed.articles]
+            return
+        
+        results = self.search_index.search(text)
+        if not results:
+            results = [{'kind': 'search', 'title': f"No results for '{text}'", 'subtitle': ''}]
+        
+        self.news_view.data = [
+            dict(result, viewclass='SearchResultCard', size=(None, self.result_height))
+            for result in results
+        ]
+        self.news_view.scroll_y = 1
 
 class SettingsScreen(Screen):
     """App Settings and Configuration Screen"""
@@ -1146,11 +2959,11 @@ class SettingsScreen(Screen):
         
         # Header
         header = BoxLayout(orientation='horizontal', size_hint_y=0.1)
-        title = Label(
+        title = ThemedLabel(
             text='Settings',
             font_size=dp(20),
             bold=True,
-            color=get_color_from_hex(AppTheme.TEXT_PRIMARY)
+            color_role='TEXT_PRIMARY'
         )
         header.add_widget(title)
         
@@ -1162,58 +2975,50 @@ class SettingsScreen(Screen):
         # Settings groups
         settings_groups = [
             {
-                'title': 'Notifications',
-                'options': [
-                    {'name': 'Race Start Alerts', 'enabled': True},
-                    {'name': 'Breaking News', 'enabled': True},
-                    {'name': 'Championship Updates', 'enabled': False}
-                ]
-            },
-            {
-                'title': 'Data & Sync',
-                'options': [
-                    {'name': 'Auto-refresh', 'enabled': True},
-                    {'name': 'Offline Mode', 'enabled': False},
-                    {'name': 'Data Saver', 'enabled': False}
-                ]
-            },
-            {
-                'title': 'Display',
-                'options': [
-                    {'name': 'Dark Theme', 'enabled': False},
-                    {'name': 'Large Text', 'enabled': False},
-                    {'name': 'Animations', 'enabled': True}
-                ]
+                'title': title,
+                'options': [{'key': key, 'name': name, 'default': default} for key, name, default in options]
             }
+            for title, options in SETTINGS_SCHEMA
         ]
         
         for group in settings_groups:
             group_card = self.create_settings_group(group)
             settings_layout.add_widget(group_card)
         
+        usage_btn = ThemedButton(
+            text='Data Usage',
+            size_hint_y=None,
+            height=dp(40),
+            font_size=dp(14),
+            background_normal='',
+            background_role='SECONDARY_COLOR'
+        )
+        usage_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'usage'))
+        settings_layout.add_widget(usage_btn)
+        
         # App info
         info_card = CustomCard()
         info_card.height = dp(100)
         
         info_layout = BoxLayout(orientation='vertical', spacing=dp(5))
         
-        app_info = Label(
+        app_info = ThemedLabel(
             text='F1 Hub Professional v1.0.0',
             font_size=dp(14),
             bold=True,
-            color=get_color_from_hex(AppTheme.TEXT_PRIMARY)
+            color_role='TEXT_PRIMARY'
         )
         
-        developer_info = Label(
+        developer_info = ThemedLabel(
             text='Developed for Formula 1 Enthusiasts',
             font_size=dp(12),
-            color=get_color_from_hex(AppTheme.TEXT_SECONDARY)
+            color_role='TEXT_SECONDARY'
         )
         
-        copyright_info = Label(
+        copyright_info = ThemedLabel(
             text='© 2023 F1 Hub. All rights reserved.',
             font_size=dp(10),
-            color=get_color_from_hex(AppTheme.TEXT_SECONDARY)
+            color_role='TEXT_SECONDARY'
         )
         
         info_layout.add_widget(app_info)
@@ -1236,11 +3041,11 @@ class SettingsScreen(Screen):
         card.height = dp(40 + len(group['options']) * 35)
         
         # Group title
-        title_label = Label(
+        title_label = ThemedLabel(
             text=group['title'],
             font_size=dp(16),
             bold=True,
-            color=get_color_from_hex(AppTheme.TEXT_PRIMARY),
+            color_role='TEXT_PRIMARY',
             size_hint_y=None,
             height=dp(30)
         )
@@ -1248,31 +3053,135 @@ class SettingsScreen(Screen):
         card.add_widget(title_label)
         
         # Settings options
+        settings = App.get_running_app().settings
         for option in group['options']:
             option_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(30))
             
-            option_label = Label(
+            option_label = ThemedLabel(
                 text=option['name'],
                 font_size=dp(14),
-                color=get_color_from_hex(AppTheme.TEXT_PRIMARY),
+                color_role='TEXT_PRIMARY',
                 size_hint_x=0.8,
                 halign='left'
             )
             
-            # Toggle button (simplified)
-            toggle_btn = Button(
-                text='ON' if option['enabled'] else 'OFF',
-                size_hint_x=0.2,
-                font_size=dp(10),
-                background_color=get_color_from_hex(AppTheme.SUCCESS_COLOR) if option['enabled'] else get_color_from_hex(AppTheme.TEXT_SECONDARY)
-            )
-            
             option_layout.add_widget(option_label)
-            option_layout.add_widget(toggle_btn)
+            
+            if isinstance(option['default'], str):
+                # Text settings are saved when editing finishes, not on every keystroke
+                option_label.size_hint_x = 0.4
+                text_input = TextInput(
+                    text=settings.get(option['key']),
+                    hint_text='http://host:8765',
+                    multiline=False,
+                    size_hint_x=0.6,
+                    font_size=dp(12)
+                )
+                text_input.bind(
+                    on_text_validate=lambda field, key=option['key']: settings.set(key, field.text.strip()),
+                    focus=lambda field, focused, key=option['key']: focused or settings.set(key, field.text.strip())
+                )
+                option_layout.add_widget(text_input)
+            else:
+                # Toggle button, kept in step with the store however the setting changes
+                toggle_btn = ThemedButton(
+                    background_normal='',
+                    size_hint_x=0.2,
+                    font_size=dp(10)
+                )
+                toggle_btn.bind(on_press=lambda btn, key=option['key']: settings.set(key, not settings.get(key)))
+                settings.subscribe(option['key'], lambda enabled, btn=toggle_btn: self.show_toggle(btn, enabled), call_now=True)
+                option_layout.add_widget(toggle_btn)
             
             card.add_widget(option_layout)
         
         return card
+    
+    def show_toggle(self, button, enabled):
+        button.text = 'ON' if enabled else 'OFF'
+        button.background_role = 'SUCCESS_COLOR' if enabled else 'TEXT_SECONDARY'
+
+class DataUsageScreen(Screen):
+    """Network usage report, to check what Data Saver actually saves"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.build_interface()
+    
+    def build_interface(self):
+        main_layout = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
+        
+        # Header
+        header = BoxLayout(orientation='horizontal', size_hint_y=0.1)
+        back_btn = ThemedButton(
+            text='Back',
+            size_hint_x=0.25,
+            font_size=dp(12),
+            background_normal='',
+            background_role='TEXT_SECONDARY'
+        )
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'settings'))
+        title = ThemedLabel(
+            text='Data Usage',
+            font_size=dp(20),
+            bold=True,
+            color_role='TEXT_PRIMARY'
+        )
+        header.add_widget(back_btn)
+        header.add_widget(title)
+        
+        # Totals
+        summary_card = CustomCard()
+        summary_card.height = dp(90)
+        self.totals_label = ThemedLabel(
+            text='',
+            font_size=dp(14),
+            bold=True,
+            color_role='TEXT_PRIMARY'
+        )
+        self.saved_label = ThemedLabel(
+            text='',
+            font_size=dp(12),
+            color_role='SUCCESS_COLOR'
+        )
+        summary_card.add_widget(self.totals_label)
+        summary_card.add_widget(self.saved_label)
+        
+        # Per-endpoint table
+        usage_scroll = ScrollView()
+        self.usage_layout = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_y=None)
+        self.usage_layout.bind(minimum_height=self.usage_layout.setter('height'))
+        usage_scroll.add_widget(self.usage_layout)
+        
+        main_layout.add_widget(header)
+        main_layout.add_widget(summary_card)
+        main_layout.add_widget(usage_scroll)
+        
+        self.add_widget(main_layout)
+    
+    def on_enter(self, *args):
+        """Rebuild the report from the current counters"""
+        report = App.get_running_app().data_manager.budget.report()
+        
+        self.totals_label.text = f"Today {format_bytes(report['today'])} • Last 7 days {format_bytes(report['period'])}"
+        self.saved_label.text = f"{format_bytes(report['saved'])} saved by caching over {report['requests']} requests"
+        
+        self.usage_layout.clear_widgets()
+        for row in report['endpoints']:
+            row_layout = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(44))
+            row_layout.add_widget(ThemedLabel(
+                text=row['endpoint'],
+                font_size=dp(12),
+                color_role='TEXT_PRIMARY',
+                shorten=True,
+                text_size=(self.width - dp(20), None)
+            ))
+            row_layout.add_widget(ThemedLabel(
+                text=f"{row['requests']} requests • {format_bytes(row['bytes'])} • {row['hits']} cached, {format_bytes(row['saved'])} saved",
+                font_size=dp(10),
+                color_role='TEXT_SECONDARY'
+            ))
+            self.usage_layout.add_widget(row_layout)
 
 # Run the application
 if __name__ == '__main__':
@@ -1284,13 +3193,18 @@ if __name__ == '__main__':
 DEPLOYMENT INSTRUCTIONS FOR PROFESSIONAL MOBILE APP:
 
 1. REQUIREMENTS:
-   pip install kivy kivymd requests python-dateutil
+   pip install kivy kivymd requests python-dateutil numpy
 
 2. FOR ANDROID DEPLOYMENT:
    - Install Buildozer: pip install buildozer
    - Initialize: buildozer init
    - Build APK: buildozer android debug
    - For release: buildozer android release
+   - Bundle past seasons: python f1_data.py warm --first 1950 --last 2022
+     writes data/history.f1a; include 'f1a' in source.include_exts
+   - Bundle track maps: CircuitGeometry.build('data/circuits.f1g', outlines)
+     with outlines keyed by Ergast circuitId (CircuitGeometry.load_geojson
+     reads GeoJSON track lines); include 'f1g' in source.include_exts
 
 3. FOR iOS DEPLOYMENT:
    - Use kivy-ios: pip install kivy-ios
@@ -0,0 +1,4064 @@
+"""
+F1 Hub - Data Layer
+Fetching, caching and offline storage for F1 Hub, importable without Kivy
+Run directly for the headless data-service commands: python f1_data.py --help
+"""
+
+import requests
+import json
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+import xml.etree.ElementTree as ElementTree
+import argparse
+import base64
+import bisect
+import copy
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import threading
+import time
+import unicodedata
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the championship simulator falls back to pure Python
+    np = None
+
+try:
+    from PIL import Image as PILImage
+except ImportError:  # Pillow is only needed to build the image atlases, the app reads the finished pages
+    PILImage = None
+
+# Data Management Classes
+# Series the app can follow: (key, display name); only F1 has a public feed built in
+SERIES = (('f1', 'Formula 1'), ('f2', 'Formula 2'), ('f3', 'Formula 3'), ('f1_academy', 'F1 Academy'))
+
+class SeriesProvider:
+    """Where one racing series' data comes from, and what may be asked of that feed
+    
+    F1DataManager builds every request from the provider's base URL in the
+    Ergast scheme, so the caching, sync, persistence and publishing around
+    it serve any series with an Ergast-compatible feed. The request budget
+    is the feed's rate limit as a token bucket: REQUEST_BURST requests at
+    once, refilled at REQUESTS_PER_HOUR. Only F1 has mock data and the
+    bundled history archive to fall back on.
+    """
+    
+    REQUEST_BURST = 40
+    REQUESTS_PER_HOUR = 500
+    
+    def __init__(self, series='f1', base_url='http://ergast.com/api/f1'):
+        self.series = series
+        self.name = dict(SERIES).get(series, series)
+        self.base_url = base_url.rstrip('/')
+        self.mock_data = series == 'f1'
+        self.bundled_history = series == 'f1'
+
+class RequestBudget:
+    """Token bucket that keeps a feed's requests within its rate limit
+    
+    acquire() takes a token, waiting for one to be refilled for at most
+    timeout seconds, and says whether it got one.
+    """
+    
+    def __init__(self, burst, per_hour):
+        self.burst = burst
+        self.rate = per_hour / 3600
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+class SyncIncomplete(requests.ConnectionError):
+    """The request budget ran out during a sync, the synced state was left as it was"""
+
+class SeriesHub:
+    """One data manager per followed series, each created on first use
+    
+    F1 is always followed. A feeder series is enabled by giving it the URL
+    of an Ergast-compatible feed, and nothing of a series is built until
+    it's first asked for, so series the user doesn't follow cost nothing
+    at startup. Each series keeps its own data directory, HTTP cache,
+    request budget and store. setup(manager) runs on every manager the hub
+    creates, for the app to hook up its store and network settings.
+    """
+    
+    def __init__(self, primary, data_dir=None, setup=None):
+        self.data_dir = data_dir
+        self.setup = setup
+        self.feeds = {}  # series -> feed URL of each enabled feeder series
+        self.managers = {'f1': primary}
+        self._lock = threading.Lock()
+    
+    def enable(self, series, url):
+        """Follow a feeder series through the feed at url, or stop following it when url is empty"""
+        url = url.strip().rstrip('/')
+        with self._lock:
+            if self.feeds.get(series) == url:
+                return
+            self.managers.pop(series, None)  # Built again from the new feed when next asked for
+            if url:
+                self.feeds[series] = url
+            else:
+                self.feeds.pop(series, None)
+    
+    def enabled(self):
+        """Followed series in display order"""
+        return [series for series, _ in SERIES if series == 'f1' or series in self.feeds]
+    
+    def manager(self, series):
+        with self._lock:
+            manager = self.managers.get(series)
+            if manager is None:
+                if series not in self.feeds:
+                    raise KeyError(f"Series {series} is not enabled")
+                data_dir = os.path.join(self.data_dir, series) if self.data_dir else None
+                manager = F1DataManager(data_dir=data_dir, provider=SeriesProvider(series, self.feeds[series]))
+                manager.current_season = self.managers['f1'].current_season
+                self.managers[series] = manager
+                if self.setup is not None:
+                    self.setup(manager)
+            return manager
+    
+    def fetch_all(self, method, *args, series=None):
+        """Call one data manager method for several series side by side
+        
+        Returns series -> result, or the exception that series raised, so
+        one failing feed doesn't hold up the others.
+        """
+        series = series or self.enabled()
+        
+        def call(name):
+            try:
+                return getattr(self.manager(name), method)(*args)
+            except (requests.RequestException, LookupError, ValueError) as error:
+                return error
+        
+        with ThreadPoolExecutor(max_workers=len(series)) as pool:
+            return dict(zip(series, pool.map(call, series)))
+
+class F1DataManager:
+    """Handles F1 data fetching and caching, or another series' through its provider"""
+    
+    DATA_SAVER_MAX_AGE = 15 * 60         # Under Data Saver, reuse responses younger than this without asking
+    HTTP_CACHE_ENTRIES = 128
+    HTTP_CACHE_ENTRY_LIMIT = 256 * 1024
+    SYNC_REUSE = 30  # Seconds a sync answers every standings getter, so one refresh syncs once
+    
+    def __init__(self, data_dir=None, provider=None):
+        self.provider = provider or SeriesProvider()
+        self.base_url = self.provider.base_url
+        self.request_budget = RequestBudget(self.provider.REQUEST_BURST, self.provider.REQUESTS_PER_HOUR)
+        self.budget_wait = 0  # Seconds a fetch with nothing cached may wait for a request token, batch jobs raise it
+        self.current_season = "2023"
+        self.cache = {}
+        self.data_dir = data_dir  # Where synced state is kept, nothing is persisted when unset
+        self.season_states = {}
+        self.standings_version = 0
+        self.synced_at = {}          # Season -> time of the last completed sync
+        self.timing_recordings = {}  # Session key -> timestamped live timing rows
+        self.strategy_cache = {}     # (season, round) -> StrategyAnalysis of a race with all its timings out
+        self.session_results = SessionResults()
+        self.store = DataStore()  # Published standings, schedules and weekends that screens subscribe to
+        self.sync_lock = threading.Lock()
+        self.offline = False     # Offline Mode setting, no requests are made while set
+        self.upstream = None     # Base URL of a DataServer to ask before Ergast
+        self.data_saver = False  # Data Saver setting
+        self.budget = DataBudget(os.path.join(data_dir, 'data_usage.json') if data_dir else None)
+        self.metrics = DataMetrics()
+        self.http_cache = OrderedDict()  # URL -> validators and body of the last response
+        self.http_lock = threading.Lock()
+        self.http_cache_path = os.path.join(data_dir, 'http_cache.json') if data_dir else None
+        self.http_cache_changed = False
+        self.load_http_cache()
+        self.search_index = SearchIndex()
+        self.news_url = None  # RSS or JSON feed location, mock articles when unset
+        self.news_source = news_source_for(self.news_url, http_get=self.fetch)
+        
+        # Past seasons are answered from the bundled archive, only the current one hits the network
+        self.history_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'history.f1a')
+        self.history = HistoricalArchive.open(self.history_path) if self.provider.bundled_history else None
+        self.circuits_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'circuits.f1g')
+        self.circuits = CircuitGeometry.open(self.circuits_path)
+    
+    def from_history(self, season):
+        """True when a season can be served from the bundled archive"""
+        return season != self.current_season and self.history is not None and self.history.has_season(season)
+    
+    def get_driver_standings(self, season=None):
+        """Fetch driver standings, current season unless one is given, and publish them"""
+        season = season or self.current_season
+        standings = self._driver_standings(season)
+        self.store.put(f"standings/drivers/{season}", standings)
+        return standings
+    
+    def _driver_standings(self, season):
+        if self.from_history(season):
+            return self.index_records('driver', self.history.get_driver_standings(season))
+        
+        upstream = self._upstream('/standings/drivers', season=season)
+        if upstream is not None:
+            return self.index_records('driver', upstream)
+        
+        synced = self._synced_standings(season, 'drivers')
+        if synced is not None:
+            return self.index_records('driver', synced)
+        
+        try:
+            url = f"{self.base_url}/{season}/driverStandings.json"
+            response = self.fetch(url)
+            
+            if response.status_code == 200:
+                data = response.json()
+                return self.index_records('driver', self.parse_driver_standings(data))
+            else:
+                self.metrics.fallback(url, f"HTTP {response.status_code}")
+                return self.index_records('driver', self.get_mock_driver_standings())
+        except (requests.RequestException, LookupError, TypeError, ValueError) as error:
+            self.metrics.fallback(url, error)
+            return self.index_records('driver', self.get_mock_driver_standings())
+    
+    def get_constructor_standings(self, season=None):
+        """Fetch constructor standings, current season unless one is given, and publish them"""
+        season = season or self.current_season
+        standings = self._constructor_standings(season)
+        self.store.put(f"standings/constructors/{season}", standings)
+        return standings
+    
+    def _constructor_standings(self, season):
+        if self.from_history(season):
+            return self.index_records('constructor', self.history.get_constructor_standings(season))
+        
+        upstream = self._upstream('/standings/constructors', season=season)
+        if upstream is not None:
+            return self.index_records('constructor', upstream)
+        
+        synced = self._synced_standings(season, 'constructors')
+        if synced is not None:
+            return self.index_records('constructor', synced)
+        
+        try:
+            url = f"{self.base_url}/{season}/constructorStandings.json"
+            response = self.fetch(url)
+            
+            if response.status_code == 200:
+                data = response.json()
+                return self.index_records('constructor', self.parse_constructor_standings(data))
+            else:
+                self.metrics.fallback(url, f"HTTP {response.status_code}")
+                return self.index_records('constructor', self.get_mock_constructor_standings())
+        except (requests.RequestException, LookupError, TypeError, ValueError) as error:
+            self.metrics.fallback(url, error)
+            return self.index_records('constructor', self.get_mock_constructor_standings())
+    
+    def get_race_schedule(self, season=None):
+        """Fetch race schedule, current season unless one is given, and publish it"""
+        season = season or self.current_season
+        schedule = self._race_schedule(season)
+        self.store.put(f"schedule/{season}", schedule)
+        return schedule
+    
+    def _race_schedule(self, season):
+        if self.from_history(season):
+            return self.index_records('race', self.history.get_race_schedule(season))
+        
+        upstream = self._upstream('/schedule', season=season)
+        if upstream is not None:
+            return self.index_records('race', upstream)
+        
+        try:
+            url = f"{self.base_url}/{season}.json"
+            response = self.fetch(url)
+            
+            if response.status_code == 200:
+                data = response.json()
+                return self.index_records('race', self.parse_race_schedule(data))
+            else:
+                self.metrics.fallback(url, f"HTTP {response.status_code}")
+                return self.index_records('race', self.get_mock_race_schedule())
+        except (requests.RequestException, LookupError, TypeError, ValueError) as error:
+            self.metrics.fallback(url, error)
+            return self.index_records('race', self.get_mock_race_schedule())
+    
+    def get_race_results(self, season, round_number):
+        """Fetch the classified results of one race"""
+        if self.from_history(str(season)):
+            return self.history.get_race_results(season, round_number)
+        
+        upstream = self._upstream('/results', season=season, round=round_number)
+        if upstream is not None:
+            return upstream
+        
+        try:
+            url = f"{self.base_url}/{season}/{round_number}/results.json"
+            response = self.fetch(url)
+            
+            if response.status_code == 200:
+                return self.parse_race_results(response.json())
+            self.metrics.fallback(url, f"HTTP {response.status_code}")
+            return []
+        except (requests.RequestException, LookupError, TypeError, ValueError) as error:
+            self.metrics.fallback(url, error)
+            return []
+    
+    def get_lap_times(self, season, round_number):
+        """Every lap of one race as {'lap', 'driver', 'position', 'time'} rows, drivers by their three-letter code
+        
+        There is no mock to fall back to, so request errors are raised.
+        """
+        upstream = self._upstream('/laps', season=season, round=round_number)
+        if upstream is not None:
+            return upstream
+        
+        codes = self._driver_codes(season, round_number)
+        
+        # Timings are paged by row, so a lap can straddle two pages
+        laps = []
+        offset = 0
+        while True:
+            data = self._get_json(f"{self.base_url}/{season}/{round_number}/laps.json", params={'limit': 1000, 'offset': offset})
+            for race in data['MRData']['RaceTable']['Races']:
+                for lap in race['Laps']:
+                    for timing in lap['Timings']:
+                        laps.append({
+                            'lap': int(lap['number']),
+                            'driver': codes.get(timing['driverId'], timing['driverId'][:3].upper()),
+                            'position': int(timing['position']),
+                            'time': timing['time']
+                        })
+            offset += 1000
+            if offset >= int(data['MRData']['total']):
+                break
+        
+        return laps
+    
+    def get_pit_stops(self, season, round_number):
+        """Every pit stop of one race as {'driver', 'lap', 'stop', 'duration'} rows, duration in seconds"""
+        upstream = self._upstream('/pitstops', season=season, round=round_number)
+        if upstream is not None:
+            return upstream
+        
+        codes = self._driver_codes(season, round_number)
+        stops = []
+        data = self._get_json(f"{self.base_url}/{season}/{round_number}/pitstops.json", params={'limit': 1000})
+        for race in data['MRData']['RaceTable']['Races']:
+            for stop in race['PitStops']:
+                stops.append({
+                    'driver': codes.get(stop['driverId'], stop['driverId'][:3].upper()),
+                    'lap': int(stop['lap']),
+                    'stop': int(stop['stop']),
+                    'duration': parse_lap_time(stop['duration'])
+                })
+        
+        return stops
+    
+    def get_strategy(self, season, round_number):
+        """Strategy analysis of a finished race, computed once per race once all its timings are out
+        
+        Laps and pit stops are published some hours after the flag, so an
+        analysis is only kept when the laps add up to every finisher's
+        classified lap count and the stops are in.
+        """
+        key = (str(season), int(round_number))
+        analysis = self.strategy_cache.get(key)
+        if analysis is None:
+            laps = self.get_lap_times(season, round_number)
+            stops = self.get_pit_stops(season, round_number)
+            analysis = StrategyAnalysis(laps, stops)
+            results = self.get_race_results(season, round_number)
+            if results and stops and len(laps) >= sum(result['laps'] for result in results):
+                self.strategy_cache[key] = analysis
+        return analysis
+    
+    def _driver_codes(self, season, round_number):
+        """Driver id -> three-letter code for one race, lap and pit stop timings only carry the ids"""
+        codes = {}
+        for race in self._get_json(f"{self.base_url}/{season}/{round_number}/results.json")['MRData']['RaceTable']['Races']:
+            for result in race['Results']:
+                driver = result['Driver']
+                codes[driver['driverId']] = driver.get('code') or driver['familyName'][:3].upper()
+        return codes
+    
+    def _upstream(self, path, **params):
+        """Normalized data from the upstream DataServer, or None to fall back to Ergast"""
+        if not self.upstream:
+            return None
+        try:
+            return self._get_json(f"{self.upstream}{path}", params=params)
+        except (requests.RequestException, ValueError) as error:
+            self.metrics.error('upstream_errors', f"{self.upstream}{path}", error)
+            return None
+    
+    def listen_upstream(self, callback):
+        """Follow the upstream's event stream on a background thread
+        
+        callback(version) runs on that thread for each new upstream data
+        version. The stream is reopened with backoff when it drops and is
+        given up once upstream is changed or cleared.
+        """
+        upstream = self.upstream
+        
+        def run():
+            delay = 1
+            while self.upstream == upstream:
+                if not self.offline:
+                    try:
+                        with requests.get(f"{upstream}/events", stream=True, timeout=(10, DataServer.KEEPALIVE * 2)) as response:
+                            response.raise_for_status()
+                            delay = 1
+                            # Read chunks as they arrive, a fixed read size would sit on a short event
+                            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                                if self.upstream != upstream:
+                                    return
+                                if line.startswith('data:'):
+                                    version = json.loads(line[5:])['version']
+                                    self.sync_season()
+                                    callback(version)
+                    except (requests.RequestException, ValueError) as error:
+                        self.metrics.error('upstream_errors', f"{upstream}/events", error)
+                time.sleep(delay)
+                delay = min(delay * 2, 60)
+        
+        if upstream:
+            threading.Thread(target=run, daemon=True).start()
+    
+    def index_records(self, kind, records):
+        """Add freshly loaded records to the search index and pass them through"""
+        for record in records:
+            if kind == 'driver':
+                self.search_index.add(f"driver:{record['name']}", 'driver', record['name'], subtitle=record['team'])
+                self.search_index.add(f"team:{record['team']}", 'team', record['team'])
+            elif kind == 'constructor':
+                self.search_index.add(f"team:{record['name']}", 'team', record['name'])
+            elif kind == 'race':
+                self.search_index.add(f"race:{record['name']}", 'race', record['name'], record['circuit'], subtitle=record['date'])
+                self.search_index.add(f"circuit:{record['circuit']}", 'circuit', record['circuit'], subtitle=record['name'])
+            elif kind == 'article':
+                self.search_index.add(f"article:{record['id']}", 'article', record['title'], record['summary'], subtitle=record['category'])
+        
+        return records
+    
+    def parse_driver_standings(self, data):
+        """Parse driver standings from API response"""
+        standings = data['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings']
+        parsed_standings = []
+        
+        for driver in standings:
+            parsed_standings.append({
+                'position': int(driver['position']),
+                'name': f"{driver['Driver']['givenName']} {driver['Driver']['familyName']}",
+                'team': driver['Constructors'][0]['name'],
+                'points': int(driver['points']),
+                'wins': int(driver['wins'])
+            })
+        
+        return parsed_standings
+    
+    def parse_race_results(self, data):
+        """Parse one race's results from API response"""
+        races = data['MRData']['RaceTable']['Races']
+        parsed_results = []
+        
+        for race in races:
+            parsed_results.extend(self.parse_result_rows(race['Results']))
+        
+        return parsed_results
+    
+    def parse_result_rows(self, results):
+        """Parse classified race or sprint finishers"""
+        parsed_results = []
+        
+        for result in results:
+            parsed_results.append({
+                'position': int(result['position']),
+                'name': f"{result['Driver']['givenName']} {result['Driver']['familyName']}",
+                'code': result['Driver'].get('code', ''),
+                'team': result['Constructor']['name'],
+                'grid': int(result['grid']),
+                'laps': int(result['laps']),
+                'points': float(result['points']),
+                'status': result['status'],
+                'gap': result.get('Time', {}).get('time', result['status'])  # Winner's race time, then gaps
+            })
+        
+        return parsed_results
+    
+    def parse_qualifying_rows(self, results):
+        """Parse qualifying classification, with each part's time where the driver set one"""
+        parsed_results = []
+        
+        for result in results:
+            parsed_results.append({
+                'position': int(result['position']),
+                'name': f"{result['Driver']['givenName']} {result['Driver']['familyName']}",
+                'code': result['Driver'].get('code', ''),
+                'team': result['Constructor']['name'],
+                'q1': result.get('Q1', ''),
+                'q2': result.get('Q2', ''),
+                'q3': result.get('Q3', '')
+            })
+        
+        return parsed_results
+    
+    def get_mock_driver_standings(self):
+        """Return mock data when API is unavailable"""
+        if not self.provider.mock_data:
+            return []  # Nothing made up for series without mock data
+        return [
+            {'position': 1, 'name': 'Max Verstappen', 'team': 'Red Bull Racing', 'points': 575, 'wins': 19, 'podiums': 21},
+            {'position': 2, 'name': 'Sergio Pérez', 'team': 'Red Bull Racing', 'points': 285, 'wins': 2, 'podiums': 8},
+            {'position': 3, 'name': 'Lewis Hamilton', 'team': 'Mercedes', 'points': 234, 'wins': 3, 'podiums': 7},
+            {'position': 4, 'name': 'Fernando Alonso', 'team': 'Aston Martin', 'points': 206, 'wins': 0, 'podiums': 8},
+            {'position': 5, 'name': 'Charles Leclerc', 'team': 'Ferrari', 'points': 206, 'wins': 1, 'podiums': 6},
+            {'position': 6, 'name': 'Lando Norris', 'team': 'McLaren', 'points': 205, 'wins': 0, 'podiums': 7},
+            {'position': 7, 'name': 'Carlos Sainz Jr.', 'team': 'Ferrari', 'points': 200, 'wins': 1, 'podiums': 4},
+            {'position': 8, 'name': 'George Russell', 'team': 'Mercedes', 'points': 175, 'wins': 1, 'podiums': 4}
+        ]
+    
+    def parse_constructor_standings(self, data):
+        """Parse constructor standings from API response"""
+        standings = data['MRData']['StandingsTable']['StandingsLists'][0]['ConstructorStandings']
+        parsed_standings = []
+        
+        for constructor in standings:
+            parsed_standings.append({
+                'position': int(constructor['position']),
+                'name': constructor['Constructor']['name'],
+                'points': int(constructor['points']),
+                'wins': int(constructor['wins'])
+            })
+        
+        return parsed_standings
+    
+    def get_mock_constructor_standings(self):
+        """Return mock constructor data when API is unavailable"""
+        if not self.provider.mock_data:
+            return []  # Nothing made up for series without mock data
+        return [
+            {'position': 1, 'name': 'Red Bull Racing Honda RBPT', 'points': 860, 'wins': 21},
+            {'position': 2, 'name': 'Mercedes', 'points': 409, 'wins': 0},
+            {'position': 3, 'name': 'Ferrari', 'points': 406, 'wins': 1},
+            {'position': 4, 'name': 'McLaren Mercedes', 'points': 302, 'wins': 0},
+            {'position': 5, 'name': 'Aston Martin Aramco Mercedes', 'points': 280, 'wins': 0},
+            {'position': 6, 'name': 'Alpine Renault', 'points': 120, 'wins': 0},
+            {'position': 7, 'name': 'Williams Mercedes', 'points': 28, 'wins': 0},
+            {'position': 8, 'name': 'AlphaTauri Honda RBPT', 'points': 25, 'wins': 0}
+        ]
+    
+    def parse_race_schedule(self, data):
+        """Parse race schedule from API response"""
+        races = data['MRData']['RaceTable']['Races']
+        today = datetime.now().date()
+        parsed_schedule = []
+        
+        for race in races:
+            race_date = datetime.strptime(race['date'], '%Y-%m-%d')
+            parsed_schedule.append({
+                'round': int(race['round']),
+                'name': race['raceName'],
+                'circuit': race['Circuit']['circuitName'],
+                'circuit_id': race['Circuit']['circuitId'],
+                'date': race_date.strftime('%b %d, %Y'),
+                'status': 'completed' if race_date.date() < today else 'upcoming',
+                'sprint': 'Sprint' in race,
+                'sessions': self.parse_sessions(race)
+            })
+        
+        return parsed_schedule
+    
+    def parse_sessions(self, race):
+        """UTC start times of every session of a race weekend"""
+        sessions = []
+        
+        for key, name in SESSION_KEYS:
+            if 'time' in race.get(key, {}):
+                sessions.append({'name': name, 'start': f"{race[key]['date']}T{race[key]['time']}"})
+        if 'time' in race:
+            sessions.append({'name': 'Race', 'start': f"{race['date']}T{race['time']}"})
+        
+        return sessions
+    
+    def get_mock_race_schedule(self):
+        """Return mock schedule data when API is unavailable"""
+        if not self.provider.mock_data:
+            return []  # Nothing made up for series without mock data
+        return [
+            {'round': 22, 'name': 'Abu Dhabi Grand Prix', 'circuit': 'Yas Marina Circuit', 'circuit_id': 'yas_marina', 'date': 'Nov 26, 2023', 'status': 'upcoming', 'sprint': False, 'sessions': [
+                {'name': 'FP1', 'start': '2023-11-24T09:30:00Z'},
+                {'name': 'FP2', 'start': '2023-11-24T13:00:00Z'},
+                {'name': 'FP3', 'start': '2023-11-25T10:30:00Z'},
+                {'name': 'Qualifying', 'start': '2023-11-25T14:00:00Z'},
+                {'name': 'Race', 'start': '2023-11-26T13:00:00Z'}
+            ]},
+            {'round': 21, 'name': 'Las Vegas Grand Prix', 'circuit': 'Las Vegas Street Circuit', 'circuit_id': 'vegas', 'date': 'Nov 19, 2023', 'status': 'completed', 'winner': 'Max Verstappen', 'sprint': False},
+            {'round': 20, 'name': 'Brazilian Grand Prix', 'circuit': 'Autódromo José Carlos Pace', 'circuit_id': 'interlagos', 'date': 'Nov 05, 2023', 'status': 'completed', 'winner': 'Max Verstappen', 'sprint': True},
+            {'round': 19, 'name': 'United States Grand Prix', 'circuit': 'Circuit of The Americas', 'circuit_id': 'americas', 'date': 'Oct 22, 2023', 'status': 'completed', 'winner': 'Max Verstappen', 'sprint': True},
+            {'round': 18, 'name': 'Mexico City Grand Prix', 'circuit': 'Autódromo Hermanos Rodríguez', 'circuit_id': 'rodriguez', 'date': 'Oct 29, 2023', 'status': 'completed', 'winner': 'Max Verstappen', 'sprint': False},
+            {'round': 17, 'name': 'Japanese Grand Prix', 'circuit': 'Suzuka International Racing Course', 'circuit_id': 'suzuka', 'date': 'Sep 24, 2023', 'status': 'completed', 'winner': 'Max Verstappen', 'sprint': False}
+        ]
+    
+    # Delta sync for the current season
+    def season_state(self, season):
+        """Locally maintained standings for a season, loaded from disk on first use"""
+        state = self.season_states.get(season)
+        if state is None:
+            state = {'last_round': 0, 'drivers': {}, 'constructors': {}, 'rounds': {}, 'stats': {
+                'races': 0, 'winners': [], 'poles': {}, 'fastest_laps': {}, 'dnfs': 0
+            }}
+            path = self._season_state_path(season)
+            if path and os.path.exists(path):
+                try:
+                    with open(path, encoding='utf-8') as handle:
+                        state = json.load(handle)
+                except (OSError, ValueError):
+                    pass
+            self.season_states[season] = state
+        return state
+    
+    def _season_state_path(self, season):
+        if not self.data_dir:
+            return None
+        return os.path.join(self.data_dir, f"season_{season}.json")
+    
+    def _save_season_state(self, season):
+        path = self._season_state_path(season)
+        if not path:
+            return
+        os.makedirs(self.data_dir, exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as handle:
+            json.dump(self.season_states[season], handle)
+        os.replace(path + '.tmp', path)
+    
+    def sync_season(self, season=None):
+        """Fetch and apply only the rounds finished since the last sync
+        
+        Returns the number of rounds applied. A refresh after nothing has
+        changed costs a single empty results request. Sprint results are
+        only asked for on weekends the schedule lists a sprint, and a sync
+        more than one round behind, such as the first of a season, takes
+        every round in one paged request rather than one or two a round,
+        so it stays within the feed's request budget. Rounds are applied to
+        a copy of the synced state that replaces it once the sync is done,
+        so a sync that fails part way leaves the last complete state. One
+        the request budget cuts short raises SyncIncomplete, even when the
+        refused requests were answered from the cache.
+        """
+        season = season or self.current_season
+        
+        with self.sync_lock:
+            state = self.season_state(season)
+            applied = 0
+            
+            # An upstream server has already applied the rounds, so its state is taken whole
+            upstream = self._upstream('/state', season=season)
+            if upstream is not None:
+                applied = max(upstream['last_round'] - state['last_round'], 0)
+                if upstream != state:
+                    self.season_states[season] = upstream
+                    self.standings_version += 1
+                    self._save_season_state(season)
+                    self._publish_standings(season)
+                self.synced_at[season] = time.time()
+                return applied
+            
+            state = copy.deepcopy(state)
+            throttled = self.metrics.total('throttled')
+            try:
+                applied = self._sync_rounds(season, state)
+            finally:
+                # A cached answer to a refused request can't tell whether new results are out.
+                # Throttling on another thread meanwhile counts too, the sync is just tried again
+                if self.metrics.total('throttled') != throttled:
+                    raise SyncIncomplete(f"Request budget for {self.provider.name} used up during the {season} sync")
+            
+            if applied:
+                self.season_states[season] = state
+                self.standings_version += 1
+                self._save_season_state(season)
+                self._publish_standings(season)
+            self.synced_at[season] = time.time()
+        
+        return applied
+    
+    def _sync_rounds(self, season, state):
+        """Apply the rounds finished after state's last round to it, returning how many"""
+        applied = 0
+        round_number = state['last_round'] + 1
+        races = self._get_json(f"{self.base_url}/{season}/{round_number}/results.json")['MRData']['RaceTable']['Races']
+        if races and races[0].get('Results'):
+            # Race results don't say whether the weekend had a sprint, the schedule does
+            schedule = self._get_json(f"{self.base_url}/{season}.json")['MRData']['RaceTable']['Races']
+            sprints = {int(race['round']) for race in schedule if 'Sprint' in race}
+            today = datetime.now().date().isoformat()
+            if sum(1 for race in schedule if int(race['round']) >= round_number and race['date'] < today) > 1:
+                # More than one round to catch up, the whole season in one paged request each
+                results = self._season_results(season, 'results', 'Results')
+                sprint_results = self._season_results(season, 'sprint', 'SprintResults') if sprints else {}
+            else:
+                results = {round_number: races[0]['Results']}
+                sprint_results = {}
+                if round_number in sprints:
+                    sprint_races = self._get_json(f"{self.base_url}/{season}/{round_number}/sprint.json")['MRData']['RaceTable']['Races']
+                    if sprint_races:
+                        sprint_results[round_number] = sprint_races[0].get('SprintResults', [])
+            
+            while results.get(round_number):
+                self.apply_round_results(state, round_number, results[round_number], sprint=False)
+                if sprint_results.get(round_number):
+                    self.apply_round_results(state, round_number, sprint_results[round_number], sprint=True)
+                state['last_round'] = round_number
+                applied += 1
+                round_number += 1
+        
+        return applied
+    
+    def _publish_standings(self, season):
+        """Push freshly synced standings to the store, subscribed screens patch the rows that changed"""
+        state = self.season_state(season)
+        for table in ('drivers', 'constructors'):
+            if state[table]:
+                self.store.put(f"standings/{table}/{season}", self.standings_from_state(state, table))
+    
+    def apply_round_results(self, state, round_number, results, sprint=False):
+        """Fold one session's results into the running standings and statistics"""
+        round_points = state['rounds'].setdefault(str(round_number), {})
+        stats = state['stats']
+        if not sprint:
+            stats['races'] += 1
+        
+        for result in results:
+            driver_id = result['Driver']['driverId']
+            constructor_id = result['Constructor']['constructorId']
+            position = int(result['position'])
+            points = float(result['points'])
+            
+            driver = state['drivers'].setdefault(driver_id, {
+                'name': f"{result['Driver']['givenName']} {result['Driver']['familyName']}",
+                'points': 0, 'wins': 0, 'podiums': 0
+            })
+            driver['team'] = result['Constructor']['name']
+            constructor = state['constructors'].setdefault(constructor_id, {
+                'name': result['Constructor']['name'], 'points': 0, 'wins': 0
+            })
+            
+            driver['points'] += points
+            constructor['points'] += points
+            round_points[driver_id] = round_points.get(driver_id, 0) + points
+            
+            # Sprint wins and podiums don't count towards the race tallies
+            if sprint:
+                continue
+            if position == 1:
+                driver['wins'] += 1
+                constructor['wins'] += 1
+                if driver_id not in stats['winners']:
+                    stats['winners'].append(driver_id)
+            if position <= 3:
+                driver['podiums'] += 1
+            if result.get('grid') == '1':
+                stats['poles'][driver_id] = stats['poles'].get(driver_id, 0) + 1
+            if result.get('FastestLap', {}).get('rank') == '1':
+                stats['fastest_laps'][driver_id] = stats['fastest_laps'].get(driver_id, 0) + 1
+            if self.retired(result):
+                stats['dnfs'] += 1
+    
+    @staticmethod
+    def retired(result):
+        """True when a driver didn't make the classification, lapped finishers still count as finished"""
+        position_text = result.get('positionText')
+        if position_text:
+            return position_text in ('R', 'N')  # Retired or not classified, not disqualified or excluded
+        status = result['status']
+        return status not in ('Finished', 'Lapped') and not status.startswith('+')
+    
+    def standings_from_state(self, state, table):
+        """Sorted standings table ('drivers' or 'constructors') from synced state"""
+        entries = sorted(state[table].values(), key=lambda entry: (-entry['points'], -entry['wins']))
+        standings = []
+        
+        for position, entry in enumerate(entries, start=1):
+            row = dict(entry, position=position)
+            row['points'] = int(row['points']) if float(row['points']).is_integer() else row['points']
+            standings.append(row)
+        
+        return standings
+    
+    def _synced_standings(self, season, table):
+        """Standings kept up to date by delta sync, or None when there's nothing local
+        
+        A failed sync leaves the standings of the last complete one, which
+        are served until a sync gets through. With none the caller falls
+        back to the standings endpoint.
+        """
+        if season != self.current_season:
+            return None
+        try:
+            if time.time() - self.synced_at.get(season, 0) >= self.SYNC_REUSE:
+                self.sync_season(season)
+        except (requests.RequestException, LookupError, TypeError, ValueError) as error:
+            self.metrics.error('sync_errors', f"{self.base_url}/{season}/sync", error)
+        state = self.season_state(season)
+        return self.standings_from_state(state, table) if state[table] else None
+    
+    def get_season_statistics(self, season=None):
+        """Season statistics accumulated by delta sync"""
+        season = season or self.current_season
+        state = self.season_state(season)
+        stats = state['stats']
+        
+        def leader(counts):
+            if not counts:
+                return None
+            driver_id = max(counts, key=counts.get)
+            return state['drivers'].get(driver_id, {}).get('name', driver_id), counts[driver_id]
+        
+        return {
+            'races': stats['races'],
+            'different_winners': len(stats['winners']),
+            'poles': sum(stats['poles'].values()),
+            'pole_leader': leader(stats['poles']),
+            'fastest_laps': sum(stats['fastest_laps'].values()),
+            'fastest_lap_leader': leader(stats['fastest_laps']),
+            'dnfs': stats['dnfs']
+        }
+    
+    def get_points_progression(self, season=None, table='drivers', limit=10):
+        """Cumulative points after each synced round for the top entries of a table
+        
+        Team totals add up their drivers' points under each driver's
+        latest team, so a mid-season driver swap is credited to the new
+        team.
+        """
+        season = season or self.current_season
+        state = self.season_state(season)
+        rounds = sorted(int(round_number) for round_number in state['rounds'])
+        
+        totals = {}
+        series = {}
+        for round_number in rounds:
+            for driver_id, points in state['rounds'][str(round_number)].items():
+                driver = state['drivers'].get(driver_id, {})
+                name = driver.get('name', driver_id) if table == 'drivers' else driver.get('team', driver_id)
+                totals[name] = totals.get(name, 0) + points
+            for name, total in totals.items():
+                series.setdefault(name, {})[round_number] = total
+        
+        leaders = sorted(totals, key=totals.get, reverse=True)[:limit]
+        return {
+            'rounds': rounds,
+            'series': [
+                {'name': name, 'points': [(round_number, series[name].get(round_number, 0)) for round_number in rounds]}
+                for name in leaders
+            ]
+        }
+    
+    def build_history_archive(self, first_season, last_season, path=None):
+        """Download past seasons from Ergast and write the bundled history archive"""
+        seasons = {}
+        for year in range(first_season, last_season + 1):
+            seasons[year] = self.fetch_season_history(year)
+        HistoricalArchive.build(path or self.history_path, seasons)
+    
+    def fetch_season_history(self, year):
+        """Fetch one complete season in the form HistoricalArchive.build expects"""
+        schedule = self._get_json(f"{self.base_url}/{year}.json")['MRData']['RaceTable']['Races']
+        
+        results_by_round = self._season_results(year, 'results', 'Results')
+        
+        races = []
+        podiums = {}
+        for race in schedule:
+            results = self.parse_result_rows(results_by_round.get(int(race['round']), []))
+            for result in results:
+                if result['position'] <= 3:
+                    podiums[result['name']] = podiums.get(result['name'], 0) + 1
+            
+            races.append({
+                'round': int(race['round']),
+                'name': race['raceName'],
+                'circuit': race['Circuit']['circuitName'],
+                'date': datetime.strptime(race['date'], '%Y-%m-%d').date(),
+                'sprint': 'Sprint' in race,
+                'results': results
+            })
+        
+        driver_standings = []
+        for standings_list in self._get_json(f"{self.base_url}/{year}/driverStandings.json")['MRData']['StandingsTable']['StandingsLists']:
+            for driver in standings_list['DriverStandings']:
+                name = f"{driver['Driver']['givenName']} {driver['Driver']['familyName']}"
+                driver_standings.append({
+                    'position': int(driver.get('position', 0)),
+                    'name': name,
+                    'team': driver['Constructors'][-1]['name'] if driver['Constructors'] else '',
+                    'points': float(driver['points']),
+                    'wins': int(driver['wins']),
+                    'podiums': podiums.get(name, 0)
+                })
+        
+        # The constructors' championship only exists from 1958
+        constructor_standings = []
+        for standings_list in self._get_json(f"{self.base_url}/{year}/constructorStandings.json")['MRData']['StandingsTable']['StandingsLists']:
+            for constructor in standings_list['ConstructorStandings']:
+                constructor_standings.append({
+                    'position': int(constructor.get('position', 0)),
+                    'name': constructor['Constructor']['name'],
+                    'points': float(constructor['points']),
+                    'wins': int(constructor['wins'])
+                })
+        
+        return {
+            'races': races,
+            'driver_standings': driver_standings,
+            'constructor_standings': constructor_standings
+        }
+    
+    # Snapshots
+    def season_data(self, season):
+        """A whole season in HistoricalArchive.build form, from the archive when it's there"""
+        if self.from_history(str(season)):
+            return self.history.season_data(season)
+        return self.fetch_season_history(int(season))
+    
+    def record_timing(self, session, timing_data, now=None):
+        """Keep a timestamped copy of a live timing frame so the session can be exported"""
+        timestamp = now or time.time()
+        self.timing_recordings.setdefault(session, []).extend(dict(row, t=timestamp) for row in timing_data)
+    
+    def export_snapshot(self, path, seasons=None):
+        """Write seasons, synced state and timing recordings to a snapshot file
+        
+        Defaults to every archived season plus the current one. Seasons are
+        produced one at a time, so only a season's rows are held in memory.
+        Returns the seasons written.
+        """
+        if seasons is None:
+            seasons = (self.history.seasons() if self.history else []) + [int(self.current_season)]
+        seasons = sorted(set(int(season) for season in seasons))
+        
+        def chunks():
+            for year in seasons:
+                state = self.season_state(str(year)) if not self.from_history(str(year)) else None
+                if state and state['last_round']:
+                    yield DataSnapshot.STATE, year, json.dumps(state).encode('utf-8')
+                yield from DataSnapshot.season_chunks(year, self.season_data(year))
+            
+            rows = [dict(row, session=session) for session, frames in self.timing_recordings.items() for row in frames]
+            yield from DataSnapshot.table_chunks(DataSnapshot.TIMING, 0, DataSnapshot.TIMING_COLUMNS, rows)
+        
+        DataSnapshot.write(path, chunks())
+        return seasons
+    
+    def import_snapshot(self, path, archive_path=None):
+        """Restore a snapshot written by export_snapshot
+        
+        Synced state replaces the local state of its season, past seasons
+        are merged into the history archive, which is rewritten once at the
+        end, and timing recordings are added to the ones in memory.
+        Returns the seasons restored.
+        """
+        seasons = {}
+        restored = set()
+        
+        for tag, year, payload in DataSnapshot.read(path):
+            if tag == DataSnapshot.STATE:
+                season = str(year)
+                with self.sync_lock:
+                    self.season_states[season] = json.loads(payload.decode('utf-8'))
+                    self._save_season_state(season)
+                restored.add(year)
+            elif tag == DataSnapshot.TIMING:
+                for row in DataSnapshot.decode_table(payload):
+                    self.timing_recordings.setdefault(row.pop('session'), []).append(row)
+            else:
+                DataSnapshot.add_rows(seasons.setdefault(year, {'races': [], 'driver_standings': [], 'constructor_standings': []}), tag, payload)
+                restored.add(year)
+        
+        seasons.pop(int(self.current_season), None)
+        if seasons:
+            archived = {year: self.history.season_data(year) for year in self.history.seasons()} if self.history else {}
+            archived.update(seasons)
+            archive_path = archive_path or self.history_path
+            HistoricalArchive.build(archive_path, archived)
+            self.history = HistoricalArchive.open(archive_path)
+        
+        self.standings_version += 1
+        self._publish_standings(self.current_season)
+        return sorted(restored)
+    
+    def _season_results(self, season, endpoint, key):
+        """Round -> raw result rows of a season-wide Ergast endpoint such as results or qualifying"""
+        # Results are paged by row, so a race can straddle two pages
+        results_by_round = {}
+        offset = 0
+        while True:
+            data = self._get_json(f"{self.base_url}/{season}/{endpoint}.json", params={'limit': 1000, 'offset': offset})
+            for race in data['MRData']['RaceTable']['Races']:
+                results_by_round.setdefault(int(race['round']), []).extend(race[key])
+            offset += 1000
+            if offset >= int(data['MRData']['total']):
+                break
+        return results_by_round
+    
+    # Weekend results
+    def prefetch_weekends(self, season=None):
+        """Store every finished session of a season in session_results in one batch
+        
+        Race, sprint and qualifying results come from three season-wide
+        requests made side by side, rather than three per round, so the
+        weekend detail of any round is then answered locally. Returns the
+        rounds that have results.
+        """
+        season = str(season or self.current_season)
+        
+        upstream = self._upstream('/weekends', season=season)
+        if upstream is not None:
+            for round_number, weekend in upstream.items():
+                for session, record in weekend.items():
+                    self.session_results.store(season, int(round_number), session, record)
+            self.store.put(f"weekends/{season}", self.session_results.season(season))
+            return sorted(int(round_number) for round_number in upstream)
+        
+        endpoints = (
+            (SessionResults.RACE, 'results', 'Results'),
+            (SessionResults.SPRINT, 'sprint', 'SprintResults'),
+            (SessionResults.QUALIFYING, 'qualifying', 'QualifyingResults')
+        )
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+            pages = list(pool.map(lambda endpoint: self._season_results(season, endpoint[1], endpoint[2]), endpoints))
+        
+        rounds = set()
+        for (session, _, _), results_by_round in zip(endpoints, pages):
+            for round_number, results in results_by_round.items():
+                rows = self.parse_qualifying_rows(results) if session == SessionResults.QUALIFYING else self.parse_result_rows(results)
+                self.session_results.add(season, round_number, session, rows)
+                rounds.add(round_number)
+        
+        self.store.put(f"weekends/{season}", self.session_results.season(season))
+        return sorted(rounds)
+    
+    def get_weekend(self, season, round_number):
+        """Results of each session of a weekend, prefetching the season's weekends on a miss"""
+        weekend = self.session_results.weekend(season, round_number)
+        if not weekend:
+            self.prefetch_weekends(season)
+            weekend = self.session_results.weekend(season, round_number)
+        return weekend
+    
+    def fetch(self, url, params=None, timeout=10):
+        """GET a URL through the data budget
+        
+        Every response is metered per endpoint. Responses that came with
+        an ETag or Last-Modified are revalidated with a conditional
+        request, and under Data Saver a recent response is reused without
+        asking at all. While offline mode is on, or the network can't be
+        reached, the last response is reused however old it is, and the
+        request fails only when there isn't one.
+        """
+        key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        endpoint = DataBudget.endpoint(url)
+        with self.http_lock:
+            cached = self.http_cache.get(key)
+            if cached is not None:
+                self.http_cache.move_to_end(key)
+        
+        if cached is not None and (self.offline or self.data_saver and time.time() - cached['fetched'] < self.DATA_SAVER_MAX_AGE):
+            self.budget.record(url, 0, saved=len(cached['content']), network=False)
+            self.metrics.count('cache_hits', endpoint)
+            return self._cached_response(url, cached)
+        self.metrics.count('cache_misses', endpoint)
+        if self.offline:
+            raise requests.ConnectionError('Offline mode is on')
+        
+        # The feed's rate limit; other hosts such as news and images aren't counted against it.
+        # With a cached copy to fall back on there's never a wait, screens get it straight away
+        if url.startswith(self.base_url) and not self.request_budget.acquire(self.budget_wait if cached is None else 0):
+            self.metrics.error('throttled', url, 'request budget used up')
+            if cached is None:
+                raise requests.ConnectionError(f"Request budget for {self.provider.name} used up")
+            self.budget.record(url, 0, saved=len(cached['content']), network=False)
+            return self._cached_response(url, cached)
+        
+        headers = {}
+        if cached is not None and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached is not None and cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+        
+        started = time.perf_counter()
+        try:
+            response = requests.get(url, params=params, timeout=timeout, headers=headers)
+        except (requests.ConnectionError, requests.Timeout) as error:
+            self.metrics.error('request_errors', url, error)
+            if cached is None:
+                raise
+            self.budget.record(url, 0, saved=len(cached['content']), network=False)
+            self.metrics.count('stale_hits', endpoint)
+            return self._cached_response(url, cached)
+        self.metrics.observe(endpoint, time.perf_counter() - started)
+        self.metrics.count('bytes_received', endpoint, DataBudget.response_size(response))
+        
+        if response.status_code == 304 and cached is not None:
+            cached['fetched'] = time.time()
+            self.budget.record(url, DataBudget.response_size(response), saved=len(cached['content']))
+            self.metrics.count('revalidated', endpoint)
+            self.metrics.fresh(endpoint)
+            return self._cached_response(url, cached)
+        
+        self.budget.record(url, DataBudget.response_size(response))
+        if response.status_code == 200:
+            self.metrics.fresh(endpoint)
+        else:
+            self.metrics.error('http_errors', url, f"HTTP {response.status_code}")
+        
+        # Keep small data responses for conditional refreshes and offline use; images are cached as textures
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if (response.status_code == 200
+                and not response.headers.get('Content-Type', '').startswith('image/')
+                and len(response.content) <= self.HTTP_CACHE_ENTRY_LIMIT):
+            with self.http_lock:
+                self.http_cache[key] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'content': response.content,
+                    'encoding': response.encoding,
+                    'fetched': time.time()
+                }
+                self.http_cache.move_to_end(key)
+                while len(self.http_cache) > self.HTTP_CACHE_ENTRIES:
+                    self.http_cache.popitem(last=False)
+                self.http_cache_changed = True
+        
+        return response
+    
+    def load_http_cache(self):
+        """Restore the responses saved by the last run"""
+        if not self.http_cache_path or not os.path.exists(self.http_cache_path):
+            return
+        try:
+            with open(self.http_cache_path, encoding='utf-8') as handle:
+                entries = json.load(handle)
+            for key, entry in entries.items():
+                entry['content'] = zlib.decompress(base64.b64decode(entry['content']))
+                self.http_cache[key] = entry
+        except (OSError, ValueError, KeyError, zlib.error):
+            self.http_cache.clear()  # A damaged cache only costs a refetch
+    
+    def save_http_cache(self):
+        """Write the cached responses to disk, when any changed since the last save"""
+        if not self.http_cache_path or not self.http_cache_changed:
+            return
+        with self.http_lock:
+            entries = OrderedDict()
+            for key, entry in self.http_cache.items():
+                entries[key] = dict(entry, content=base64.b64encode(zlib.compress(entry['content'])).decode('ascii'))
+            self.http_cache_changed = False
+            
+            os.makedirs(self.data_dir, exist_ok=True)
+            with open(self.http_cache_path + '.tmp', 'w', encoding='utf-8') as handle:
+                json.dump(entries, handle, separators=(',', ':'))
+            os.replace(self.http_cache_path + '.tmp', self.http_cache_path)
+    
+    def _cached_response(self, url, cached):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = cached['encoding']
+        response._content = cached['content']
+        return response
+    
+    def _get_json(self, url, params=None):
+        response = self.fetch(url, params=params, timeout=30)
+        response.raise_for_status()
+        try:
+            return response.json()
+        except ValueError as error:
+            self.metrics.error('parse_errors', url, error)
+            raise
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+class DataMetrics:
+    """Counters, latency histograms and a ring buffer of recent events for the data layer
+    
+    Counters are kept per endpoint, named the way DataBudget names them.
+    Each network round trip lands in one of LATENCY_BUCKETS, and the time
+    of every good response is kept as a measure of how fresh the data is.
+    Errors and mock fallbacks are also logged as small dicts in a deque of
+    EVENTS entries, so recording costs a few dict updates and memory stays
+    flat however long the app runs. snapshot() is what dump() writes and
+    what the data server returns at /metrics.
+    """
+    
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Upper bounds in seconds, slower goes in a last bucket
+    EVENTS = 500
+    
+    def __init__(self):
+        self.counters = {}      # name -> endpoint -> count
+        self.latency = {}       # endpoint -> [count per bucket, overflow], total seconds
+        self.last_success = {}  # endpoint -> time of the last good response
+        self.events = deque(maxlen=self.EVENTS)
+        self.started = time.time()
+        self._lock = threading.Lock()
+    
+    def count(self, name, endpoint, amount=1):
+        with self._lock:
+            counts = self.counters.setdefault(name, {})
+            counts[endpoint] = counts.get(endpoint, 0) + amount
+    
+    def observe(self, endpoint, seconds):
+        """Add one request's latency to the endpoint's histogram"""
+        with self._lock:
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = [[0] * (len(self.LATENCY_BUCKETS) + 1), 0.0]
+            histogram[0][bisect.bisect_left(self.LATENCY_BUCKETS, seconds)] += 1
+            histogram[1] += seconds
+    
+    def fresh(self, endpoint):
+        self.last_success[endpoint] = time.time()
+    
+    def event(self, kind, **fields):
+        """Log one structured event to the ring buffer"""
+        fields['event'] = kind
+        fields['time'] = time.time()
+        self.events.append(fields)
+    
+    def error(self, name, url, error):
+        """Count a failure against its endpoint and log what it was"""
+        endpoint = DataBudget.endpoint(url)
+        self.count(name, endpoint)
+        self.event(name, endpoint=endpoint, url=url, error=f"{type(error).__name__}: {error}" if isinstance(error, Exception) else error)
+    
+    def fallback(self, url, error):
+        """Mock or empty data was served in place of a failed request"""
+        if isinstance(error, (LookupError, TypeError, ValueError)):
+            self.error('parse_errors', url, error)
+        self.error('fallbacks', url, error)
+    
+    def total(self, name):
+        """A counter summed over every endpoint"""
+        with self._lock:
+            return sum(self.counters.get(name, {}).values())
+    
+    def snapshot(self, now=None):
+        """Everything recorded so far as plain JSON-ready data"""
+        now = now or time.time()
+        with self._lock:
+            counters = {name: dict(counts) for name, counts in self.counters.items()}
+            latency = {
+                endpoint: {'buckets': list(zip(self.LATENCY_BUCKETS + (None,), buckets)), 'count': sum(buckets), 'total': round(total, 4)}
+                for endpoint, (buckets, total) in self.latency.items()
+            }
+        return {
+            'uptime': round(now - self.started, 1),
+            'counters': counters,
+            'latency': latency,
+            'age': {endpoint: round(now - fetched, 1) for endpoint, fetched in self.last_success.items()},
+            'events': list(self.events)
+        }
+    
+    def dump(self, path):
+        """Write a snapshot to path, replacing the previous dump"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as handle:
+            json.dump(self.snapshot(), handle)
+        os.replace(path + '.tmp', path)
+
+class DataBudget:
+    """Bytes downloaded per endpoint per day
+    
+    Each endpoint keeps [requests, bytes, cache hits, bytes saved], where
+    a cache hit is a 304 or a response reused under Data Saver. The last
+    KEEP_DAYS days are kept in data_usage.json for the usage screen.
+    """
+    
+    KEEP_DAYS = 30
+    SAVE_INTERVAL = 30
+    IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.days = {}  # ISO date -> endpoint -> counters
+        self._lock = threading.Lock()
+        self._saved_at = time.time()
+        self._dirty = False
+        self.load()
+    
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                self.days = json.load(handle)
+        except (OSError, ValueError):
+            self.days = {}
+    
+    @classmethod
+    def endpoint(cls, url):
+        """Group URLs by host and path shape, so every round and season counts as one endpoint"""
+        parsed = urlparse(url)
+        if parsed.path.lower().endswith(cls.IMAGE_EXTENSIONS):
+            return f"{parsed.netloc} images"
+        return parsed.netloc + re.sub(r'/\d+(?=[/.]|$)', '/*', parsed.path)
+    
+    @staticmethod
+    def response_size(response):
+        """Bytes on the wire - the compressed length when the server sent one"""
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit():
+            return int(length)
+        return len(response.content)
+    
+    def record(self, url, size, saved=0, network=True):
+        """Count one request of size bytes, and the bytes a cache hit saved"""
+        with self._lock:
+            counters = self.days.setdefault(date.today().isoformat(), {}).setdefault(self.endpoint(url), [0, 0, 0, 0])
+            if network:
+                counters[0] += 1
+                counters[1] += size
+            if saved:
+                counters[2] += 1
+                counters[3] += saved
+            self._dirty = True
+        
+        if time.time() - self._saved_at > self.SAVE_INTERVAL:
+            self.save()
+    
+    def report(self, days=7):
+        """Totals for today and the last days, plus per-endpoint rows by bytes used"""
+        today = date.today()
+        period = {(today - timedelta(days=offset)).isoformat() for offset in range(days)}
+        endpoints = {}
+        totals = {'today': 0, 'period': 0, 'saved': 0, 'requests': 0}
+        
+        with self._lock:
+            for day, usage in self.days.items():
+                if day not in period:
+                    continue
+                for endpoint, counters in usage.items():
+                    row = endpoints.setdefault(endpoint, [0, 0, 0, 0])
+                    for index, value in enumerate(counters):
+                        row[index] += value
+                    totals['period'] += counters[1]
+                    totals['saved'] += counters[3]
+                    totals['requests'] += counters[0]
+                    if day == today.isoformat():
+                        totals['today'] += counters[1]
+        
+        totals['endpoints'] = [
+            {'endpoint': endpoint, 'requests': row[0], 'bytes': row[1], 'hits': row[2], 'saved': row[3]}
+            for endpoint, row in sorted(endpoints.items(), key=lambda item: -item[1][1])
+        ]
+        return totals
+    
+    def save(self):
+        """Write usage to disk, dropping days older than KEEP_DAYS"""
+        cutoff = (date.today() - timedelta(days=self.KEEP_DAYS)).isoformat()
+        with self._lock:
+            for day in [day for day in self.days if day < cutoff]:
+                del self.days[day]
+            dirty, self._dirty = self._dirty, False
+            self._saved_at = time.time()
+            data = json.dumps(self.days)
+        
+        if not dirty or not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as handle:
+            handle.write(data)
+        os.replace(self.path + '.tmp', self.path)
+
+class HistoricalArchive:
+    """Read-only, memory-mapped snapshot of past seasons
+    
+    The file is a header followed by fixed-width record tables and a
+    string table. Seasons are sorted by year, each season's races are
+    contiguous and ordered by round, and each race's results and each
+    season's final standings are contiguous, so every lookup is a binary
+    search or an offset calculation straight into the mapping - nothing
+    is parsed up front and only the pages touched become resident.
+    """
+    
+    MAGIC = b'F1HA'
+    VERSION = 1
+    
+    # magic, version, then (count, offset) for seasons, races, results, standings, and strings offset
+    HEADER = struct.Struct('<4sHxxIIIIIIIII')
+    SEASON = struct.Struct('<HHIIII')     # year, race count, first race, first standing, standing count, reserved
+    RACE = struct.Struct('<HBBIIIIH')     # year, round, flags, date ordinal, name, circuit, first result, result count
+    RESULT = struct.Struct('<BBBHIII')    # position, grid, laps, points x10, driver, constructor, status
+    STANDING = struct.Struct('<BBHHIII')  # kind, position, wins, podiums, points x10, name, team
+    STRING_LENGTH = struct.Struct('<H')
+    
+    FLAG_SPRINT = 1
+    DRIVER, CONSTRUCTOR = 0, 1
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        fields = self.HEADER.unpack_from(self._map, 0)
+        if fields[0] != self.MAGIC or fields[1] != self.VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {self.VERSION} history archive")
+        
+        (self.season_count, self._season_offset,
+         self.race_count, self._race_offset,
+         self.result_count, self._result_offset,
+         self.standing_count, self._standing_offset,
+         self._strings_offset) = fields[2:]
+    
+    @classmethod
+    def open(cls, path):
+        """Open the archive at path, or return None when it isn't bundled"""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error):
+            return None
+    
+    def close(self):
+        self._map.close()
+    
+    # Record access
+    def _record(self, layout, table_offset, index):
+        return layout.unpack_from(self._map, table_offset + index * layout.size)
+    
+    def _string(self, offset):
+        position = self._strings_offset + offset
+        (length,) = self.STRING_LENGTH.unpack_from(self._map, position)
+        start = position + self.STRING_LENGTH.size
+        return self._map[start:start + length].decode('utf-8')
+    
+    @staticmethod
+    def _points(tenths):
+        return tenths // 10 if tenths % 10 == 0 else tenths / 10
+    
+    def _season(self, year):
+        """Binary search the season table for year"""
+        low, high = 0, self.season_count
+        while low < high:
+            middle = (low + high) // 2
+            record = self._record(self.SEASON, self._season_offset, middle)
+            if record[0] < year:
+                low = middle + 1
+            elif record[0] > year:
+                high = middle
+            else:
+                return record
+        return None
+    
+    def _race(self, year, round_number):
+        season = self._season(year)
+        if season is None or not 1 <= round_number <= season[1]:
+            return None
+        # Rounds are stored contiguously, so the record index is a plain offset
+        return self._record(self.RACE, self._race_offset, season[2] + round_number - 1)
+    
+    # Queries
+    def seasons(self):
+        return [self._record(self.SEASON, self._season_offset, i)[0] for i in range(self.season_count)]
+    
+    def has_season(self, year):
+        return self._season(int(year)) is not None
+    
+    def get_race_schedule(self, year):
+        """Schedule for a past season, in the same shape as F1DataManager.parse_race_schedule"""
+        season = self._season(int(year))
+        if season is None:
+            return []
+        
+        schedule = []
+        for index in range(season[2], season[2] + season[1]):
+            _, round_number, flags, ordinal, name, circuit, first_result, result_count = self._record(self.RACE, self._race_offset, index)
+            race = {
+                'round': round_number,
+                'name': self._string(name),
+                'circuit': self._string(circuit),
+                'date': date.fromordinal(ordinal).strftime('%b %d, %Y'),
+                'status': 'completed',
+                'sprint': bool(flags & self.FLAG_SPRINT)
+            }
+            if result_count:
+                race['winner'] = self._string(self._record(self.RESULT, self._result_offset, first_result)[4])
+            schedule.append(race)
+        
+        return schedule
+    
+    def get_race_results(self, year, round_number):
+        """Classified results of one race"""
+        race = self._race(int(year), int(round_number))
+        if race is None:
+            return []
+        
+        results = []
+        for index in range(race[6], race[6] + race[7]):
+            position, grid, laps, points, driver, constructor, status = self._record(self.RESULT, self._result_offset, index)
+            results.append({
+                'position': position or None,
+                'name': self._string(driver),
+                'team': self._string(constructor),
+                'grid': grid,
+                'laps': laps,
+                'points': self._points(points),
+                'status': self._string(status)
+            })
+        
+        return results
+    
+    def _standings(self, year, kind):
+        season = self._season(int(year))
+        if season is None:
+            return []
+        
+        standings = []
+        for index in range(season[3], season[3] + season[4]):
+            record_kind, position, wins, podiums, points, name, team = self._record(self.STANDING, self._standing_offset, index)
+            if record_kind != kind:
+                continue
+            entry = {'position': position, 'name': self._string(name), 'points': self._points(points), 'wins': wins}
+            if kind == self.DRIVER:
+                entry['team'] = self._string(team)
+                entry['podiums'] = podiums
+            standings.append(entry)
+        
+        return standings
+    
+    def get_driver_standings(self, year):
+        return self._standings(year, self.DRIVER)
+    
+    def get_constructor_standings(self, year):
+        return self._standings(year, self.CONSTRUCTOR)
+    
+    def season_data(self, year):
+        """One season in the form build expects, for rewriting an archive"""
+        races = []
+        for race in self.get_race_schedule(year):
+            races.append({
+                'round': race['round'],
+                'name': race['name'],
+                'circuit': race['circuit'],
+                'date': datetime.strptime(race['date'], '%b %d, %Y').date(),
+                'sprint': race['sprint'],
+                'results': self.get_race_results(year, race['round'])
+            })
+        
+        return {
+            'races': races,
+            'driver_standings': self.get_driver_standings(year),
+            'constructor_standings': self.get_constructor_standings(year)
+        }
+    
+    @classmethod
+    def build(cls, path, seasons):
+        """Write an archive from parsed season data
+        
+        seasons maps year -> {'races': [race dicts with 'date' as a date
+        and a 'results' list], 'driver_standings': [...],
+        'constructor_standings': [...]}, using the same keys as the
+        query methods return.
+        """
+        strings = bytearray()
+        string_offsets = {}
+        
+        def intern(text):
+            text = text or ''
+            if text not in string_offsets:
+                encoded = text.encode('utf-8')
+                string_offsets[text] = len(strings)
+                strings.extend(cls.STRING_LENGTH.pack(len(encoded)))
+                strings.extend(encoded)
+            return string_offsets[text]
+        
+        season_table, race_table, result_table, standing_table = bytearray(), bytearray(), bytearray(), bytearray()
+        race_total = result_total = standing_total = 0
+        
+        for year in sorted(seasons):
+            season = seasons[year]
+            races = sorted(season['races'], key=lambda race: race['round'])
+            standings = (
+                [(cls.DRIVER, entry) for entry in season.get('driver_standings', [])] +
+                [(cls.CONSTRUCTOR, entry) for entry in season.get('constructor_standings', [])]
+            )
+            season_table.extend(cls.SEASON.pack(year, len(races), race_total, standing_total, len(standings), 0))
+            
+            for race in races:
+                race_table.extend(cls.RACE.pack(
+                    year, race['round'], cls.FLAG_SPRINT if race.get('sprint') else 0,
+                    race['date'].toordinal(), intern(race['name']), intern(race['circuit']),
+                    result_total, len(race['results'])
+                ))
+                for result in race['results']:
+                    result_table.extend(cls.RESULT.pack(
+                        result['position'] or 0, result['grid'], result['laps'],
+                        int(round(result['points'] * 10)), intern(result['name']),
+                        intern(result['team']), intern(result['status'])
+                    ))
+                result_total += len(race['results'])
+            race_total += len(races)
+            
+            for kind, entry in standings:
+                standing_table.extend(cls.STANDING.pack(
+                    kind, entry['position'], entry['wins'], entry.get('podiums', 0),
+                    int(round(entry['points'] * 10)), intern(entry['name']), intern(entry.get('team'))
+                ))
+            standing_total += len(standings)
+        
+        season_offset = cls.HEADER.size
+        race_offset = season_offset + len(season_table)
+        result_offset = race_offset + len(race_table)
+        standing_offset = result_offset + len(result_table)
+        strings_offset = standing_offset + len(standing_table)
+        
+        header = cls.HEADER.pack(
+            cls.MAGIC, cls.VERSION,
+            len(seasons), season_offset,
+            race_total, race_offset,
+            result_total, result_offset,
+            standing_total, standing_offset,
+            strings_offset
+        )
+        
+        # Write next to the target and swap in, so a reader never maps a half-written file
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as handle:
+            for block in (header, season_table, race_table, result_table, standing_table, strings):
+                handle.write(block)
+        os.replace(temp_path, path)
+
+class CircuitGeometry:
+    """Bundled track outlines, one simplified closed polyline per circuit
+    
+    The file is a header, an index of circuits and one block of uint16
+    x/y pairs, scaled so each track's longer side spans 0-65535. An
+    outline is decoded on first use and cached with its cumulative lap
+    distance, so a position along the lap maps to a point with a bisect.
+    """
+    
+    MAGIC = b'F1CG'
+    VERSION = 1
+    
+    HEADER = struct.Struct('<4sHHII')  # magic, version, circuit count, points offset, strings offset
+    ENTRY = struct.Struct('<III')      # circuit id, first point, point count
+    POINT = struct.Struct('<HH')
+    STRING_LENGTH = struct.Struct('<H')
+    SCALE = 65535
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._data = handle.read()
+        
+        magic, version, count, self._points_offset, self._strings_offset = self.HEADER.unpack_from(self._data, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{path} is not a version {self.VERSION} circuit geometry file")
+        
+        self._index = {}
+        for index in range(count):
+            name, first, points = self.ENTRY.unpack_from(self._data, self.HEADER.size + index * self.ENTRY.size)
+            self._index[self._string(name)] = (first, points)
+        self._tracks = {}
+    
+    @classmethod
+    def open(cls, path):
+        """Load the geometry file at path, or return None when it isn't bundled"""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error):
+            return None
+    
+    def _string(self, offset):
+        position = self._strings_offset + offset
+        (length,) = self.STRING_LENGTH.unpack_from(self._data, position)
+        start = position + self.STRING_LENGTH.size
+        return self._data[start:start + length].decode('utf-8')
+    
+    def circuits(self):
+        return sorted(self._index)
+    
+    def track(self, circuit_id):
+        """Outline of a circuit in unit coordinates with its lap distances, None when not bundled"""
+        if circuit_id in self._tracks:
+            return self._tracks[circuit_id]
+        if circuit_id not in self._index:
+            return None
+        
+        first, count = self._index[circuit_id]
+        flat = struct.unpack_from(f'<{count * 2}H', self._data, self._points_offset + first * self.POINT.size)
+        points = [(flat[index] / self.SCALE, flat[index + 1] / self.SCALE) for index in range(0, len(flat), 2)]
+        
+        # Distance travelled at each point, closing the loop back to the start
+        distances = [0.0]
+        for start, end in zip(points, points[1:] + points[:1]):
+            distances.append(distances[-1] + math.hypot(end[0] - start[0], end[1] - start[1]))
+        
+        track = {
+            'points': points,
+            'distances': distances,
+            'length': distances[-1],
+            'width': max(point[0] for point in points),
+            'height': max(point[1] for point in points)
+        }
+        self._tracks[circuit_id] = track
+        return track
+    
+    @staticmethod
+    def position(track, fraction):
+        """Point at a fraction (0-1) of the way round a track"""
+        points, distances = track['points'], track['distances']
+        target = (fraction % 1) * track['length']
+        index = min(bisect.bisect_right(distances, target) - 1, len(points) - 1)
+        
+        start = points[index]
+        end = points[(index + 1) % len(points)]
+        step = (target - distances[index]) / ((distances[index + 1] - distances[index]) or 1)
+        return start[0] + (end[0] - start[0]) * step, start[1] + (end[1] - start[1]) * step
+    
+    @staticmethod
+    def simplify(points, tolerance):
+        """Douglas-Peucker: drop points closer than tolerance to the line through their neighbours"""
+        if len(points) < 3:
+            return list(points)
+        
+        keep = [False] * len(points)
+        keep[0] = keep[-1] = True
+        stack = [(0, len(points) - 1)]
+        
+        while stack:
+            first, last = stack.pop()
+            (x1, y1), (x2, y2) = points[first], points[last]
+            length = math.hypot(x2 - x1, y2 - y1)
+            farthest, distance = None, tolerance
+            
+            for index in range(first + 1, last):
+                x, y = points[index]
+                if length:
+                    offset = abs((x2 - x1) * (y1 - y) - (x1 - x) * (y2 - y1)) / length
+                else:
+                    offset = math.hypot(x - x1, y - y1)
+                if offset > distance:
+                    farthest, distance = index, offset
+            
+            if farthest is not None:
+                keep[farthest] = True
+                stack.append((first, farthest))
+                stack.append((farthest, last))
+        
+        return [point for point, kept in zip(points, keep) if kept]
+    
+    @staticmethod
+    def load_geojson(path, key='id'):
+        """Read {properties[key]: [(longitude, latitude), ...]} from a GeoJSON FeatureCollection of track lines"""
+        with open(path, encoding='utf-8') as handle:
+            collection = json.load(handle)
+        
+        circuits = {}
+        for feature in collection['features']:
+            geometry = feature['geometry']
+            coordinates = geometry['coordinates']
+            if geometry['type'] == 'MultiLineString':
+                coordinates = max(coordinates, key=len)
+            circuits[feature['properties'][key]] = [tuple(point[:2]) for point in coordinates]
+        return circuits
+    
+    @classmethod
+    def build(cls, path, circuits, tolerance=0.002):
+        """Write a geometry file
+        
+        circuits maps Ergast circuitId -> [(longitude, latitude), ...].
+        Outlines are projected, simplified to tolerance (a fraction of
+        the track's size) and quantised.
+        """
+        strings = bytearray()
+        index_table, point_table = bytearray(), bytearray()
+        total = 0
+        
+        for circuit_id in sorted(circuits):
+            outline = list(circuits[circuit_id])
+            if len(outline) > 1 and outline[0] == outline[-1]:
+                outline.pop()
+            
+            # Equirectangular projection is plenty for a few kilometres of track
+            mean_latitude = math.radians(sum(point[1] for point in outline) / len(outline))
+            projected = [(longitude * math.cos(mean_latitude), latitude) for longitude, latitude in outline]
+            min_x = min(point[0] for point in projected)
+            min_y = min(point[1] for point in projected)
+            extent = max(max(point[0] for point in projected) - min_x, max(point[1] for point in projected) - min_y) or 1
+            
+            unit = [((x - min_x) / extent, (y - min_y) / extent) for x, y in projected]
+            simplified = cls.simplify(unit + unit[:1], tolerance)[:-1]
+            
+            encoded = circuit_id.encode('utf-8')
+            index_table.extend(cls.ENTRY.pack(len(strings), total, len(simplified)))
+            strings.extend(cls.STRING_LENGTH.pack(len(encoded)))
+            strings.extend(encoded)
+            for x, y in simplified:
+                point_table.extend(cls.POINT.pack(round(x * cls.SCALE), round(y * cls.SCALE)))
+            total += len(simplified)
+        
+        points_offset = cls.HEADER.size + len(index_table)
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(circuits), points_offset, points_offset + len(point_table))
+        
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as handle:
+            for block in (header, index_table, point_table, strings):
+                handle.write(block)
+        os.replace(temp_path, path)
+
+QUALIFYING_CUTOFFS = (('Q1', 15), ('Q2', 10))  # Cars that go through from each knockout part
+
+class SessionResults:
+    """Classified results of every session of a weekend, keyed by (season, round, session)
+    
+    Race and sprint rows share one shape. Qualifying rows also carry each
+    part's time, the gap to the fastest time of the last part the driver
+    set a time in and which part that was, and the part the driver was
+    knocked out in. A qualifying record also carries the Q1 and Q2 cutoff
+    lines. All of it is worked out once when the session is stored rather
+    than on display.
+    """
+    
+    QUALIFYING, SPRINT, RACE = 'Qualifying', 'Sprint', 'Race'
+    SESSIONS = (QUALIFYING, SPRINT, RACE)
+    
+    def __init__(self):
+        self.sessions = {}
+        self.lock = threading.Lock()
+    
+    def add(self, season, round_number, session, rows):
+        """Store a session's parsed rows, sorted by position, with derived figures"""
+        rows = sorted(rows, key=lambda row: row['position'])
+        record = {'session': session, 'rows': rows}
+        if session == self.QUALIFYING:
+            record['cutoffs'] = self._qualifying_gaps(rows)
+        self.store(season, round_number, session, record)
+        return record
+    
+    def store(self, season, round_number, session, record):
+        """Store a record as built by add, such as one served by another node"""
+        with self.lock:
+            self.sessions[str(season), int(round_number), session] = record
+    
+    def get(self, season, round_number, session):
+        return self.sessions.get((str(season), int(round_number), session))
+    
+    def weekend(self, season, round_number):
+        """Session name -> record for the sessions of a weekend that have results"""
+        weekend = {}
+        for session in self.SESSIONS:
+            record = self.get(season, round_number, session)
+            if record is not None:
+                weekend[session] = record
+        return weekend
+    
+    def season(self, season):
+        """Round -> weekend for every round of a season that has results"""
+        with self.lock:
+            rounds = sorted({round_number for stored_season, round_number, _ in self.sessions if stored_season == str(season)})
+        return {round_number: self.weekend(season, round_number) for round_number in rounds}
+    
+    @staticmethod
+    def _qualifying_gaps(rows):
+        """Fill in best times, gaps within each driver's last part and knockouts, and return the cutoff lines"""
+        parts = ('q1', 'q2', 'q3')
+        fastest = dict.fromkeys(parts)
+        for row in rows:
+            times = {part: parse_lap_time(row[part]) for part in parts if row[part]}
+            row['best'] = min((seconds for seconds in times.values() if seconds is not None), default=None)
+            for part, seconds in times.items():
+                if seconds is not None and (fastest[part] is None or seconds < fastest[part]):
+                    fastest[part] = seconds
+        
+        # The track changes between parts, so a time is only compared with the others set in the same part
+        knockout = any(row['q2'] for row in rows)  # Single-session formats have no Q2
+        for row in rows:
+            row['gap'] = row['gap_part'] = None
+            for part in reversed(parts):
+                seconds = parse_lap_time(row[part]) if row[part] else None
+                if seconds is not None:
+                    row['gap'] = max(seconds - fastest[part], 0.0)
+                    row['gap_part'] = part.upper()
+                    break
+            row['knocked_out'] = None
+            if knockout:
+                row['knocked_out'] = 'Q1' if not row['q2'] else 'Q2' if not row['q3'] else None
+        
+        # The slowest time that still went through, and how far the next car missed it by
+        cutoffs = {}
+        for part, through in QUALIFYING_CUTOFFS:
+            timed = sorted(
+                (parse_lap_time(row[part.lower()]), row['code'] or row['name'])
+                for row in rows if row[part.lower()] and parse_lap_time(row[part.lower()]) is not None
+            )
+            if knockout and len(timed) > through:
+                cutoffs[part] = {
+                    'position': through,
+                    'driver': timed[through - 1][1],
+                    'time': format_lap_time(timed[through - 1][0]),
+                    'margin': timed[through][0] - timed[through - 1][0]
+                }
+        return cutoffs
+
+class DataSnapshot:
+    """Chunked, compressed columnar export of the data layer
+    
+    A snapshot is a short header followed by a stream of chunks, each
+    holding at most CHUNK_ROWS rows of one table for one season. Rows are
+    stored column by column - integers and floats as packed arrays, text
+    as a dictionary of distinct values plus an index array - and each
+    chunk is zlib-compressed on its own, so both ends work a chunk at a
+    time and nothing goes through the JSON parsers except synced state.
+    """
+    
+    MAGIC = b'F1SN'
+    VERSION = 1
+    
+    HEADER = struct.Struct('<4sHxx')   # magic, version
+    CHUNK = struct.Struct('<4sHII')    # tag, season, raw length, compressed length
+    COUNT = struct.Struct('<I')
+    NAME_LENGTH = struct.Struct('<B')
+    CHUNK_ROWS = 4096
+    COMPRESSION = 6
+    
+    # Chunk tags
+    STATE, RACES, RESULTS, STANDINGS, TIMING, END = b'STAT', b'RACE', b'RSLT', b'STND', b'TIME', b'END '
+    
+    RACE_COLUMNS = ('round', 'name', 'circuit', 'date', 'sprint')
+    RESULT_COLUMNS = ('round', 'position', 'grid', 'laps', 'points', 'name', 'team', 'status')
+    STANDING_COLUMNS = ('kind', 'position', 'name', 'team', 'points', 'wins', 'podiums')
+    TIMING_COLUMNS = ('session', 't', 'pos', 'driver', 'gap', 'last_lap', 'best_lap')
+    
+    @classmethod
+    def write(cls, path, chunks):
+        """Stream (tag, season, payload) chunks to path"""
+        # Write next to the target and swap in, so an interrupted export never replaces a good one
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as handle:
+            handle.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION))
+            for tag, season, payload in chunks:
+                compressed = zlib.compress(payload, cls.COMPRESSION)
+                handle.write(cls.CHUNK.pack(tag, season, len(payload), len(compressed)))
+                handle.write(compressed)
+            handle.write(cls.CHUNK.pack(cls.END, 0, 0, 0))
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def read(cls, path):
+        """Yield (tag, season, payload) for each chunk of the snapshot at path"""
+        with open(path, 'rb') as handle:
+            header = handle.read(cls.HEADER.size)
+            if len(header) < cls.HEADER.size or cls.HEADER.unpack(header) != (cls.MAGIC, cls.VERSION):
+                raise ValueError(f"{path} is not a version {cls.VERSION} snapshot")
+            
+            while True:
+                header = handle.read(cls.CHUNK.size)
+                if len(header) < cls.CHUNK.size:
+                    raise ValueError(f"{path} is truncated")
+                tag, season, raw_length, length = cls.CHUNK.unpack(header)
+                if tag == cls.END:
+                    return
+                payload = zlib.decompress(handle.read(length))
+                if len(payload) != raw_length:
+                    raise ValueError(f"{path} has a damaged {tag.decode('ascii')} chunk")
+                yield tag, season, payload
+    
+    # Season tables
+    @classmethod
+    def season_chunks(cls, year, season):
+        """Encode one season in HistoricalArchive.build form"""
+        races, results = [], []
+        for race in season['races']:
+            races.append({
+                'round': race['round'],
+                'name': race['name'],
+                'circuit': race['circuit'],
+                'date': race['date'].toordinal(),
+                'sprint': bool(race.get('sprint'))
+            })
+            for result in race['results']:
+                results.append(dict(result, round=race['round'], position=result['position'] or 0))
+        
+        standings = [
+            dict(entry, kind='driver', podiums=entry.get('podiums', 0)) for entry in season.get('driver_standings', [])
+        ] + [
+            dict(entry, kind='constructor', team='', podiums=0) for entry in season.get('constructor_standings', [])
+        ]
+        
+        yield from cls.table_chunks(cls.RACES, year, cls.RACE_COLUMNS, races)
+        yield from cls.table_chunks(cls.RESULTS, year, cls.RESULT_COLUMNS, results)
+        yield from cls.table_chunks(cls.STANDINGS, year, cls.STANDING_COLUMNS, standings)
+    
+    @classmethod
+    def add_rows(cls, season, tag, payload):
+        """Decode a season table chunk into a HistoricalArchive.build season"""
+        rows = cls.decode_table(payload)
+        if tag == cls.RACES:
+            for row in rows:
+                row['date'] = date.fromordinal(row['date'])
+                row['results'] = []
+            season['races'].extend(rows)
+        elif tag == cls.RESULTS:
+            # Races always precede their results in a snapshot
+            races = {race['round']: race for race in season['races']}
+            for row in rows:
+                races[row.pop('round')]['results'].append(row)
+        elif tag == cls.STANDINGS:
+            for row in rows:
+                if row.pop('kind') == 'driver':
+                    season['driver_standings'].append(row)
+                else:
+                    del row['team'], row['podiums']
+                    season['constructor_standings'].append(row)
+        else:
+            raise ValueError(f"Unknown snapshot chunk {tag!r}")
+    
+    # Columnar encoding
+    @classmethod
+    def table_chunks(cls, tag, season, columns, rows):
+        """Split rows into encoded chunks of at most CHUNK_ROWS"""
+        for start in range(0, len(rows), cls.CHUNK_ROWS):
+            yield tag, season, cls.encode_table(columns, rows[start:start + cls.CHUNK_ROWS])
+    
+    @classmethod
+    def encode_table(cls, columns, rows):
+        payload = bytearray(cls.COUNT.pack(len(rows)))
+        payload.extend(cls.NAME_LENGTH.pack(len(columns)))
+        for column in columns:
+            kind, data = cls._encode_column([row.get(column) for row in rows])
+            name = column.encode('ascii')
+            payload.extend(cls.NAME_LENGTH.pack(len(name)))
+            payload.extend(name)
+            payload.extend(kind)
+            payload.extend(cls.COUNT.pack(len(data)))
+            payload.extend(data)
+        return bytes(payload)
+    
+    @classmethod
+    def decode_table(cls, payload):
+        """Rows of an encoded table as dicts"""
+        (count,) = cls.COUNT.unpack_from(payload, 0)
+        (column_count,) = cls.NAME_LENGTH.unpack_from(payload, cls.COUNT.size)
+        offset = cls.COUNT.size + cls.NAME_LENGTH.size
+        
+        names, columns = [], []
+        for _ in range(column_count):
+            (length,) = cls.NAME_LENGTH.unpack_from(payload, offset)
+            offset += cls.NAME_LENGTH.size
+            names.append(payload[offset:offset + length].decode('ascii'))
+            kind = payload[offset + length:offset + length + 1]
+            (size,) = cls.COUNT.unpack_from(payload, offset + length + 1)
+            offset += length + 1 + cls.COUNT.size
+            columns.append(cls._decode_column(kind, payload[offset:offset + size]))
+            offset += size
+        
+        return [dict(zip(names, values)) for values in zip(*columns)] if count else []
+    
+    @classmethod
+    def _encode_column(cls, values):
+        if all(type(value) is bool for value in values):
+            return b'b', bytes(values)
+        if all(type(value) is int for value in values):
+            return b'i', cls._pack(array('q', values))
+        if all(type(value) in (int, float) for value in values):
+            return b'f', cls._pack(array('d', values))
+        if all(type(value) is str for value in values):
+            distinct = {}
+            indexes = array('I', [distinct.setdefault(value, len(distinct)) for value in values])
+            dictionary = json.dumps(list(distinct), ensure_ascii=False).encode('utf-8')
+            return b's', cls.COUNT.pack(len(dictionary)) + dictionary + cls._pack(indexes)
+        return b'j', json.dumps(values).encode('utf-8')
+    
+    @classmethod
+    def _decode_column(cls, kind, data):
+        if kind == b'b':
+            return [bool(value) for value in data]
+        if kind == b'i':
+            return cls._unpack('q', data)
+        if kind == b'f':
+            return cls._unpack('d', data)
+        if kind == b's':
+            (length,) = cls.COUNT.unpack_from(data, 0)
+            dictionary = json.loads(data[cls.COUNT.size:cls.COUNT.size + length].decode('utf-8'))
+            return [dictionary[index] for index in cls._unpack('I', data[cls.COUNT.size + length:])]
+        if kind == b'j':
+            return json.loads(data.decode('utf-8'))
+        raise ValueError(f"Unknown column type {kind!r}")
+    
+    # Arrays are stored little-endian whatever the platform
+    @staticmethod
+    def _pack(values):
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tobytes()
+    
+    @staticmethod
+    def _unpack(typecode, data):
+        values = array(typecode)
+        values.frombytes(data)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tolist()
+
+# Ergast schedule keys for the sessions of a race weekend, in running order
+SESSION_KEYS = [
+    ('FirstPractice', 'FP1'),
+    ('SecondPractice', 'FP2'),
+    ('ThirdPractice', 'FP3'),
+    ('SprintShootout', 'Sprint Shootout'),
+    ('SprintQualifying', 'Sprint Qualifying'),
+    ('Sprint', 'Sprint'),
+    ('Qualifying', 'Qualifying')
+]
+
+# Typical session lengths in minutes, used to tell when a session is live
+SESSION_DURATIONS = {
+    'FP1': 60,
+    'FP2': 60,
+    'FP3': 60,
+    'Sprint Shootout': 45,
+    'Sprint Qualifying': 45,
+    'Sprint': 45,
+    'Qualifying': 60,
+    'Race': 120
+}
+
+def parse_utc(timestamp):
+    """Parse an ISO-8601 timestamp into an aware UTC datetime"""
+    parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def format_countdown(seconds):
+    """Countdown text and how many seconds until that text next changes"""
+    seconds = int(seconds)
+    if seconds <= 0:
+        return 'Live now', None
+    
+    days, remainder = divmod(seconds, 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, secs = divmod(remainder, 60)
+    
+    # Coarser units far out, so distant sessions only need an hourly or daily tick
+    if days >= 2:
+        return f"{days} days to go", seconds - days * 86400 + 1
+    if days or hours:
+        total_hours = days * 24 + hours
+        return f"{total_hours}h {minutes:02d}m", secs + 1
+    return f"{minutes:02d}:{secs:02d}", 1
+
+class SessionClock:
+    """Sorted index of race weekend sessions, parsed to UTC once per schedule"""
+    
+    def __init__(self, schedule=()):
+        self.load(schedule)
+    
+    def load(self, schedule):
+        """Rebuild the index from a parsed schedule"""
+        sessions = []
+        
+        for race in schedule:
+            for session in race.get('sessions', []):
+                start = parse_utc(session['start'])
+                local_start = start.astimezone()
+                sessions.append({
+                    'name': session['name'],
+                    'round': race['round'],
+                    'race': race['name'],
+                    'circuit': race['circuit'],
+                    'circuit_id': race.get('circuit_id'),
+                    'start': start,
+                    'end': start + timedelta(minutes=SESSION_DURATIONS.get(session['name'], 60)),
+                    # Converted to local time here, not on every render
+                    'local_label': local_start.strftime('%a %d %b, %H:%M')
+                })
+        
+        sessions.sort(key=lambda session: session['start'])
+        self.sessions = sessions
+        self._starts = [session['start'] for session in sessions]
+    
+    def next_session(self, now=None, names=None):
+        """The live session, or else the next one to start, optionally limited to some session names"""
+        now = now or datetime.now(timezone.utc)
+        
+        # A session that started up to a race-length ago may still be running
+        index = bisect.bisect_left(self._starts, now - timedelta(minutes=max(SESSION_DURATIONS.values())))
+        for session in self.sessions[index:]:
+            if session['end'] <= now:
+                continue
+            if names is None or session['name'] in names:
+                return session
+        return None
+    
+    def upcoming(self, now=None, limit=None):
+        """Sessions that haven't started yet, soonest first"""
+        now = now or datetime.now(timezone.utc)
+        index = bisect.bisect_right(self._starts, now)
+        return self.sessions[index:index + limit if limit else None]
+
+class PrefetchWorker:
+    """Warms the data layer before it's needed, resuming interrupted runs from a checkpoint
+    
+    A plan falls due on race morning, RACE_DAY_LEAD before the start, and
+    once a session has finished, SETTLE_DELAY after its end when results
+    are usually out. Its tasks are data manager calls run one at a time on
+    a daemon thread. After each one the HTTP cache and the position in the
+    plan are written to disk, so a run the OS cut short carries on from
+    the next task. pause() holds the worker once the current task is done.
+    """
+    
+    RACE_DAY_LEAD = 6 * 3600
+    SETTLE_DELAY = 30 * 60
+    SETTLE_WINDOW = 12 * 3600  # Results still missing this long after a session are left to the screens
+    CHECK_INTERVAL = 15 * 60
+    RETRY_DELAY = 5 * 60     # First wait after a failed run, doubled on each failure in a row
+    RETRY_LIMIT = 2 * 3600
+    FINISHED_KEEP = 20
+    TASKS = ('get_race_schedule', 'sync_season', 'get_driver_standings', 'get_constructor_standings',
+             'prefetch_weekends', 'get_strategy')  # Checkpoints can only name these
+    
+    def __init__(self, manager, path=None, clock=None):
+        self.manager = manager
+        self.path = path
+        self.clock = clock or SessionClock()
+        self.enabled = True
+        self.checkpoint = {'plan': None, 'tasks': [], 'done': 0, 'finished': []}
+        self.running = threading.Event()
+        self.running.set()
+        self.wake = threading.Event()
+        self.thread = None
+        self.load()
+    
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                checkpoint = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if all(task and task[0] in self.TASKS for task in checkpoint.get('tasks', [])):
+            self.checkpoint.update(checkpoint)
+    
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as handle:
+            json.dump(self.checkpoint, handle)
+        os.replace(self.path + '.tmp', self.path)
+    
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+    
+    def pause(self):
+        """Stop after the current task, the checkpoint already records everything before it"""
+        self.running.clear()
+    
+    def resume(self):
+        self.running.set()
+        self.wake.set()
+    
+    def check_now(self):
+        """Look for a due plan straight away, e.g. after the schedule changed"""
+        self.wake.set()
+    
+    def run(self):
+        failures = 0
+        while True:
+            self.running.wait()
+            delay = self.CHECK_INTERVAL
+            # Offline Mode and Data Saver both mean no downloads the user didn't ask for
+            if self.enabled and not self.manager.offline and not self.manager.data_saver:
+                try:
+                    self.run_due()
+                    failures = 0
+                except Exception as error:  # Whatever a task raises, the thread has to live to try again
+                    tasks, done = self.checkpoint['tasks'], self.checkpoint['done']
+                    self.manager.metrics.error('prefetch_errors', f"prefetch/{tasks[done][0] if done < len(tasks) else 'plan'}", error)
+                    delay = min(self.RETRY_DELAY * 2 ** failures, self.RETRY_LIMIT)
+                    failures += 1
+            self.wake.wait(delay)
+            self.wake.clear()
+    
+    def plan(self, now=None):
+        """(plan id, tasks) of the prefetch due now, or None"""
+        now = now or datetime.now(timezone.utc)
+        season = self.manager.current_season
+        finished = set(self.checkpoint['finished'])
+        
+        # Results of the latest session that finished a while ago
+        for session in reversed(self.clock.sessions):
+            if session['end'] + timedelta(seconds=self.SETTLE_DELAY) > now:
+                continue
+            if session['end'] + timedelta(seconds=self.SETTLE_WINDOW) < now:
+                break
+            plan_id = f"{season}/{session['round']}/{session['name']}"
+            tasks = self.session_tasks(season, session)
+            if tasks and plan_id not in finished:
+                return plan_id, tasks
+        
+        # Everything the race day screens show, ahead of the race
+        race = self.clock.next_session(now, names=('Race',))
+        if race is not None and race['start'] - timedelta(seconds=self.RACE_DAY_LEAD) <= now:
+            plan_id = f"{season}/{race['round']}/race-day"
+            if plan_id not in finished:
+                tasks = [
+                    ['get_race_schedule', season],
+                    ['sync_season', season],
+                    ['get_driver_standings', season],
+                    ['get_constructor_standings', season],
+                    ['prefetch_weekends', season]
+                ]
+                if race['round'] > 1:
+                    tasks.append(['get_strategy', season, race['round'] - 1])  # Last race's replay and strategy
+                return plan_id, tasks
+        return None
+    
+    @staticmethod
+    def session_tasks(season, session):
+        if session['name'] == 'Qualifying':
+            return [['prefetch_weekends', season]]
+        if session['name'] not in ('Sprint', 'Race'):
+            return []
+        tasks = [
+            ['sync_season', season],
+            ['get_driver_standings', season],
+            ['get_constructor_standings', season],
+            ['prefetch_weekends', season]
+        ]
+        if session['name'] == 'Race':
+            tasks.append(['get_strategy', season, session['round']])
+        return tasks
+    
+    def run_due(self, now=None):
+        """Run what's left of the due plan, returning its id once it has finished"""
+        if not self.clock.sessions:
+            self.clock.load(self.manager.get_race_schedule())
+        due = self.plan(now)
+        if due is None:
+            return None
+        
+        plan_id, tasks = due
+        if self.checkpoint['plan'] != plan_id:
+            self.checkpoint.update(plan=plan_id, tasks=tasks, done=0)
+            self.save()
+        
+        while self.checkpoint['done'] < len(self.checkpoint['tasks']):
+            if not self.running.is_set():
+                return None
+            name, *args = self.checkpoint['tasks'][self.checkpoint['done']]
+            getattr(self.manager, name)(*args)
+            self.manager.save_http_cache()
+            if name == 'get_strategy' and (str(args[0]), int(args[1])) not in self.manager.strategy_cache:
+                return None  # Timings only partly published, the next check picks the plan up here
+            self.checkpoint['done'] += 1
+            self.save()
+        
+        self.checkpoint['finished'] = (self.checkpoint['finished'] + [plan_id])[-self.FINISHED_KEEP:]
+        self.save()
+        return plan_id
+
+class AlertQueue:
+    """Persistent priority queue of pending alerts, soonest due first
+    
+    Entries are [due, key, alert] on a heapq. The key names the alert
+    (season, round and kind) so re-planning from a refreshed schedule
+    never queues or repeats the same alert twice.
+    """
+    
+    RACE_START_LEAD = 15 * 60
+    RESULT_RETRIES = [10 * 60, 20 * 60, 40 * 60, 80 * 60]  # Waits between result checks after the expected finish
+    RESULT_GRACE = 86400  # Still check a result the app was closed for, up to a day late
+    FIRED_RETENTION = 14 * 86400
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.heap = []
+        self.keys = set()
+        self.fired = {}
+        self.load()
+    
+    def load(self):
+        """Read the queue left by the last run, if any"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        
+        self.heap = [entry for entry in data.get('pending', []) if len(entry) == 3]
+        heapq.heapify(self.heap)
+        self.keys = {entry[1] for entry in self.heap}
+        self.fired = data.get('fired', {})
+    
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as handle:
+            json.dump({'pending': self.heap, 'fired': self.fired}, handle)
+        os.replace(self.path + '.tmp', self.path)
+    
+    def push(self, due, key, alert):
+        """Queue an alert unless it is already pending or has fired"""
+        if key in self.keys or key in self.fired:
+            return False
+        heapq.heappush(self.heap, [due, key, alert])
+        self.keys.add(key)
+        return True
+    
+    def retry(self, due, key, alert):
+        """Queue an alert again after it fired, e.g. a result that wasn't published yet"""
+        self.fired.pop(key, None)
+        return self.push(due, key, alert)
+    
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+    
+    def pop_due(self, now):
+        """Remove and return the (key, alert) pairs due by now, dropping any that expired unseen"""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            _, key, alert = heapq.heappop(self.heap)
+            self.keys.discard(key)
+            self.fired[key] = now
+            if alert.get('expires', now) >= now:
+                due.append((key, alert))
+        
+        for key, fired_at in list(self.fired.items()):
+            if fired_at < now - self.FIRED_RETENTION:
+                del self.fired[key]
+        return due
+    
+    def plan(self, sessions, now):
+        """Precompute race-start and result alerts for every session still ahead"""
+        added = 0
+        
+        for session in sessions:
+            if session['name'] != 'Race':
+                continue
+            season = str(session['start'].year)
+            start = session['start'].timestamp()
+            end = session['end'].timestamp()
+            
+            if start > now:
+                added += self.push(start - self.RACE_START_LEAD, f"{season}:{session['round']}:race_start", {
+                    'kind': 'race_start',
+                    'title': f"{session['race']} starts soon",
+                    'message': f"Lights out at {session['local_label'].split(', ')[-1]}, {session['circuit']}",
+                    'expires': start
+                })
+            if end > now - self.RESULT_GRACE:
+                added += self.push(end, f"{season}:{session['round']}:results", {
+                    'kind': 'results',
+                    'season': season,
+                    'round': session['round'],
+                    'race': session['race'],
+                    'attempt': 0
+                })
+        
+        return added
+
+# Championship points awarded by finishing position
+RACE_POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+SPRINT_POINTS = [8, 7, 6, 5, 4, 3, 2, 1]
+FASTEST_LAP_POINTS = 1
+
+class ChampionshipSimulator:
+    """Works out who can still win the title and how likely each contender is"""
+    
+    def __init__(self, simulations=3000, form_exponent=2.0, seed=None):
+        self.simulations = simulations
+        self.form_exponent = form_exponent  # Higher values make current form more decisive
+        self.seed = seed
+        self._cache_key = None
+        self._cache_result = None
+    
+    def simulate(self, driver_standings, constructor_standings, schedule):
+        """Return elimination, clinch and title odds for both championships"""
+        cache_key = (
+            tuple((d['name'], d['points'], d['wins']) for d in driver_standings),
+            tuple((c['name'], c['points'], c['wins']) for c in constructor_standings),
+            tuple((r['round'], r['status'], r.get('sprint', False)) for r in schedule)
+        )
+        
+        # Results only change when the standings or the calendar do
+        if cache_key == self._cache_key:
+            return self._cache_result
+        
+        remaining = self.remaining_rounds(schedule)
+        result = {
+            'rounds_completed': max((r['round'] for r in schedule if r['status'] == 'completed'), default=0),
+            'total_rounds': max((r['round'] for r in schedule), default=0),
+            'remaining_rounds': len(remaining),
+            'drivers': self.analyse_table(driver_standings, remaining, cars=1),
+            'constructors': self.analyse_table(constructor_standings, remaining, cars=2)
+        }
+        
+        self._cache_key = cache_key
+        self._cache_result = result
+        return result
+    
+    def remaining_rounds(self, schedule):
+        """Return the races still to be run in round order"""
+        return sorted((r for r in schedule if r['status'] != 'completed'), key=lambda r: r['round'])
+    
+    def max_points_available(self, remaining, cars=1):
+        """Most points a single entry can still score with the given number of cars"""
+        total = 0
+        
+        for race in remaining:
+            total += sum(RACE_POINTS[:cars]) + FASTEST_LAP_POINTS
+            if race.get('sprint'):
+                total += sum(SPRINT_POINTS[:cars])
+        
+        return total
+    
+    def analyse_table(self, standings, remaining, cars=1):
+        """Analyse one championship table"""
+        if not standings:
+            return {'entries': [], 'leader': None, 'clinched': False, 'clinch_margin': None}
+        
+        table = sorted(standings, key=lambda entry: (-entry['points'], -entry['wins']))
+        max_remaining = self.max_points_available(remaining, cars)
+        leader = table[0]
+        
+        # Mathematical elimination: even a perfect run can't reach the leader
+        entries = []
+        for entry in table:
+            best_case = entry['points'] + max_remaining
+            entries.append({
+                'name': entry['name'],
+                'points': entry['points'],
+                'max_points': best_case,
+                'eliminated': best_case < leader['points'],
+                'probability': 0.0
+            })
+        
+        # Clinch: the leader is out of reach, or how much they must outscore P2 by next round
+        clinched = len(table) == 1 or leader['points'] > table[1]['points'] + max_remaining
+        clinch_margin = None
+        if not clinched and remaining:
+            lead = leader['points'] - table[1]['points']
+            max_after_next = self.max_points_available(remaining[1:], cars)
+            needed = max_after_next - lead + 1
+            if needed <= max_remaining - max_after_next:
+                clinch_margin = max(needed, 0)
+        
+        probabilities = self._monte_carlo(
+            [entry['points'] for entry in table],
+            [entry['wins'] for entry in table],
+            cars,
+            remaining
+        )
+        for entry, probability in zip(entries, probabilities):
+            entry['probability'] = 0.0 if entry['eliminated'] else probability
+        
+        return {
+            'entries': entries,
+            'leader': leader['name'],
+            'clinched': clinched,
+            'clinch_margin': clinch_margin
+        }
+    
+    def _event_points(self, remaining):
+        """Points tables for every remaining race and sprint, flagged by whether wins count"""
+        events = []
+        
+        for race in remaining:
+            if race.get('sprint'):
+                events.append((SPRINT_POINTS, False))
+            events.append((RACE_POINTS, True))
+        
+        return events
+    
+    def _monte_carlo(self, points, wins, cars, remaining):
+        """Estimate title probabilities over simulated finishing orders"""
+        entries = len(points)
+        
+        if not remaining:
+            return [1.0 if i == 0 else 0.0 for i in range(entries)]
+        if np is None:
+            return self._monte_carlo_python(points, wins, cars, remaining)
+        
+        rng = np.random.default_rng(self.seed)
+        events = self._event_points(remaining)
+        field = entries * cars
+        
+        # One row of awarded points per event, padded to the deepest points-paying position
+        depth = min(max(len(table) for table, _ in events), field)
+        awarded = np.zeros((len(events), depth), dtype=np.float32)
+        for i, (table, _) in enumerate(events):
+            count = min(len(table), depth)
+            awarded[i, :count] = table[:count]
+        is_race = np.array([counts_wins for _, counts_wins in events])
+        
+        # Gumbel-max trick: sorting perturbed log-strengths samples Plackett-Luce finishing orders
+        base = np.maximum(np.asarray(points, dtype=np.float32), 0)
+        strength = np.repeat(np.log(base + 1.0) * self.form_exponent, cars)
+        uniform = np.maximum(rng.random((self.simulations, len(events), field), dtype=np.float32), 1e-7)
+        keys = strength - np.log(-np.log(uniform))
+        order = np.argsort(-keys, axis=2)
+        
+        # Only the points-paying positions need scattering back onto cars
+        scored = np.zeros(keys.shape, dtype=np.float32)
+        np.put_along_axis(scored, order[:, :, :depth], np.broadcast_to(awarded, (self.simulations, len(events), depth)), axis=2)
+        totals = base + scored.sum(axis=1).reshape(self.simulations, entries, cars).sum(axis=2)
+        
+        # Ties go to the entry with more wins
+        race_winners = order[:, is_race, 0] // cars
+        new_wins = (race_winners[:, :, None] == np.arange(entries)).sum(axis=1)
+        totals += (np.asarray(wins) + new_wins) * 1e-3
+        
+        # The fastest lap point goes to one of each race's points finishers, as max_points_available allows for
+        finishers = order[:, is_race, :min(len(RACE_POINTS), field)]
+        picks = rng.integers(0, finishers.shape[2], size=finishers.shape[:2])
+        fastest = np.take_along_axis(finishers, picks[:, :, None], axis=2)[:, :, 0] // cars
+        totals += (fastest[:, :, None] == np.arange(entries)).sum(axis=1) * FASTEST_LAP_POINTS
+        
+        champions = totals.argmax(axis=1)
+        return (np.bincount(champions, minlength=entries) / self.simulations).tolist()
+    
+    def _monte_carlo_python(self, points, wins, cars, remaining):
+        """Slower fallback used when numpy isn't available"""
+        rng = random.Random(self.seed)
+        events = self._event_points(remaining)
+        simulations = min(self.simulations, 500)
+        strength = [math.log(max(p, 0) + 1.0) * self.form_exponent for p in points for _ in range(cars)]
+        titles = [0] * len(points)
+        
+        for _ in range(simulations):
+            totals = [p + w * 1e-3 for p, w in zip(points, wins)]
+            for table, counts_wins in events:
+                keys = [s - math.log(-math.log(rng.random() or 1e-12)) for s in strength]
+                order = sorted(range(len(strength)), key=keys.__getitem__, reverse=True)
+                for position, car in enumerate(order[:len(table)]):
+                    totals[car // cars] += table[position]
+                if counts_wins:
+                    totals[order[0] // cars] += 1e-3
+                    totals[rng.choice(order[:len(RACE_POINTS)]) // cars] += FASTEST_LAP_POINTS
+            titles[max(range(len(totals)), key=totals.__getitem__)] += 1
+        
+        return [count / simulations for count in titles]
+
+class SearchIndex:
+    """Inverted index over drivers, teams, circuits, races and news articles"""
+    
+    MAX_CACHED_PREFIXES = 256
+    MIN_PREFIX_LENGTH = 2  # Single letters match whole words only, expanding them would touch most of the index
+    
+    def __init__(self):
+        self.documents = {}         # doc_id -> {'kind', 'title', 'subtitle', 'terms'}
+        self.postings = {}          # term -> doc_ids containing it anywhere
+        self.title_postings = {}    # term -> doc_ids containing it in the title
+        self.terms = []             # Sorted vocabulary for prefix range scans
+        self._new_terms = []        # Vocabulary added since the last merge into self.terms
+        self._stale_terms = False   # self.terms still lists terms that were removed
+        self._prefix_cache = {}
+        self._lock = threading.Lock()  # Data arrives on loader threads while the UI queries
+    
+    @staticmethod
+    def normalize(text):
+        """Lower-case and strip accents so 'Pérez' and 'perez' compare equal"""
+        decomposed = unicodedata.normalize('NFKD', text)
+        return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+    
+    def tokenize(self, text):
+        return re.findall(r'\w+', self.normalize(text))
+    
+    def add(self, doc_id, kind, title, text='', subtitle=''):
+        """Index or re-index a single document"""
+        title_terms = set(self.tokenize(title))
+        terms = title_terms | set(self.tokenize(text))
+        
+        with self._lock:
+            existing = self.documents.get(doc_id)
+            if existing is not None:
+                if existing['terms'] == terms and existing['title'] == title and existing['subtitle'] == subtitle:
+                    return
+                self._remove(doc_id)
+            self._add(doc_id, kind, title, subtitle, terms, title_terms)
+    
+    def _add(self, doc_id, kind, title, subtitle, terms, title_terms):
+        for term in terms:
+            if term not in self.postings:
+                self.postings[term] = set()
+                self._new_terms.append(term)
+            self.postings[term].add(doc_id)
+        for term in title_terms:
+            self.title_postings.setdefault(term, set()).add(doc_id)
+        
+        self.documents[doc_id] = {'kind': kind, 'title': title, 'subtitle': subtitle, 'terms': terms}
+        self._prefix_cache.clear()
+    
+    def remove(self, doc_id):
+        """Drop a document and any vocabulary only it used"""
+        with self._lock:
+            self._remove(doc_id)
+    
+    def _remove(self, doc_id):
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            return
+        
+        for term in document['terms']:
+            title_docs = self.title_postings.get(term)
+            if title_docs is not None:
+                title_docs.discard(doc_id)
+                if not title_docs:
+                    del self.title_postings[term]
+            
+            docs = self.postings[term]
+            docs.discard(doc_id)
+            if not docs:
+                del self.postings[term]
+                self._stale_terms = True
+        
+        self._prefix_cache.clear()
+    
+    def _merge_terms(self):
+        """Fold newly seen vocabulary into the sorted term list before querying"""
+        if self._stale_terms:
+            self.terms = [term for term in self.terms if term in self.postings]
+            self._new_terms = [term for term in self._new_terms if term in self.postings]
+            self._stale_terms = False
+        if self._new_terms:
+            # Two sorted runs - Timsort merges them in linear time
+            self._new_terms.sort()
+            self.terms.extend(self._new_terms)
+            self.terms.sort()
+            self._new_terms = []
+    
+    def _prefix_matches(self, prefix):
+        """Documents with a term starting with prefix, as (anywhere, in title) sets"""
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            return cached
+        
+        if len(prefix) < self.MIN_PREFIX_LENGTH:
+            return self.postings.get(prefix, set()), self.title_postings.get(prefix, set())
+        
+        self._merge_terms()
+        matches = set()
+        title_matches = set()
+        index = bisect.bisect_left(self.terms, prefix)
+        while index < len(self.terms) and self.terms[index].startswith(prefix):
+            term = self.terms[index]
+            matches |= self.postings[term]
+            title_matches |= self.title_postings.get(term, set())
+            index += 1
+        
+        # Typing a query re-uses the same prefixes keystroke after keystroke
+        if len(self._prefix_cache) >= self.MAX_CACHED_PREFIXES:
+            self._prefix_cache.clear()
+        self._prefix_cache[prefix] = (matches, title_matches)
+        return matches, title_matches
+    
+    def search(self, query, limit=20, kinds=None):
+        """Return the best matching documents; every query word is matched as a prefix"""
+        tokens = self.tokenize(query)
+        if not tokens:
+            return []
+        
+        with self._lock:
+            return self._search(tokens, limit, kinds)
+    
+    def _search(self, tokens, limit, kinds):
+        per_token = [self._prefix_matches(token) for token in tokens]
+        candidates = None
+        for matches, _ in sorted(per_token, key=lambda pair: len(pair[0])):
+            candidates = set(matches) if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        
+        if kinds is not None:
+            candidates = [doc_id for doc_id in candidates if self.documents[doc_id]['kind'] in kinds]
+        
+        # Title hits rank above body hits, then shorter titles (closer matches) first
+        def rank(doc_id):
+            title_hits = sum(1 for _, title_matches in per_token if doc_id in title_matches)
+            return (-title_hits, len(self.documents[doc_id]['title']), doc_id)
+        
+        results = []
+        for doc_id in sorted(candidates, key=rank)[:limit]:
+            document = self.documents[doc_id]
+            results.append({
+                'id': doc_id,
+                'kind': document['kind'],
+                'title': document['title'],
+                'subtitle': document['subtitle']
+            })
+        
+        return results
+
+def format_relative_time(published, now=None):
+    """Human friendly age of a timestamp, e.g. '5 hours ago'"""
+    now = now or datetime.now(timezone.utc)
+    seconds = max(0, (now - published).total_seconds())
+    
+    if seconds < 60:
+        return 'Just now'
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    hours = minutes // 60
+    if hours < 24:
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    days = hours // 24
+    if days < 7:
+        return f"{days} day{'s' if days != 1 else ''} ago"
+    return published.strftime('%b %d, %Y')
+
+class NewsSource:
+    """Base class for pluggable news sources"""
+    
+    def fetch(self, offset, limit):
+        """Return up to limit articles starting at offset, newest first"""
+        raise NotImplementedError
+
+class StaticNewsSource(NewsSource):
+    """Source whose whole feed arrives in one document and is paged locally"""
+    
+    def __init__(self, http_get=None):
+        self._articles = None
+        self.http_get = http_get or requests.get
+    
+    def load_articles(self):
+        raise NotImplementedError
+    
+    def fetch(self, offset, limit):
+        if self._articles is None:
+            self._articles = sorted(self.load_articles(), key=lambda article: article['published'], reverse=True)
+        return self._articles[offset:offset + limit]
+
+class MockNewsSource(StaticNewsSource):
+    """Stand-in feed used when no real news source is configured"""
+    
+    def load_articles(self):
+        now = datetime.now(timezone.utc)
+        return [
+            {
+                'id': 'mock-1',
+                'title': 'Verstappen Clinches Third Consecutive Championship',
+                'summary': 'Max Verstappen secured his third Formula 1 World Championship with a dominant performance...',
+                'published': now - timedelta(hours=2),
+                'category': 'Championship',
+                'image': None
+            },
+            {
+                'id': 'mock-2',
+                'title': 'Abu Dhabi GP: Preview and Predictions',
+                'summary': 'The season finale promises excitement as teams battle for final constructor points...',
+                'published': now - timedelta(hours=5),
+                'category': 'Race Preview',
+                'image': None
+            },
+            {
+                'id': 'mock-3',
+                'title': 'Mercedes Announces 2024 Driver Lineup',
+                'summary': 'Mercedes confirms Hamilton and Russell will continue for the 2024 season...',
+                'published': now - timedelta(days=1),
+                'category': 'Driver News',
+                'image': None
+            },
+            {
+                'id': 'mock-4',
+                'title': 'Technical Regulation Changes for 2024',
+                'summary': 'FIA announces key technical regulation updates for the upcoming season...',
+                'published': now - timedelta(days=2),
+                'category': 'Regulations',
+                'image': None
+            }
+        ]
+
+class JSONNewsSource(StaticNewsSource):
+    """Articles from a local JSON file or a JSON endpoint
+    
+    Expects a list of articles (or {'articles': [...]}) with id, title,
+    summary, category, ISO-8601 'published' and an optional 'image'.
+    Endpoints that accept offset/limit query parameters can be paged
+    remotely by passing paged=True.
+    """
+    
+    def __init__(self, location, paged=False, http_get=None):
+        super().__init__(http_get)
+        self.location = location
+        self.paged = paged
+    
+    def fetch(self, offset, limit):
+        if self.paged:
+            response = self.http_get(self.location, params={'offset': offset, 'limit': limit}, timeout=10)
+            response.raise_for_status()
+            return [self.parse_article(article) for article in self._unwrap(response.json())]
+        return super().fetch(offset, limit)
+    
+    def load_articles(self):
+        if self.location.startswith(('http://', 'https://')):
+            response = self.http_get(self.location, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+        else:
+            with open(self.location, encoding='utf-8') as handle:
+                data = json.load(handle)
+        return [self.parse_article(article) for article in self._unwrap(data)]
+    
+    def _unwrap(self, data):
+        return data['articles'] if isinstance(data, dict) else data
+    
+    def parse_article(self, article):
+        published = datetime.fromisoformat(article['published'].replace('Z', '+00:00'))
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=timezone.utc)
+        return {
+            'id': str(article.get('id') or article['title']),
+            'title': article['title'],
+            'summary': article.get('summary', ''),
+            'published': published,
+            'category': article.get('category', 'News'),
+            'image': article.get('image')
+        }
+
+class RSSNewsSource(StaticNewsSource):
+    """Articles from an RSS 2.0 feed"""
+    
+    MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+    
+    def __init__(self, url, category='News', http_get=None):
+        super().__init__(http_get)
+        self.url = url
+        self.category = category
+    
+    def load_articles(self):
+        response = self.http_get(self.url, timeout=10)
+        response.raise_for_status()
+        root = ElementTree.fromstring(response.content)
+        articles = []
+        
+        for item in root.iter('item'):
+            title = (item.findtext('title') or '').strip()
+            description = re.sub(r'<[^>]+>', '', item.findtext('description') or '').strip()
+            pub_date = item.findtext('pubDate')
+            published = parsedate_to_datetime(pub_date) if pub_date else datetime.now(timezone.utc)
+            
+            # Thumbnail from an image enclosure or Media RSS
+            image = None
+            enclosure = item.find('enclosure')
+            if enclosure is not None and enclosure.get('type', '').startswith('image/'):
+                image = enclosure.get('url')
+            for tag in ('thumbnail', 'content'):
+                media = item.find(self.MEDIA_NS + tag)
+                if image is None and media is not None:
+                    image = media.get('url')
+            
+            articles.append({
+                'id': item.findtext('guid') or item.findtext('link') or title,
+                'title': title,
+                'summary': description,
+                'published': published,
+                'category': item.findtext('category') or self.category,
+                'image': image
+            })
+        
+        return articles
+
+def news_source_for(location=None, http_get=None):
+    """Pick a news source implementation from a file path or URL"""
+    if not location:
+        return MockNewsSource()
+    if location.lower().endswith(('.rss', '.xml')) or '/rss' in location.lower():
+        return RSSNewsSource(location, http_get=http_get)
+    return JSONNewsSource(location, http_get=http_get)
+
+class NewsFeed:
+    """Paginated, de-duplicated window over a news source
+    
+    Only the most recent max_articles loaded articles are kept, so memory
+    stays flat however far the user scrolls.
+    """
+    
+    def __init__(self, source, page_size=10, max_articles=200):
+        self.source = source
+        self.page_size = page_size
+        self.max_articles = max_articles
+        self.reset()
+    
+    def reset(self):
+        """Start again from the newest article"""
+        self.articles = []
+        self.offset = 0
+        self.seen_ids = OrderedDict()
+        self.exhausted = False
+        self.trimmed = 0  # Articles dropped from the top of the window
+    
+    def load_more(self):
+        """Fetch the next page and return only articles not seen before"""
+        if self.exhausted:
+            return []
+        
+        page = self.source.fetch(self.offset, self.page_size)
+        self.offset += len(page)
+        if len(page) < self.page_size:
+            self.exhausted = True
+        
+        fresh = []
+        for article in page:
+            if article['id'] in self.seen_ids:
+                continue
+            self.seen_ids[article['id']] = True
+            fresh.append(article)
+        
+        # Bound de-duplication memory as well as the article window
+        while len(self.seen_ids) > self.max_articles * 2:
+            self.seen_ids.popitem(last=False)
+        
+        self.articles.extend(fresh)
+        overflow = len(self.articles) - self.max_articles
+        if overflow > 0:
+            del self.articles[:overflow]
+            self.trimmed += overflow
+        
+        return fresh
+
+# Settings shown on the settings screen: (group, [(key, label, default)]), a setting's type is its default's type
+SETTINGS_SCHEMA = [
+    ('Notifications', [
+        ('race_start_alerts', 'Race Start Alerts', True),
+        ('breaking_news', 'Breaking News', True),
+        ('championship_updates', 'Championship Updates', False)
+    ]),
+    ('Data & Sync', [
+        ('auto_refresh', 'Auto-refresh', True),
+        ('offline_mode', 'Offline Mode', False),
+        ('data_saver', 'Data Saver', False),
+        ('background_prefetch', 'Prefetch Before Sessions', True),
+        ('upstream_url', 'Local Data Server', '')
+    ]),
+    ('Series', [
+        ('f2_feed', 'Formula 2 Feed', ''),
+        ('f3_feed', 'Formula 3 Feed', ''),
+        ('f1_academy_feed', 'F1 Academy Feed', '')
+    ]),
+    ('Display', [
+        ('dark_theme', 'Dark Theme', False),
+        ('large_text', 'Large Text', False),
+        ('animations', 'Animations', True),
+        ('low_power', 'Low Power Mode', False)
+    ])
+]
+
+class SettingsStore:
+    """Typed user settings, read once at startup and written back in batches
+    
+    Changes take effect through subscriptions straight away; the file
+    write is debounced so a burst of toggles costs one atomic write.
+    """
+    
+    WRITE_DELAY = 1.0
+    
+    def __init__(self, path=None, schema=SETTINGS_SCHEMA):
+        self.path = path
+        self.defaults = {key: default for _, options in schema for key, _, default in options}
+        self.values = dict(self.defaults)
+        self.subscribers = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self.load()
+    
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        
+        # Unknown keys and values of the wrong type fall back to the defaults
+        for key, value in data.items():
+            if key in self.defaults and type(value) is type(self.defaults[key]):
+                self.values[key] = value
+    
+    def get(self, key):
+        return self.values[key]
+    
+    def set(self, key, value):
+        """Change a setting, notify its subscribers and queue a write"""
+        default = self.defaults[key]
+        if type(value) is not type(default):
+            raise TypeError(f"Setting {key} expects {type(default).__name__}, got {type(value).__name__}")
+        if self.values[key] == value:
+            return
+        
+        with self._lock:
+            self.values[key] = value
+        for callback in list(self.subscribers.get(key, [])):
+            callback(value)
+        self._schedule_write()
+    
+    def subscribe(self, key, callback, call_now=False):
+        """Call callback(value) whenever key changes, and once now if call_now"""
+        self.subscribers.setdefault(key, []).append(callback)
+        if call_now:
+            callback(self.values[key])
+    
+    def _schedule_write(self):
+        if not self.path:
+            return
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.WRITE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def flush(self):
+        """Write pending changes now"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            values = dict(self.values)
+        
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as handle:
+            json.dump(values, handle)
+        os.replace(self.path + '.tmp', self.path)
+
+class DataStore:
+    """Versioned slices of published data with per-slice subscriptions
+    
+    A slice is named like 'standings/drivers/2023'. put() bumps a slice's
+    version only when its value really changed, and marks it for the next
+    flush(), which the app runs once per frame on the UI thread. However
+    many puts land in between, each subscriber is called once per frame
+    with the latest value, and only for the slices it subscribed to.
+    Puts may come from any thread.
+    """
+    
+    def __init__(self, schedule_flush=None):
+        self.slices = {}  # name -> (version, value)
+        self.subscribers = {}
+        self.pending = {}  # Slices changed since the last flush, in order of change
+        self.schedule_flush = schedule_flush  # Called when a frame's first change arrives
+        self._lock = threading.Lock()
+    
+    def get(self, name, default=None):
+        entry = self.slices.get(name)
+        return entry[1] if entry is not None else default
+    
+    def version(self, name):
+        """How many times a slice has changed, 0 before its first put"""
+        entry = self.slices.get(name)
+        return entry[0] if entry is not None else 0
+    
+    def put(self, name, value):
+        """Replace a slice's value, returning whether subscribers will hear about it"""
+        with self._lock:
+            entry = self.slices.get(name)
+            if entry is not None and entry[1] == value:
+                return False
+            self.slices[name] = ((entry[0] if entry is not None else 0) + 1, value)
+            first = not self.pending
+            self.pending[name] = True
+        
+        if first and self.schedule_flush is not None:
+            self.schedule_flush()
+        return True
+    
+    def subscribe(self, name, callback, call_now=False):
+        """Call callback(value) after each flush that follows a change to name, and once now if call_now"""
+        self.subscribers.setdefault(name, []).append(callback)
+        if call_now and name in self.slices:
+            callback(self.slices[name][1])
+    
+    def unsubscribe(self, name, callback):
+        if callback in self.subscribers.get(name, []):
+            self.subscribers[name].remove(callback)
+    
+    def flush(self, *args):
+        """Deliver the changes since the last flush, each slice's latest value once"""
+        with self._lock:
+            changed = [(name, self.slices[name][1]) for name in self.pending]
+            self.pending = {}
+        
+        for name, value in changed:
+            for callback in list(self.subscribers.get(name, [])):
+                callback(value)
+
+def parse_lap_time(text):
+    """Seconds in a lap time such as '1:24.567', None when it isn't one"""
+    match = re.fullmatch(r'(?:(\d+):)?(\d+(?:\.\d+)?)', text.strip())
+    if not match:
+        return None
+    return int(match.group(1) or 0) * 60 + float(match.group(2))
+
+def format_lap_time(seconds):
+    """Lap time text such as '1:24.567', the inverse of parse_lap_time"""
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}:{seconds:06.3f}" if minutes else f"{seconds:.3f}"
+
+class RaceTimeline:
+    """One race's laps indexed by race time, for replay and scrubbing
+    
+    Each driver's laps become a sorted array of the race times at which
+    they crossed the line, with the lap times and best lap so far kept
+    alongside. The state of the race at any moment is then one binary
+    search per driver, so seeking costs the same anywhere in the race
+    and nothing is replayed from lap 1.
+    """
+    
+    def __init__(self, laps):
+        """laps is rows of {'lap', 'driver', 'time'} in any order, as from get_lap_times"""
+        by_driver = {}
+        for row in laps:
+            seconds = parse_lap_time(row['time'])
+            if seconds is not None:
+                by_driver.setdefault(row['driver'], {})[row['lap']] = seconds
+        
+        self.drivers = {}  # code -> (crossing times, lap times, best lap so far)
+        for driver, driver_laps in by_driver.items():
+            crossings, lap_times, best = [], [], []
+            elapsed, fastest = 0.0, math.inf
+            lap = 1
+            # A missing lap leaves the rest unplaceable in time, so the driver stops there
+            while lap in driver_laps:
+                seconds = driver_laps[lap]
+                elapsed += seconds
+                fastest = min(fastest, seconds)
+                crossings.append(elapsed)
+                lap_times.append(seconds)
+                best.append(fastest)
+                lap += 1
+            if crossings:
+                self.drivers[driver] = (crossings, lap_times, best)
+        
+        # The leader's crossing of each lap line, for gaps and seeking by lap
+        self.lap_count = max((len(crossings) for crossings, _, _ in self.drivers.values()), default=0)
+        self.leader_crossings = [
+            min(crossings[lap] for crossings, _, _ in self.drivers.values() if len(crossings) > lap)
+            for lap in range(self.lap_count)
+        ]
+        self.duration = max((crossings[-1] for crossings, _, _ in self.drivers.values()), default=0.0)
+    
+    @classmethod
+    def from_recording(cls, frames):
+        """Rebuild laps from recorded live timing rows, each change of a driver's last lap being a new lap"""
+        laps, last_laps, counts = [], {}, {}
+        for row in sorted(frames, key=lambda row: row['t']):
+            driver = row['driver']
+            if row['last_lap'] and row['last_lap'] != last_laps.get(driver):
+                last_laps[driver] = row['last_lap']
+                counts[driver] = counts.get(driver, 0) + 1
+                laps.append({'lap': counts[driver], 'driver': driver, 'time': row['last_lap']})
+        return cls(laps)
+    
+    def time_at_lap(self, lap):
+        """Race time when the leader finished lap, 0 for the start"""
+        if lap <= 0 or not self.leader_crossings:
+            return 0.0
+        return self.leader_crossings[min(lap, self.lap_count) - 1]
+    
+    def leader_lap(self, time):
+        """Laps the leader has completed at a race time"""
+        return bisect.bisect_right(self.leader_crossings, time)
+    
+    def frame_at(self, time):
+        """Timing rows at a race time, in the shape the live timing table shows
+        
+        Each row also carries 'progress', the laps covered including the
+        estimated fraction of the current one, for placing cars on a map.
+        """
+        order = []
+        for driver, (crossings, lap_times, best) in self.drivers.items():
+            completed = bisect.bisect_right(crossings, time)
+            crossed = crossings[completed - 1] if completed else 0.0
+            order.append((-completed, crossed, driver, completed))
+        order.sort()
+        
+        frame = []
+        for position, (_, crossed, driver, completed) in enumerate(order, 1):
+            crossings, lap_times, best = self.drivers[driver]
+            if position == 1:
+                gap = 'Leader'
+            elif not completed:
+                gap = ''
+            else:
+                # Laps the leader had completed when this driver last crossed the line
+                behind = bisect.bisect_right(self.leader_crossings, crossed) - completed
+                if behind > 0:
+                    gap = f"+{behind} Lap{'s' if behind > 1 else ''}"
+                else:
+                    gap = f"+{crossed - self.leader_crossings[completed - 1]:.3f}"
+            
+            # The current lap is assumed to take as long as the next recorded one
+            progress = completed
+            if completed < len(crossings):
+                progress += (time - crossed) / lap_times[completed]
+            
+            frame.append({
+                'pos': position,
+                'driver': driver,
+                'gap': gap,
+                'last_lap': format_lap_time(lap_times[completed - 1]) if completed else '',
+                'best_lap': format_lap_time(best[completed - 1]) if completed else '',
+                'progress': progress
+            })
+        
+        return frame
+    
+    def lap_series(self, time):
+        """Each driver's lap times completed by a race time, as LineChart series"""
+        series = []
+        for driver, (crossings, lap_times, _) in self.drivers.items():
+            completed = bisect.bisect_right(crossings, time)
+            series.append({'name': driver, 'points': list(zip(range(1, completed + 1), lap_times[:completed]))})
+        return series
+
+class StrategyAnalysis:
+    """Stints, pit losses, undercuts and tyre degradation of one race
+    
+    Laps are held as parallel columns sorted by driver and lap, tagged
+    with their stint and whether they're clean racing laps, so per-stint
+    figures are grouped reductions over whole columns (numpy when it's
+    installed) rather than a loop per driver. A race is analysed once
+    and memoized by F1DataManager.get_strategy.
+    """
+    
+    DEFAULT_PIT_LOSS = 22.0  # Seconds, a typical stop for when a race has no stop data
+    SLOW_LAP = 1.07          # Laps over 107% of the driver's median are safety car, traffic or incidents
+    UNDERCUT_GAP = 3.0       # Cars closer than this before the first stop are fighting each other
+    UNDERCUT_LAPS = 5        # The rival has to stop within this many laps to count as answering
+    MIN_STINT_LAPS = 3       # Clean laps needed for a degradation slope
+    
+    def __init__(self, laps, stops):
+        rows = []
+        for row in laps:
+            seconds = parse_lap_time(row['time'])
+            if seconds is not None:
+                rows.append((row['driver'], row['lap'], seconds))
+        rows.sort()
+        
+        stop_laps = {}
+        for stop in stops:
+            stop_laps.setdefault(stop['driver'], []).append(stop['lap'])
+        for driver_stops in stop_laps.values():
+            driver_stops.sort()
+        
+        # Columns
+        self.driver, self.lap, self.time, self.stint, self.stint_lap, self.clean = [], [], [], [], [], []
+        self.crossings = {}  # (driver, lap) -> race time at the end of the lap
+        medians = {}
+        for driver in sorted({row[0] for row in rows}):
+            times = sorted(seconds for code, _, seconds in rows if code == driver)
+            medians[driver] = times[len(times) // 2]
+        
+        elapsed, previous = 0.0, None
+        for driver, lap, seconds in rows:
+            if driver != previous:
+                elapsed, previous = 0.0, driver
+            elapsed += seconds
+            self.crossings[driver, lap] = elapsed
+            
+            driver_stops = stop_laps.get(driver, [])
+            stint = bisect.bisect_left(driver_stops, lap)  # A stop on lap L ends the stint with L as the in-lap
+            start = driver_stops[stint - 1] + 1 if stint else 1
+            self.driver.append(driver)
+            self.lap.append(lap)
+            self.time.append(seconds)
+            self.stint.append(stint)
+            self.stint_lap.append(lap - start)
+            self.clean.append(
+                lap > 1 and lap != start and lap not in driver_stops and seconds <= medians[driver] * self.SLOW_LAP
+            )
+        
+        self.stints = self._stints()
+        self.stops = self._stops(stops, medians)
+        losses = sorted(stop['loss'] for stop in self.stops if stop['loss'] is not None)
+        self.pit_loss = losses[len(losses) // 2] if losses else self.DEFAULT_PIT_LOSS
+        self.undercuts = self._undercuts(stop_laps)
+        
+        # Classification from the last line crossing, for listing drivers in finishing order
+        last = {}
+        for (driver, lap), crossed in self.crossings.items():
+            if lap >= last.get(driver, (0, 0))[0]:
+                last[driver] = (lap, crossed)
+        self.finishing_order = sorted(last, key=lambda driver: (-last[driver][0], last[driver][1]))
+    
+    def _stints(self):
+        """Length and degradation slope of every stint"""
+        keys, index = [], {}
+        for driver, stint in zip(self.driver, self.stint):
+            keys.append(index.setdefault((driver, stint), len(index)))
+        
+        # Least squares slope of lap time over laps into the stint, from per-stint sums of the clean laps
+        count = len(index)
+        if np is not None:
+            key_column = np.array(keys, dtype=np.int64)
+            clean = np.array(self.clean, dtype=bool)
+            x = np.array(self.stint_lap, dtype=np.float64)[clean]
+            y = np.array(self.time, dtype=np.float64)[clean]
+            clean_keys = key_column[clean]
+            n = np.bincount(clean_keys, minlength=count)
+            sx, sy = np.bincount(clean_keys, x, count), np.bincount(clean_keys, y, count)
+            sxy, sxx = np.bincount(clean_keys, x * y, count), np.bincount(clean_keys, x * x, count)
+            laps = np.bincount(key_column, minlength=count)
+            first = np.full(count, np.iinfo(np.int64).max)
+            np.minimum.at(first, key_column, np.array(self.lap, dtype=np.int64))
+            sums = zip(n.tolist(), sx.tolist(), sy.tolist(), sxy.tolist(), sxx.tolist(), laps.tolist(), first.tolist())
+        else:
+            totals = [[0, 0.0, 0.0, 0.0, 0.0, 0, None] for _ in range(count)]
+            for key, lap, x, y, clean in zip(keys, self.lap, self.stint_lap, self.time, self.clean):
+                total = totals[key]
+                if clean:
+                    total[0] += 1
+                    total[1] += x
+                    total[2] += y
+                    total[3] += x * y
+                    total[4] += x * x
+                total[5] += 1
+                total[6] = lap if total[6] is None else min(total[6], lap)
+            sums = totals
+        
+        stints = []
+        for (driver, stint), (n, sx, sy, sxy, sxx, laps, first) in zip(index, sums):
+            denominator = n * sxx - sx * sx
+            slope = (n * sxy - sx * sy) / denominator if n >= self.MIN_STINT_LAPS and denominator else None
+            stints.append({'driver': driver, 'stint': stint + 1, 'start': first, 'laps': laps, 'slope': slope})
+        return stints
+    
+    def _stops(self, stops, medians):
+        """Time each stop cost over two racing laps"""
+        times = dict(zip(zip(self.driver, self.lap), self.time))
+        result = []
+        for stop in sorted(stops, key=lambda stop: (stop['lap'], stop['driver'])):
+            driver, lap = stop['driver'], stop['lap']
+            in_lap, out_lap = times.get((driver, lap)), times.get((driver, lap + 1))
+            loss = in_lap + out_lap - 2 * medians[driver] if in_lap is not None and out_lap is not None else None
+            result.append(dict(stop, loss=loss))
+        return result
+    
+    def _undercuts(self, stop_laps):
+        """Gap gained by each car that stopped first on a rival just ahead, once the rival has answered
+        
+        A positive delta means the undercut gained time, and 'passed' that
+        it got the car ahead. A negative one means the rival's overcut won.
+        """
+        undercuts = []
+        for driver, driver_stops in stop_laps.items():
+            for lap in driver_stops:
+                for rival, rival_stops in stop_laps.items():
+                    answer = next((rival_lap for rival_lap in rival_stops if lap < rival_lap <= lap + self.UNDERCUT_LAPS), None)
+                    if rival == driver or answer is None:
+                        continue
+                    try:
+                        before = self.crossings[driver, lap - 1] - self.crossings[rival, lap - 1]
+                        after = self.crossings[driver, answer + 1] - self.crossings[rival, answer + 1]
+                    except KeyError:
+                        continue  # One of them retired or the stop came on the first lap
+                    if 0 < before <= self.UNDERCUT_GAP:
+                        undercuts.append({
+                            'driver': driver, 'rival': rival, 'lap': lap, 'rival_lap': answer,
+                            'delta': before - after, 'passed': after < 0
+                        })
+        undercuts.sort(key=lambda undercut: -undercut['delta'])
+        return undercuts
+    
+    def driver_stints(self, driver):
+        return [stint for stint in self.stints if stint['driver'] == driver]
+
+def project_rejoin(timing_data, pit_loss):
+    """Position each car would rejoin in if it pitted now, from the gaps in timing rows
+    
+    The lead-lap gaps are sorted once, so each car's projection is a binary
+    search for its gap plus the pit loss. Lapped cars get no projection.
+    """
+    gaps = {}
+    for row in timing_data:
+        if row['gap'] == 'Leader':
+            gaps[row['driver']] = 0.0
+        elif row['gap']:
+            gap = parse_lap_time(row['gap'].lstrip('+'))
+            if gap is not None:
+                gaps[row['driver']] = gap
+    
+    ordered = sorted(gaps.values())
+    return {driver: bisect.bisect_left(ordered, gap + pit_loss) for driver, gap in gaps.items()}
+
+def lttb(points, threshold):
+    """Largest-Triangle-Three-Buckets downsampling of (x, y) points sorted by x
+    
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with its neighbours - peaks and
+    dips survive where plain striding would drop them.
+    """
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+    
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    previous = 0
+    
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        
+        # Average of the next bucket is the third corner of the triangle
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        next_points = points[end:next_end] or points[-1:]
+        avg_x = sum(point[0] for point in next_points) / len(next_points)
+        avg_y = sum(point[1] for point in next_points) / len(next_points)
+        
+        prev_x, prev_y = points[previous]
+        best, best_area = start, -1
+        for index in range(start, end):
+            x, y = points[index]
+            area = abs((prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y))
+            if area > best_area:
+                best, best_area = index, area
+        
+        sampled.append(points[best])
+        previous = best
+    
+    sampled.append(points[-1])
+    return sampled
+
+class DataServer:
+    """Serves a data manager's normalized data to other F1 Hub clients over HTTP
+    
+    One node syncs with Ergast and every display on the network reads
+    from it. Bodies are serialized once and shared between clients until
+    their resource changes: standings and state follow the synced
+    rounds, the schedule and weekends their store slices, and per-round
+    data lives for RESULTS_TTL. Each body carries an ETag so a client
+    that already has it gets a bodyless 304. Mock or empty data served in
+    place of a failed request is never kept, and a fallback is answered
+    with 502 so clients go to Ergast themselves rather than trust it.
+    /events is a Server-Sent Events stream announcing every new version,
+    so clients refetch only after a change instead of polling.
+    
+    The server listens on localhost unless given another host, such as
+    0.0.0.0 to serve the local network.
+    """
+    
+    REFRESH_INTERVAL = 60       # Seconds between syncs of the current season
+    SCHEDULE_INTERVAL = 15 * 60  # Seconds between schedule refreshes
+    RESULTS_TTL = 5 * 60        # Seconds a round's results, laps or pit stops are served before being rebuilt
+    BODY_ENTRIES = 256
+    KEEPALIVE = 15              # Seconds between comments on an idle event stream
+    
+    def __init__(self, manager, host='127.0.0.1', port=8765):
+        self.manager = manager
+        self.bodies = OrderedDict()  # Request path and query -> (freshness, ETag, body), least recently used first
+        self.bodies_lock = threading.Lock()
+        self.version = 0
+        self.stamp = self.data_stamp()
+        self.changed = threading.Condition()
+        self.running = False
+        self.httpd = ThreadingHTTPServer((host, port), DataRequestHandler)
+        self.httpd.data_server = self
+    
+    @property
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def serve_forever(self):
+        """Sync in the background and answer requests until shutdown"""
+        self.running = True
+        threading.Thread(target=self.refresh_loop, daemon=True).start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.running = False
+    
+    def shutdown(self):
+        self.running = False
+        with self.changed:
+            self.changed.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def refresh_loop(self):
+        scheduled = 0
+        while self.running:
+            try:
+                self.manager.sync_season()
+                if time.time() - scheduled >= self.SCHEDULE_INTERVAL:
+                    fallbacks = self.manager.metrics.total('fallbacks')
+                    schedule = self.manager._race_schedule(self.manager.current_season)
+                    if self.manager.metrics.total('fallbacks') == fallbacks:  # Mock data isn't published
+                        self.manager.store.put(f"schedule/{self.manager.current_season}", schedule)
+                        scheduled = time.time()
+            except (requests.RequestException, LookupError, TypeError, ValueError):
+                pass  # Ergast unreachable or mid-update, serve what we have and try again later
+            self.publish()
+            time.sleep(self.REFRESH_INTERVAL)
+    
+    def data_stamp(self):
+        """Versions of everything clients are told about, standings and the current schedule"""
+        season = self.manager.current_season
+        store = self.manager.store
+        return self.manager.standings_version, store.version(f"schedule/{season}"), store.version(f"weekends/{season}")
+    
+    def publish(self):
+        """Wake event streams when the manager's standings or schedule have changed"""
+        with self.changed:
+            stamp = self.data_stamp()
+            if stamp != self.stamp:
+                self.stamp = stamp
+                self.version += 1
+                self.changed.notify_all()
+    
+    def freshness(self, path, query):
+        """What a resource's kept body is valid for, it's rebuilt once this moves on"""
+        manager = self.manager
+        season = query.get('season') or manager.current_season
+        if path == '/schedule':
+            return manager.store.version(f"schedule/{season}")
+        if path == '/weekends':
+            # Rebuilding is what refreshes the slice, so a new round is let through too
+            return manager.store.version(f"weekends/{season}"), manager.standings_version
+        if path in ('/results', '/laps', '/pitstops'):
+            return int(time.time() // self.RESULTS_TTL)
+        return manager.standings_version
+    
+    def resource(self, path, query):
+        """Data for a request path, or None when there's no such resource"""
+        manager = self.manager
+        season = query.get('season') or manager.current_season
+        if path == '/standings/drivers':
+            return manager.get_driver_standings(season)
+        if path == '/standings/constructors':
+            return manager.get_constructor_standings(season)
+        if path == '/schedule':
+            return manager.get_race_schedule(season)
+        if path == '/results':
+            return manager.get_race_results(season, int(query.get('round', 0)))
+        if path == '/laps':
+            return manager.get_lap_times(season, int(query.get('round', 0)))
+        if path == '/weekends':
+            manager.prefetch_weekends(season)
+            return manager.session_results.season(season)
+        if path == '/pitstops':
+            return manager.get_pit_stops(season, int(query.get('round', 0)))
+        if path == '/state':
+            # Copied under the lock, a sync may be applying a round to it right now
+            with manager.sync_lock:
+                return copy.deepcopy(manager.season_state(season))
+        if path == '/version':
+            return {'version': self.version}
+        return None
+    
+    def body(self, path, query):
+        """Serialized body and ETag for a request, built once per data version"""
+        if path == '/metrics':
+            # Counters move on every request, so this body is never kept
+            body = json.dumps(self.manager.metrics.snapshot(), separators=(',', ':')).encode('utf-8')
+            return f'"{hashlib.sha1(body).hexdigest()[:20]}"', body
+        
+        key = f"{path}?{urlencode(sorted(query.items()))}"
+        freshness = self.freshness(path, query)
+        with self.bodies_lock:
+            cached = self.bodies.get(key)
+            if cached is not None and cached[0] == freshness:
+                self.bodies.move_to_end(key)
+                return cached[1], cached[2]
+        
+        fallbacks = self.manager.metrics.total('fallbacks')
+        data = self.resource(path, query)
+        if data is None:
+            return None, None
+        if self.manager.metrics.total('fallbacks') != fallbacks:
+            raise requests.ConnectionError(f"No live data for {path}")  # A mock stand-in would reach every client as real
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        if data and path != '/version':
+            with self.bodies_lock:
+                self.bodies[key] = (freshness, etag, body)
+                self.bodies.move_to_end(key)
+                while len(self.bodies) > self.BODY_ENTRIES:
+                    self.bodies.popitem(last=False)
+        return etag, body
+
+class DataRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of DataServer"""
+    
+    server_version = 'F1Hub'
+    protocol_version = 'HTTP/1.1'  # Keeps polling clients' connections open and lets event streams be chunked
+    
+    def do_GET(self):
+        server = self.server.data_server
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        
+        if url.path == '/events':
+            self.stream_events(server)
+            return
+        
+        try:
+            etag, body = server.body(url.path, query)
+        except ValueError:
+            self.send_error(400)
+            return
+        except requests.RequestException:
+            self.send_error(502)
+            return
+        if body is None:
+            self.send_error(404)
+            return
+        
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def stream_events(self, server):
+        """Send the current version, then one event per new version until the client goes away"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        
+        sent = None
+        try:
+            while server.running:
+                with server.changed:
+                    if sent == server.version:
+                        server.changed.wait(server.KEEPALIVE)
+                    version = server.version
+                if version != sent:
+                    self.send_chunk(f"event: update\ndata: {json.dumps({'version': version})}\n\n".encode('utf-8'))
+                    sent = version
+                else:
+                    self.send_chunk(b': keepalive\n\n')
+            self.send_chunk(b'')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+    
+    def send_chunk(self, data):
+        """Write one chunk of a chunked response, an empty one ends it"""
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+    
+    def log_message(self, format, *args):
+        pass  # One line per request would drown the console with many displays polling
+
+# Image atlases: pixel box each kind is scaled to fit, in dp, and the density buckets built for
+ATLAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'atlas')
+ASSET_SIZES = {'teams': 48, 'drivers': 64}
+ASSET_DENSITIES = (('mdpi', 1.0), ('hdpi', 1.5), ('xhdpi', 2.0), ('xxhdpi', 3.0))
+
+def density_bucket(density):
+    """Smallest bucket at least as sharp as the screen, the sharpest one beyond that"""
+    for bucket, scale in ASSET_DENSITIES:
+        if scale >= density - 0.01:
+            return bucket
+    return ASSET_DENSITIES[-1][0]
+
+def asset_id(name):
+    """Atlas key of a team or driver: 'Sergio Pérez' -> 'sergio_perez'"""
+    return '_'.join(re.findall(r'\w+', SearchIndex.normalize(name)))
+
+class AtlasBuilder:
+    """Packs team logos and driver photos into one atlas per kind and density bucket
+    
+    Source images live in <source>/<kind>/ named after the team or driver.
+    Each is scaled once per bucket to fit its kind's box and shelf-packed,
+    tallest first, into pages of at most PAGE_SIZE pixels. The <kind>.atlas
+    index is Kivy's atlas format, page file -> {id: [x, y, w, h]} with y
+    counted from the bottom, so the pages also work as atlas:// sources.
+    """
+    
+    PAGE_SIZE = 1024  # Safe texture size on older mobile GPUs
+    PADDING = 1       # Keeps texture filtering from bleeding into neighbours
+    EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+    
+    def __init__(self, source_dir, output_dir=ATLAS_DIR):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+    
+    def build(self):
+        """Write every kind's atlas for every bucket, returning kind -> images packed"""
+        if PILImage is None:
+            raise ValueError('building atlases needs Pillow')
+        
+        counts = {}
+        for kind, box in ASSET_SIZES.items():
+            sources = self.sources(kind)
+            for bucket, scale in ASSET_DENSITIES:
+                size = round(box * scale)
+                images = [(asset, self.scaled(path, size)) for asset, path in sources]
+                self.write_atlas(os.path.join(self.output_dir, bucket), kind, images)
+            counts[kind] = len(sources)
+        return counts
+    
+    def sources(self, kind):
+        """(asset id, path) of each source image of a kind"""
+        directory = os.path.join(self.source_dir, kind)
+        if not os.path.isdir(directory):
+            return []
+        sources = []
+        for filename in sorted(os.listdir(directory)):
+            stem, extension = os.path.splitext(filename)
+            if extension.lower() in self.EXTENSIONS:
+                sources.append((asset_id(stem), os.path.join(directory, filename)))
+        return sources
+    
+    @staticmethod
+    def scaled(path, size):
+        with PILImage.open(path) as image:
+            image = image.convert('RGBA')
+        image.thumbnail((size, size), PILImage.LANCZOS)
+        return image
+    
+    def pack(self, images):
+        """Pages of (asset, image, x, y) placements, y counted from the top"""
+        pages = []
+        page = None
+        x = y = shelf = 0
+        for asset, image in sorted(images, key=lambda item: (-item[1].height, item[0])):
+            width, height = image.width + self.PADDING, image.height + self.PADDING
+            if page is not None and x + width > self.PAGE_SIZE:
+                x, y, shelf = 0, y + shelf, 0
+            if page is None or y + height > self.PAGE_SIZE:
+                page = []
+                pages.append(page)
+                x = y = shelf = 0
+            page.append((asset, image, x, y))
+            x += width
+            shelf = max(shelf, height)
+        return pages
+    
+    def write_atlas(self, directory, kind, images):
+        os.makedirs(directory, exist_ok=True)
+        index = {}
+        for number, page in enumerate(self.pack(images)):
+            width = max(x + image.width for _, image, x, _ in page)
+            height = max(y + image.height for _, image, _, y in page)
+            sheet = PILImage.new('RGBA', (width, height), (0, 0, 0, 0))
+            regions = {}
+            for asset, image, x, y in page:
+                sheet.paste(image, (x, y))
+                regions[asset] = [x, height - y - image.height, image.width, image.height]
+            
+            filename = f"{kind}-{number}.png"
+            path = os.path.join(directory, filename)
+            sheet.save(path + '.tmp', format='PNG', optimize=True)
+            os.replace(path + '.tmp', path)
+            index[filename] = regions
+        
+        path = os.path.join(directory, f"{kind}.atlas")
+        with open(path + '.tmp', 'w', encoding='utf-8') as handle:
+            json.dump(index, handle, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+
+# Command line
+def command_warm(manager, args):
+    """Write the history archive for past seasons and sync the current one"""
+    last = args.last or int(manager.current_season) - 1
+    started = time.perf_counter()
+    manager.build_history_archive(args.first, last, path=args.archive)
+    print(f"Archived {args.first}-{last} to {args.archive or manager.history_path} in {time.perf_counter() - started:.1f}s")
+    print(f"Synced {manager.sync_season()} new rounds of {manager.current_season}")
+
+def command_sync(manager, args):
+    """Apply the rounds finished since the last sync"""
+    for season in args.seasons or [manager.current_season]:
+        print(f"{season}: {manager.sync_season(str(season))} new rounds")
+
+def command_export(manager, args):
+    """Write a snapshot of the data layer"""
+    started = time.perf_counter()
+    seasons = manager.export_snapshot(args.path, seasons=args.seasons or None)
+    print(f"Exported {len(seasons)} seasons to {args.path} ({os.path.getsize(args.path)} bytes) in {time.perf_counter() - started:.2f}s")
+
+def command_import(manager, args):
+    """Restore a snapshot written by export"""
+    started = time.perf_counter()
+    seasons = manager.import_snapshot(args.path, archive_path=args.archive)
+    print(f"Imported {len(seasons)} seasons from {args.path} in {time.perf_counter() - started:.2f}s")
+
+def command_bench(manager, args):
+    """Time fetching and parsing each current-season endpoint"""
+    season = manager.current_season
+    endpoints = [
+        ('driver standings', f"{manager.base_url}/{season}/driverStandings.json", manager.parse_driver_standings),
+        ('constructor standings', f"{manager.base_url}/{season}/constructorStandings.json", manager.parse_constructor_standings),
+        ('schedule', f"{manager.base_url}/{season}.json", manager.parse_race_schedule),
+        ('race results', f"{manager.base_url}/{season}/1/results.json", manager.parse_race_results)
+    ]
+    
+    print(f"{'endpoint':<24}{'fetch ms':>10}{'size':>10}{'parse ms':>10}{'rows/s':>10}")
+    for name, url, parse in endpoints:
+        started = time.perf_counter()
+        response = manager.fetch(url)
+        response.raise_for_status()
+        fetched = time.perf_counter() - started
+        
+        # Decoding is counted as parsing, it's the bulk of the work
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            rows = parse(response.json())
+        parsed = (time.perf_counter() - started) / args.repeat
+        
+        print(f"{name:<24}{fetched * 1000:>10.1f}{format_bytes(len(response.content)):>10}{parsed * 1000:>10.2f}{len(rows) / parsed if parsed else 0:>10.0f}")
+
+def command_atlas(manager, args):
+    """Pack team logos and driver photos into per-density texture atlases"""
+    started = time.perf_counter()
+    counts = AtlasBuilder(args.source, args.output).build()
+    packed = ', '.join(f"{count} {kind}" for kind, count in counts.items())
+    print(f"Packed {packed} into {args.output} in {time.perf_counter() - started:.2f}s")
+
+def command_prefetch(manager, args):
+    """Run the prefetch that's due now, carrying on from an interrupted run"""
+    worker = PrefetchWorker(manager, os.path.join(manager.data_dir, 'prefetch.json'))
+    plan_id = worker.run_due()
+    print(f"Prefetched {plan_id}" if plan_id else 'Nothing due')
+
+def command_serve(manager, args):
+    """Serve this node's data to other F1 Hub clients"""
+    server = DataServer(manager, args.host, args.port)
+    print(f"Serving on {server.address}, press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+COMMANDS = {
+    'warm': command_warm,
+    'sync': command_sync,
+    'export': command_export,
+    'import': command_import,
+    'bench': command_bench,
+    'prefetch': command_prefetch,
+    'serve': command_serve,
+    'atlas': command_atlas
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='f1_data', description='F1 Hub data service')
+    parser.add_argument('--data-dir', default=os.path.expanduser('~/.f1hub'), help='where synced state and data usage are kept')
+    parser.add_argument('--season', help='season to treat as current')
+    parser.add_argument('--offline', action='store_true', help='answer from local data only')
+    parser.add_argument('--data-saver', action='store_true', help='reuse recent responses without asking')
+    parser.add_argument('--upstream', help='URL of another node\'s data server to read from instead of Ergast')
+    parser.add_argument('--metrics', help='write request counters, latencies and recent errors to this file on exit')
+    parser.add_argument('--series', choices=[series for series, _ in SERIES], default='f1')
+    parser.add_argument('--feed', help='Ergast-compatible feed URL, required for series other than f1')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    warm = commands.add_parser('warm', help=command_warm.__doc__)
+    warm.add_argument('--first', type=int, default=1950)
+    warm.add_argument('--last', type=int, help='defaults to the season before the current one')
+    warm.add_argument('--archive', help='archive path, the bundled data/history.f1a by default')
+    
+    sync = commands.add_parser('sync', help=command_sync.__doc__)
+    sync.add_argument('seasons', nargs='*', type=int)
+    
+    export = commands.add_parser('export', help=command_export.__doc__)
+    export.add_argument('path')
+    export.add_argument('--season', dest='seasons', type=int, action='append', help='repeatable, archived seasons and the current one by default')
+    
+    restore = commands.add_parser('import', help=command_import.__doc__)
+    restore.add_argument('path')
+    restore.add_argument('--archive', help='archive to merge past seasons into, the bundled one by default')
+    
+    bench = commands.add_parser('bench', help=command_bench.__doc__)
+    bench.add_argument('--repeat', type=int, default=50)
+    
+    commands.add_parser('prefetch', help=command_prefetch.__doc__)
+    
+    serve = commands.add_parser('serve', help=command_serve.__doc__)
+    serve.add_argument('--host', default='127.0.0.1', help='address to listen on, 0.0.0.0 to serve the local network')
+    serve.add_argument('--port', type=int, default=8765)
+    
+    atlas = commands.add_parser('atlas', help=command_atlas.__doc__)
+    atlas.add_argument('source', help='directory with teams/ and drivers/ subdirectories of source images')
+    atlas.add_argument('--output', default=ATLAS_DIR, help='the bundled data/atlas by default')
+    
+    args = parser.parse_args(argv)
+    if args.series != 'f1' and not args.feed:
+        parser.error(f"--series {args.series} needs --feed")
+    
+    provider = SeriesProvider(args.series, args.feed) if args.feed else SeriesProvider(args.series)
+    data_dir = args.data_dir if args.series == 'f1' else os.path.join(args.data_dir, args.series)  # Laid out like SeriesHub's
+    manager = F1DataManager(data_dir=data_dir, provider=provider)
+    if args.season:
+        manager.current_season = args.season
+    manager.offline = args.offline
+    manager.data_saver = args.data_saver
+    manager.upstream = args.upstream
+    manager.budget_wait = 60  # Nobody is watching a command, so it waits out the rate limit rather than fail
+    
+    try:
+        COMMANDS[args.command](manager, args)
+    except (requests.RequestException, OSError, ValueError) as error:
+        print(f"{args.command} failed: {error}", file=sys.stderr)
+        return 1
+    finally:
+        manager.budget.save()
+        manager.save_http_cache()
+        if args.metrics:
+            manager.metrics.dump(args.metrics)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+from datetime import date
+
+import pytest
+
+from f1_data import DataSnapshot, F1DataManager, HistoricalArchive
+
+
+def season(year):
+    return {
+        'races': [
+            {'round': 2, 'name': 'São Paulo Grand Prix', 'circuit': 'Interlagos', 'date': date(year, 11, 5), 'sprint': True, 'results': [
+                {'position': 1, 'name': 'Max Verstappen', 'team': 'Red Bull', 'grid': 1, 'laps': 71, 'points': 25, 'status': 'Finished'},
+                {'position': None, 'name': 'Oscar Piastri', 'team': 'McLaren', 'grid': 10, 'laps': 0, 'points': 0, 'status': 'Accident'}
+            ]},
+            {'round': 1, 'name': 'Bahrain Grand Prix', 'circuit': 'Bahrain International Circuit', 'date': date(year, 3, 5), 'sprint': False, 'results': [
+                {'position': 1, 'name': 'Max Verstappen', 'team': 'Red Bull', 'grid': 1, 'laps': 57, 'points': 25.5, 'status': 'Finished'}
+            ]}
+        ],
+        'driver_standings': [
+            {'position': 1, 'name': 'Max Verstappen', 'team': 'Red Bull', 'points': 50.5, 'wins': 2, 'podiums': 2},
+            {'position': 2, 'name': 'Oscar Piastri', 'team': 'McLaren', 'points': 0, 'wins': 0, 'podiums': 0}
+        ],
+        'constructor_standings': [
+            {'position': 1, 'name': 'Red Bull', 'points': 50.5, 'wins': 2}
+        ]
+    }
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / 'history.f1a')
+    HistoricalArchive.build(path, {2021: season(2021), 2019: season(2019)})
+    archive = HistoricalArchive.open(path)
+    yield archive
+    archive.close()
+
+
+def test_archive_round_trip(archive):
+    assert archive.seasons() == [2019, 2021]
+    assert archive.has_season('2021') and not archive.has_season(2020)
+    
+    schedule = archive.get_race_schedule(2021)
+    assert [race['round'] for race in schedule] == [1, 2]
+    assert schedule[1]['name'] == 'São Paulo Grand Prix'
+    assert schedule[1]['sprint'] and not schedule[0]['sprint']
+    assert schedule[1]['date'] == 'Nov 05, 2021'
+    assert schedule[1]['winner'] == 'Max Verstappen'
+    
+    results = archive.get_race_results(2021, 2)
+    assert results[1] == {'position': None, 'name': 'Oscar Piastri', 'team': 'McLaren', 'grid': 10, 'laps': 0, 'points': 0, 'status': 'Accident'}
+    assert archive.get_race_results(2021, 3) == []
+    
+    assert archive.get_driver_standings(2019)[0]['points'] == 50.5
+    assert archive.get_constructor_standings(2019) == [{'position': 1, 'name': 'Red Bull', 'points': 50.5, 'wins': 2}]
+
+
+def test_archive_season_data_rebuilds_the_same_archive(archive, tmp_path):
+    path = str(tmp_path / 'copy.f1a')
+    HistoricalArchive.build(path, {2021: archive.season_data(2021)})
+    copy = HistoricalArchive.open(path)
+    try:
+        assert copy.get_race_schedule(2021) == archive.get_race_schedule(2021)
+        assert copy.get_race_results(2021, 2) == archive.get_race_results(2021, 2)
+        assert copy.get_driver_standings(2021) == archive.get_driver_standings(2021)
+    finally:
+        copy.close()
+
+
+def test_open_rejects_missing_and_foreign_files(tmp_path):
+    assert HistoricalArchive.open(str(tmp_path / 'missing.f1a')) is None
+    other = tmp_path / 'other.f1a'
+    other.write_bytes(b'not an archive' * 10)
+    assert HistoricalArchive.open(str(other)) is None
+
+
+def test_snapshot_table_round_trip():
+    rows = [{'round': 1, 'name': 'Pérez', 'points': 12.5, 'sprint': True}, {'round': 2, 'name': 'Pérez', 'points': 3, 'sprint': False}]
+    decoded = DataSnapshot.decode_table(DataSnapshot.encode_table(('round', 'name', 'points', 'sprint'), rows))
+    assert decoded == rows
+    assert DataSnapshot.decode_table(DataSnapshot.encode_table(('round',), [])) == []
+
+
+def test_snapshot_season_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataSnapshot, 'CHUNK_ROWS', 1)  # Every row in a chunk of its own
+    path = str(tmp_path / 'export.f1s')
+    DataSnapshot.write(path, DataSnapshot.season_chunks(2021, season(2021)))
+    
+    restored = {'races': [], 'driver_standings': [], 'constructor_standings': []}
+    for tag, year, payload in DataSnapshot.read(path):
+        assert year == 2021
+        DataSnapshot.add_rows(restored, tag, payload)
+    
+    original = season(2021)
+    for race in original['races']:
+        for result in race['results']:
+            result['position'] = result['position'] or 0
+    assert sorted(restored['races'], key=lambda race: race['round']) == sorted(original['races'], key=lambda race: race['round'])
+    assert restored['driver_standings'] == original['driver_standings']
+    assert restored['constructor_standings'] == original['constructor_standings']
+
+
+def test_snapshot_read_rejects_damage(tmp_path):
+    path = str(tmp_path / 'export.f1s')
+    DataSnapshot.write(path, DataSnapshot.season_chunks(2021, season(2021)))
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    
+    truncated = tmp_path / 'truncated.f1s'
+    truncated.write_bytes(data[:-DataSnapshot.CHUNK.size])
+    with pytest.raises(ValueError):
+        list(DataSnapshot.read(str(truncated)))
+    
+    foreign = tmp_path / 'foreign.f1s'
+    foreign.write_bytes(b'F1HA' + data[4:])
+    with pytest.raises(ValueError):
+        list(DataSnapshot.read(str(foreign)))
+
+
+def test_manager_export_import(tmp_path):
+    source = F1DataManager(data_dir=str(tmp_path / 'source'))
+    source.history = None
+    source.season_data = lambda year: season(int(year))
+    state = source.season_state(source.current_season)
+    state['last_round'] = 1
+    state['drivers']['max_verstappen'] = {'name': 'Max Verstappen', 'team': 'Red Bull', 'points': 25, 'wins': 1, 'podiums': 1}
+    source.record_timing('2023-1-race', [{'pos': 1, 'driver': 'VER', 'gap': 'Leader', 'last_lap': '1:35.000', 'best_lap': '1:35.000'}], now=10.0)
+    path = str(tmp_path / 'export.f1s')
+    assert source.export_snapshot(path, seasons=[2021, 2023]) == [2021, 2023]
+    
+    target = F1DataManager(data_dir=str(tmp_path / 'target'))
+    target.history = None
+    assert target.import_snapshot(path, archive_path=str(tmp_path / 'merged.f1a')) == [2021, 2023]
+    assert target.season_state('2023') == state
+    assert target.history.get_race_results(2021, 1)[0]['name'] == 'Max Verstappen'
+    assert not target.history.has_season(2023)  # The current season stays synced state only
+    assert target.timing_recordings['2023-1-race'][0]['t'] == 10.0
+    target.history.close()
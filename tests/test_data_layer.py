@@ -0,0 +1,117 @@
+import time
+
+import pytest
+import requests
+
+from f1_data import DataServer, DataStore, F1DataManager, RequestBudget
+
+
+def test_request_budget_bursts_then_refills(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(time, 'sleep', lambda seconds: clock.__setitem__(0, clock[0] + seconds))
+    
+    budget = RequestBudget(2, 3600)  # One token a second
+    assert budget.acquire(0) and budget.acquire(0)
+    assert not budget.acquire(0)
+    assert not budget.acquire(0.5)
+    assert budget.acquire(1)
+    assert clock[0] == pytest.approx(1001.0)
+    
+    clock[0] += 100
+    assert budget.tokens <= budget.burst
+    assert budget.acquire(0) and budget.acquire(0) and not budget.acquire(0)
+
+
+def test_fetch_fails_fast_over_budget():
+    manager = F1DataManager()
+    manager.request_budget = RequestBudget(1, 1)
+    manager.request_budget.tokens = 0
+    
+    started = time.monotonic()
+    with pytest.raises(requests.ConnectionError):
+        manager.fetch(f"{manager.base_url}/2023.json")
+    assert time.monotonic() - started < 1
+    assert sum(manager.metrics.counters['throttled'].values()) == 1
+
+
+def test_data_store_delivers_each_change_once_per_flush():
+    flushes = []
+    store = DataStore(schedule_flush=lambda: flushes.append(1))
+    seen = []
+    store.subscribe('a', seen.append)
+    
+    assert store.put('a', 1) and store.put('a', 2)
+    assert not store.put('a', 2)
+    assert store.put('b', 1)
+    assert len(flushes) == 1 and store.version('a') == 2
+    
+    store.flush()
+    assert seen == [2]
+    store.flush()
+    assert seen == [2]
+    
+    late = []
+    store.subscribe('a', late.append, call_now=True)
+    assert late == [2]
+    store.unsubscribe('a', seen.append)
+    store.put('a', 3)
+    store.flush()
+    assert seen == [2] and late == [2, 3]
+
+
+@pytest.fixture
+def server():
+    manager = F1DataManager()
+    manager.history = None
+    server = DataServer(manager, port=0)
+    yield server
+    server.httpd.server_close()
+
+
+def test_server_reuses_a_body_until_its_data_changes(server):
+    server.manager.get_race_results = lambda season, round_number: [{'round': round_number}]
+    etag, body = server.body('/results', {'round': '2'})
+    assert body == b'[{"round":2}]'
+    assert server.body('/results', {'round': '2'}) == (etag, body)
+    assert server.body('/missing', {}) == (None, None)
+
+
+def test_server_binds_to_localhost(server):
+    assert server.address.startswith('http://127.0.0.1:')
+
+
+def test_server_rebuilds_a_body_when_its_resource_changes(server):
+    manager = server.manager
+    schedule = [{'round': 1}]
+    manager._race_schedule = lambda season: list(schedule)
+    manager.get_race_schedule()
+    
+    etag, body = server.body('/schedule', {})
+    schedule.append({'round': 2})
+    assert server.body('/schedule', {}) == (etag, body)  # Kept until the store says the schedule moved
+    
+    version = server.version
+    manager.get_race_schedule()
+    server.publish()
+    assert server.version == version + 1
+    assert server.body('/schedule', {})[0] != etag
+
+
+def test_server_never_keeps_fallbacks_or_empty_bodies(server):
+    manager = server.manager
+    manager.offline = True  # Every Ergast request fails, the getters fall back to mock data
+    with pytest.raises(requests.ConnectionError):
+        server.body('/schedule', {})
+    
+    manager.get_race_results = lambda season, round_number: []
+    assert server.body('/results', {'round': '3'})[1] == b'[]'
+    assert server.bodies == {}
+
+
+def test_server_keeps_a_bounded_number_of_bodies(server, monkeypatch):
+    monkeypatch.setattr(DataServer, 'BODY_ENTRIES', 3)
+    server.manager.get_race_results = lambda season, round_number: [{'round': round_number}]
+    for round_number in range(1, 6):
+        server.body('/results', {'round': str(round_number)})
+    assert list(server.bodies) == [f"/results?round={round_number}" for round_number in (3, 4, 5)]
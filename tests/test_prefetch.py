@@ -0,0 +1,27 @@
+import pytest
+
+from f1_data import F1DataManager, PrefetchWorker
+
+
+class Stop(Exception):
+    pass
+
+
+def test_prefetch_thread_backs_off_through_task_errors():
+    manager = F1DataManager()
+    manager.history = None
+    worker = PrefetchWorker(manager)
+    worker.checkpoint.update(tasks=[['get_race_schedule', '2023']], done=0)
+    worker.run_due = lambda: {}['missing']  # A task error the old except clause didn't list
+    
+    delays = []
+    def wait(delay):
+        delays.append(delay)
+        if len(delays) == 6:
+            raise Stop
+    worker.wake.wait = wait
+    
+    with pytest.raises(Stop):
+        worker.run()
+    assert delays == [300, 600, 1200, 2400, 4800, PrefetchWorker.RETRY_LIMIT]
+    assert manager.metrics.counters['prefetch_errors'] == {'prefetch/get_race_schedule': 6}
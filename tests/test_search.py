@@ -0,0 +1,48 @@
+from f1_data import SearchIndex
+
+
+def index():
+    search = SearchIndex()
+    search.add('driver:perez', 'driver', 'Sergio Pérez', 'Red Bull Racing', subtitle='Red Bull')
+    search.add('driver:hulkenberg', 'driver', 'Nico Hülkenberg', 'Haas')
+    search.add('race:sao_paulo', 'race', 'São Paulo Grand Prix', 'Interlagos')
+    search.add('news:1', 'news', 'Upgrades for Red Bull', 'Perez expects progress in São Paulo')
+    return search
+
+
+def ids(results):
+    return [result['id'] for result in results]
+
+
+def test_accents_are_folded_both_ways():
+    search = index()
+    assert ids(search.search('perez', kinds={'driver'})) == ['driver:perez']
+    assert ids(search.search('PÉREZ', kinds={'driver'})) == ['driver:perez']
+    assert ids(search.search('hulk')) == ['driver:hulkenberg']
+    assert ids(search.search('sao paulo', kinds={'race'})) == ['race:sao_paulo']
+
+
+def test_title_hits_rank_first_and_every_word_must_match():
+    search = index()
+    assert ids(search.search('perez')) == ['driver:perez', 'news:1']
+    assert ids(search.search('red bull upgrades')) == ['news:1']
+    assert search.search('perez haas') == []
+
+
+def test_short_prefixes_only_match_whole_words():
+    search = index()
+    search.add('team:x', 'team', 'X Racing')
+    assert ids(search.search('x')) == ['team:x']
+    assert search.search('s') == []
+
+
+def test_reindex_and_remove_drop_old_terms():
+    search = index()
+    search.add('driver:perez', 'driver', 'Checo', 'Racing Point')
+    assert ids(search.search('sergio')) == []
+    assert ids(search.search('checo')) == ['driver:perez']
+    
+    search.remove('driver:hulkenberg')
+    assert search.search('hulkenberg') == []
+    assert 'hulkenberg' not in search.postings
+    assert search.search('   ') == []
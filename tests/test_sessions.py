@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from f1_data import AlertQueue, SessionClock, format_countdown, parse_utc
+
+
+def weekend(round_number, race_start, sprint=False):
+    start = parse_utc(race_start)
+    sessions = [('FP1', -50), ('Qualifying', -25), ('Race', 0)]
+    if sprint:
+        sessions.insert(2, ('Sprint', -20))
+    return {
+        'round': round_number,
+        'name': f"Round {round_number} Grand Prix",
+        'circuit': 'Circuit',
+        'sessions': [{'name': name, 'start': (start + timedelta(hours=hours)).isoformat()} for name, hours in sessions]
+    }
+
+
+@pytest.mark.parametrize('seconds, text, tick', [
+    (0, 'Live now', None),
+    (-5, 'Live now', None),
+    (59, '00:59', 1),
+    (3600 + 61, '1h 01m', 2),
+    (86400 + 3600, '25h 00m', 1),
+    (3 * 86400 + 10, '3 days to go', 11),
+])
+def test_format_countdown(seconds, text, tick):
+    assert format_countdown(seconds) == (text, tick)
+
+
+def test_parse_utc():
+    assert parse_utc('2023-11-26T13:00:00Z') == datetime(2023, 11, 26, 13, tzinfo=timezone.utc)
+    assert parse_utc('2023-11-26T14:00:00+01:00') == datetime(2023, 11, 26, 13, tzinfo=timezone.utc)
+    assert parse_utc('2023-11-26T13:00:00').tzinfo == timezone.utc
+
+
+def test_session_clock_orders_and_finds_sessions():
+    clock = SessionClock([weekend(2, '2023-03-19T17:00:00Z', sprint=True), weekend(1, '2023-03-05T15:00:00Z')])
+    assert [session['start'] for session in clock.sessions] == sorted(session['start'] for session in clock.sessions)
+    
+    before = parse_utc('2023-03-01T00:00:00Z')
+    assert clock.next_session(before)['name'] == 'FP1'
+    assert clock.next_session(before, names={'Race'})['round'] == 1
+    
+    # A race that started an hour ago is still live
+    live = clock.next_session(parse_utc('2023-03-05T16:00:00Z'))
+    assert (live['name'], live['round']) == ('Race', 1)
+    
+    assert [session['name'] for session in clock.upcoming(parse_utc('2023-03-06T00:00:00Z'), limit=2)] == ['FP1', 'Qualifying']
+    assert clock.next_session(parse_utc('2024-01-01T00:00:00Z')) is None
+
+
+def test_alert_queue_plans_once_and_expires(tmp_path):
+    path = str(tmp_path / 'alerts.json')
+    clock = SessionClock([weekend(1, '2023-03-05T15:00:00Z')])
+    now = parse_utc('2023-03-01T00:00:00Z').timestamp()
+    start = parse_utc('2023-03-05T15:00:00Z').timestamp()
+    
+    queue = AlertQueue(path)
+    assert queue.plan(clock.sessions, now) == 2
+    assert queue.plan(clock.sessions, now) == 0  # Re-planning never queues the same alert twice
+    assert queue.next_due() == start - AlertQueue.RACE_START_LEAD
+    queue.save()
+    
+    restored = AlertQueue(path)
+    due = restored.pop_due(start - 60)
+    assert [key for key, _ in due] == ['2023:1:race_start']
+    assert restored.plan(clock.sessions, now) == 0  # Fired alerts aren't planned again either
+    
+    # A start alert the app slept through is dropped once the race has started
+    late = AlertQueue()
+    late.plan(clock.sessions, now)
+    assert late.pop_due(start + 60) == []
+
+
+def test_alert_queue_retry_requeues_a_fired_alert():
+    queue = AlertQueue()
+    queue.push(10, 'results', {'attempt': 0})
+    assert queue.pop_due(10) == [('results', {'attempt': 0})]
+    assert not queue.push(20, 'results', {'attempt': 1})
+    assert queue.retry(20, 'results', {'attempt': 1})
+    assert queue.pop_due(20) == [('results', {'attempt': 1})]
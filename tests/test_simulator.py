@@ -0,0 +1,64 @@
+import pytest
+
+import f1_data
+from f1_data import FASTEST_LAP_POINTS, RACE_POINTS, SPRINT_POINTS, ChampionshipSimulator
+
+
+def standings(*points):
+    return [{'name': f"Driver {i}", 'points': p, 'wins': 0} for i, p in enumerate(points)]
+
+
+def schedule(completed, upcoming, sprints=()):
+    rounds = [{'round': r, 'status': 'completed'} for r in range(1, completed + 1)]
+    rounds += [{'round': r, 'status': 'upcoming', 'sprint': r in sprints} for r in range(completed + 1, completed + upcoming + 1)]
+    return rounds
+
+
+def test_max_points_counts_sprints_fastest_laps_and_cars():
+    simulator = ChampionshipSimulator()
+    remaining = simulator.remaining_rounds(schedule(20, 2, sprints=(21,)))
+    assert simulator.max_points_available(remaining) == 2 * (RACE_POINTS[0] + FASTEST_LAP_POINTS) + SPRINT_POINTS[0]
+    assert simulator.max_points_available(remaining, cars=2) == 2 * (sum(RACE_POINTS[:2]) + FASTEST_LAP_POINTS) + sum(SPRINT_POINTS[:2])
+
+
+def test_elimination_and_clinch():
+    simulator = ChampionshipSimulator(simulations=200, seed=1)
+    table = simulator.simulate(standings(300, 290, 200), [], schedule(20, 2))['drivers']
+    assert [entry['eliminated'] for entry in table['entries']] == [False, False, True]
+    assert not table['clinched']
+    assert table['clinch_margin'] == 17  # Then P2 is more than one race weekend's points behind
+    
+    clinched = simulator.simulate(standings(300, 270), [], schedule(20, 1))['drivers']
+    assert clinched['clinched']
+    assert clinched['entries'][0]['probability'] == 1.0
+
+
+def test_eliminated_entries_have_no_chance_and_odds_add_up():
+    simulator = ChampionshipSimulator(simulations=500, seed=3)
+    entries = simulator.simulate(standings(200, 190, 150, 40), [], schedule(18, 4))['drivers']['entries']
+    assert entries[3]['eliminated'] and entries[3]['probability'] == 0.0
+    assert abs(sum(entry['probability'] for entry in entries) - 1.0) < 1e-6
+
+
+@pytest.mark.skipif(f1_data.np is None, reason='the pure Python fallback runs too few simulations to see it')
+def test_fastest_lap_point_is_simulated():
+    # Equal form over an eleven car field: the second driver only draws level by winning with the fastest lap
+    simulator = ChampionshipSimulator(simulations=20000, form_exponent=0.0, seed=7)
+    entry = simulator.simulate(standings(26, *[0] * 10), [], schedule(21, 1))['drivers']['entries'][1]
+    assert not entry['eliminated']
+    assert entry['probability'] > 0.0
+
+
+def test_pure_python_simulation(monkeypatch):
+    monkeypatch.setattr(f1_data, 'np', None)
+    simulator = ChampionshipSimulator(simulations=200, seed=5)
+    entries = simulator.simulate(standings(200, 190, 40), [], schedule(18, 4))['drivers']['entries']
+    assert entries[2]['probability'] == 0.0
+    assert abs(sum(entry['probability'] for entry in entries) - 1.0) < 1e-6
+
+
+def test_results_are_cached_until_the_standings_change():
+    simulator = ChampionshipSimulator(simulations=50, seed=1)
+    first = simulator.simulate(standings(100, 90), [], schedule(10, 5))
+    assert simulator.simulate(standings(100, 90), [], schedule(10, 5)) is first
+    assert simulator.simulate(standings(100, 95), [], schedule(10, 5)) is not first
@@ -0,0 +1,265 @@
+import json
+
+import pytest
+import requests
+
+from f1_data import F1DataManager, RequestBudget, SessionResults, SyncIncomplete
+
+
+def result(position, driver, points, status='Finished', position_text=None, team='red_bull', grid=None, fastest=False):
+    row = {
+        'position': str(position),
+        'positionText': position_text or str(position),
+        'points': str(points),
+        'status': status,
+        'grid': str(grid if grid is not None else position),
+        'Driver': {'driverId': driver, 'givenName': driver.title(), 'familyName': 'Driver'},
+        'Constructor': {'constructorId': team, 'name': team.replace('_', ' ').title()}
+    }
+    if fastest:
+        row['FastestLap'] = {'rank': '1'}
+    return row
+
+
+@pytest.fixture
+def manager():
+    manager = F1DataManager()
+    manager.history = None
+    manager._upstream = lambda *args, **kwargs: None
+    return manager
+
+
+@pytest.fixture
+def ergast(manager, monkeypatch):
+    """Fake Ergast answering from rounds[round] = (race results, sprint results), recording every request
+    
+    Requests go through the manager's fetch and request budget. Rounds
+    with race results are in the past, the round after them is still to
+    come.
+    """
+    rounds = {}
+    requested = []
+    failing = set()  # Paths that can't be reached
+    season = manager.current_season
+    
+    def races(path):
+        parts = path.split('/')
+        if parts == [f"{season}.json"]:
+            schedule = []
+            for round_number in range(1, max(rounds, default=0) + 2):
+                race, sprint = rounds.get(round_number, ([], []))
+                schedule.append({'round': str(round_number), 'date': '2023-03-05' if race else '2099-03-05'})
+                if sprint:
+                    schedule[-1]['Sprint'] = {'date': '2023-03-04'}
+            return schedule
+        key, index = ('Results', 0) if parts[-1] == 'results.json' else ('SprintResults', 1)
+        wanted = [int(parts[1])] if len(parts) == 3 else sorted(rounds)
+        return [{'round': str(n), key: rounds[n][index]} for n in wanted if n in rounds and rounds[n][index]]
+    
+    def get(url, params=None, timeout=None, headers=None):
+        path = url.split(f"{manager.base_url}/", 1)[1]
+        requested.append(path)
+        if path in failing:
+            raise requests.ConnectionError(f"{url} unreachable")
+        data = races(path)
+        response = requests.Response()
+        response.status_code = 200
+        response.encoding = 'utf-8'
+        response._content = json.dumps({'MRData': {'total': str(len(data)), 'RaceTable': {'Races': data}}}).encode('utf-8')
+        return response
+    
+    monkeypatch.setattr(requests, 'get', get)
+    return rounds, requested, failing
+
+
+def test_apply_round_results_and_standings(manager):
+    state = manager.season_state('2023')
+    manager.apply_round_results(state, 1, [
+        result(1, 'max', 26, grid=1, fastest=True),
+        result(2, 'lando', 18, team='mclaren'),
+        result(3, 'sergio', 15, status='+1 Lap'),
+        result(4, 'lewis', 0, status='Lapped', team='mercedes'),
+        result(5, 'oscar', 0, status='Gearbox', position_text='R', team='mclaren'),
+        result(6, 'george', 0, status='Disqualified', position_text='D', team='mercedes')
+    ])
+    manager.apply_round_results(state, 1, [result(1, 'lando', 8, team='mclaren'), result(2, 'max', 7)], sprint=True)
+    
+    stats = state['stats']
+    assert stats['races'] == 1
+    assert stats['dnfs'] == 1  # Lapped and disqualified cars aren't retirements
+    assert stats['winners'] == ['max']  # Sprint wins don't count
+    assert stats['poles'] == {'max': 1} and stats['fastest_laps'] == {'max': 1}
+    assert state['drivers']['lando']['wins'] == 0 and state['drivers']['lando']['podiums'] == 1
+    assert state['rounds']['1'] == {'max': 33.0, 'lando': 26.0, 'sergio': 15.0, 'lewis': 0.0, 'oscar': 0.0, 'george': 0.0}
+    
+    drivers = manager.standings_from_state(state, 'drivers')
+    assert [(row['position'], row['name'], row['points']) for row in drivers[:3]] == [
+        (1, 'Max Driver', 33), (2, 'Lando Driver', 26), (3, 'Sergio Driver', 15)
+    ]
+    assert isinstance(drivers[0]['points'], int)
+    constructors = manager.standings_from_state(state, 'constructors')
+    assert [(row['name'], row['points'], row['wins']) for row in constructors] == [
+        ('Red Bull', 48, 1), ('Mclaren', 26, 0), ('Mercedes', 0, 0)
+    ]
+
+
+def test_sync_folds_in_sprints(manager, ergast):
+    rounds, requested, _ = ergast
+    rounds[1] = ([result(1, 'max', 25), result(2, 'lando', 18)], [])
+    rounds[2] = ([result(1, 'lando', 25), result(2, 'max', 18)], [result(1, 'max', 8), result(2, 'lando', 7)])
+    
+    # Catching up takes the season's races and sprints in one request each
+    assert manager.sync_season() == 2
+    assert requested == ['2023/1/results.json', '2023.json', '2023/results.json', '2023/sprint.json']
+    drivers = {row['name']: row['points'] for row in manager.standings_from_state(manager.season_state('2023'), 'drivers')}
+    assert drivers == {'Max Driver': 51, 'Lando Driver': 50}
+    
+    # Nothing new costs one empty results request
+    requested.clear()
+    assert manager.sync_season() == 0
+    assert requested == ['2023/3/results.json']
+    
+    # One new round asks for its sprint only when the schedule lists one
+    rounds[3] = ([result(1, 'max', 25)], [result(1, 'max', 8)])
+    requested.clear()
+    assert manager.sync_season() == 1
+    assert requested == ['2023/3/results.json', '2023.json', '2023/3/sprint.json']
+    rounds[4] = ([result(1, 'lando', 25)], [])
+    requested.clear()
+    assert manager.sync_season() == 1
+    assert requested == ['2023/4/results.json', '2023.json']
+    assert manager.season_state('2023')['drivers']['max']['points'] == 84
+
+
+def test_first_sync_of_a_long_season_stays_within_the_request_budget(manager, ergast):
+    rounds, requested, _ = ergast
+    for round_number in range(1, 23):
+        rounds[round_number] = ([result(1, 'max', 25)], [result(1, 'max', 8)] if round_number % 4 == 0 else [])
+    
+    assert manager.budget_wait == 0 and manager.request_budget.burst < 2 * len(rounds)
+    assert manager.sync_season() == 22
+    assert len(requested) == 4
+    assert manager.season_state('2023')['drivers']['max']['points'] == 22 * 25 + 5 * 8
+
+
+def test_one_refresh_syncs_once(manager, ergast):
+    rounds, requested, _ = ergast
+    rounds[1] = ([result(1, 'max', 25)], [])
+    
+    manager.get_driver_standings()
+    manager.get_constructor_standings()
+    assert requested == ['2023/1/results.json', '2023.json']
+    assert manager.store.get('standings/constructors/2023')[0]['name'] == 'Red Bull'
+    
+    manager.synced_at.clear()
+    manager.get_driver_standings()
+    assert requested[2:] == ['2023/2/results.json']
+
+
+def test_sync_cut_short_by_the_request_budget_is_incomplete(manager, ergast):
+    rounds, requested, _ = ergast
+    for round_number in range(1, 23):
+        rounds[round_number] = ([result(1, 'max', 25)], [result(1, 'max', 8)] if round_number % 4 == 0 else [])
+    
+    manager.request_budget = RequestBudget(3, 1)  # One request short of a first sync, with next to no refill
+    with pytest.raises(SyncIncomplete):
+        manager.sync_season()
+    assert len(requested) == 3
+    assert manager.season_state('2023')['last_round'] == 0 and '2023' not in manager.synced_at
+    assert manager.get_driver_standings()[0]['name'] != 'Max Driver'  # Nothing synced is published
+    
+    manager.request_budget = RequestBudget(40, 500)
+    assert manager.sync_season() == 22
+    assert manager.sync_season() == 0
+    
+    # The refused check for round 23 is answered with the cached empty one, which isn't "nothing new"
+    rounds[23] = ([result(1, 'lando', 25)], [])
+    manager.request_budget.tokens = 0
+    with pytest.raises(SyncIncomplete):
+        manager.sync_season()
+    assert manager.season_state('2023')['last_round'] == 22
+
+
+def test_a_failed_sync_leaves_the_last_complete_standings(manager, ergast):
+    rounds, _, _ = ergast
+    rounds[1] = ([result(1, 'max', 25), result(2, 'lando', 18)], [])
+    manager.sync_season()
+    version = manager.standings_version
+    
+    rounds[2] = ([result(1, 'lando', 25), result(2, 'max', 18)], [])
+    rounds[3] = ([{'position': '1', 'points': '25'}], [])  # Applying it fails once round 2 is in
+    with pytest.raises(KeyError):
+        manager.sync_season()
+    assert manager.season_state('2023')['last_round'] == 1
+    assert manager.standings_version == version
+    
+    manager.synced_at.clear()
+    drivers = manager.get_driver_standings()
+    assert [(row['name'], row['points']) for row in drivers] == [('Max Driver', 25), ('Lando Driver', 18)]
+    assert manager.metrics.total('sync_errors') == 1
+
+
+def test_standings_come_from_the_endpoint_until_a_sync_completes(manager, ergast):
+    rounds, requested, failing = ergast
+    rounds[1] = ([result(1, 'max', 25)], [])
+    rounds[2] = ([result(1, 'lando', 25)], [result(1, 'lando', 8)])
+    failing.add('2023/sprint.json')
+    
+    manager.get_driver_standings()
+    assert requested[-1] == '2023/driverStandings.json'
+    assert manager.season_state('2023')['drivers'] == {}
+
+
+def test_sync_state_survives_a_restart(tmp_path, ergast, manager):
+    rounds, _, _ = ergast
+    rounds[1] = ([result(1, 'max', 25)], [])
+    manager.data_dir = str(tmp_path)
+    manager.sync_season()
+    
+    restarted = F1DataManager(data_dir=str(tmp_path))
+    assert restarted.season_state('2023')['last_round'] == 1
+    assert restarted.season_state('2023')['drivers']['max']['points'] == 25
+
+
+def test_strategy_is_kept_only_once_timings_are_complete(manager):
+    laps = [{'lap': 1, 'driver': 'VER', 'position': 1, 'time': '1:35.000'}]
+    stops = []
+    manager.get_lap_times = lambda season, round_number: laps
+    manager.get_pit_stops = lambda season, round_number: stops
+    manager.get_race_results = lambda season, round_number: [{'laps': 2}]
+    
+    manager.get_strategy('2023', 1)
+    assert manager.strategy_cache == {}
+    
+    laps.append({'lap': 2, 'driver': 'VER', 'position': 1, 'time': '1:59.000'})
+    stops.append({'driver': 'VER', 'lap': 1, 'stop': 1, 'duration': 22.0})
+    analysis = manager.get_strategy('2023', 1)
+    assert manager.get_strategy(2023, '1') is analysis
+
+
+def qualifying_row(position, code, q1, q2='', q3=''):
+    return {'position': position, 'code': code, 'name': code, 'team': 'Team', 'q1': q1, 'q2': q2, 'q3': q3}
+
+
+def test_qualifying_gaps_and_cutoffs():
+    rows = [qualifying_row(1, 'VER', '1:30.000', '1:29.500', '1:29.800')]
+    rows += [qualifying_row(position, f"Q3{position}", '1:29.000', f"1:29.{900 + position}", '1:30.000') for position in range(2, 11)]
+    rows += [qualifying_row(position, f"Q2{position}", '1:30.100', f"1:30.{position:03d}") for position in range(11, 16)]
+    rows += [qualifying_row(position, f"Q1{position}", f"1:31.{position:03d}") for position in range(16, 21)]
+    
+    record = SessionResults().add('2023', 1, SessionResults.QUALIFYING, list(reversed(rows)))
+    by_code = {row['code']: row for row in record['rows']}
+    assert [row['position'] for row in record['rows']] == list(range(1, 21))
+    
+    # A quick Q1 lap doesn't give a negative gap, each gap is within the part the driver last ran
+    assert by_code['VER']['gap'] == 0.0 and by_code['VER']['gap_part'] == 'Q3'
+    assert by_code['Q32']['gap'] == pytest.approx(0.2) and by_code['Q32']['gap_part'] == 'Q3'
+    assert by_code['Q211']['gap_part'] == 'Q2' and by_code['Q211']['gap'] == pytest.approx(0.511)
+    assert by_code['Q116']['gap_part'] == 'Q1' and by_code['Q116']['gap'] == pytest.approx(2.016)
+    assert all(row['gap'] >= 0 for row in record['rows'])
+    
+    assert by_code['Q116']['knocked_out'] == 'Q1' and by_code['Q211']['knocked_out'] == 'Q2'
+    assert by_code['VER']['knocked_out'] is None
+    assert record['cutoffs']['Q1']['position'] == 15
+    assert record['cutoffs']['Q2']['driver'] == 'Q310'
+    assert record['cutoffs']['Q2']['margin'] == pytest.approx(0.101)
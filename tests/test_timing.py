@@ -0,0 +1,117 @@
+import pytest
+
+import f1_data
+from f1_data import RaceTimeline, StrategyAnalysis, format_lap_time, lttb, parse_lap_time, project_rejoin
+
+
+def laps_of(driver, times):
+    return [{'lap': lap, 'driver': driver, 'position': 0, 'time': format_lap_time(seconds)} for lap, seconds in enumerate(times, 1)]
+
+
+def test_lap_time_text_round_trip():
+    assert parse_lap_time('1:24.567') == pytest.approx(84.567)
+    assert parse_lap_time('22.5') == 22.5
+    assert parse_lap_time('DNF') is None
+    assert format_lap_time(84.567) == '1:24.567'
+    assert format_lap_time(9.5) == '9.500'
+
+
+def test_timeline_frames():
+    timeline = RaceTimeline(laps_of('VER', [90, 90, 90]) + laps_of('HAM', [91, 91, 91]) + laps_of('SAR', [150, 130]))
+    assert timeline.lap_count == 3
+    assert timeline.leader_crossings == [90, 180, 270]
+    assert timeline.duration == 280
+    assert timeline.time_at_lap(2) == 180 and timeline.time_at_lap(0) == 0.0
+    assert timeline.leader_lap(185) == 2
+    
+    frame = timeline.frame_at(185)
+    assert [(row['driver'], row['gap']) for row in frame] == [('VER', 'Leader'), ('HAM', '+2.000'), ('SAR', '+60.000')]
+    assert frame[0]['progress'] == pytest.approx(2 + 5 / 90)
+    
+    # SAR finishes a lap down
+    end = timeline.frame_at(280)
+    assert end[2]['gap'] == '+1 Lap'
+    assert end[0]['best_lap'] == '1:30.000'
+    assert timeline.lap_series(100)[0] == {'name': 'VER', 'points': [(1, 90.0)]}
+
+
+def test_timeline_stops_a_driver_at_a_missing_lap():
+    laps = laps_of('VER', [90, 90, 90])
+    del laps[1]
+    assert RaceTimeline(laps).lap_count == 1
+
+
+def test_timeline_from_recording():
+    frames = [
+        {'t': 1, 'driver': 'VER', 'last_lap': ''},
+        {'t': 2, 'driver': 'VER', 'last_lap': '1:30.000'},
+        {'t': 3, 'driver': 'VER', 'last_lap': '1:30.000'},
+        {'t': 4, 'driver': 'VER', 'last_lap': '1:29.000'}
+    ]
+    assert RaceTimeline.from_recording(frames).drivers['VER'][1] == [90.0, 89.0]
+
+
+def race():
+    # Both drivers lap at 90s; VER runs a second behind, stops first and jumps HAM on fresh tyres
+    ver = [90.0] * 10
+    ham = [90.0] * 10
+    ver[3] += 10
+    ver[4] += 8
+    ham[5] += 10
+    ham[6] += 10
+    ver[0] += 1.0  # VER starts a second behind
+    for lap in range(5, 10):
+        ver[lap] -= 0.5  # Fresh tyres
+    laps = laps_of('VER', ver) + laps_of('HAM', ham)
+    stops = [{'driver': 'VER', 'lap': 4, 'stop': 1, 'duration': 22.0}, {'driver': 'HAM', 'lap': 6, 'stop': 1, 'duration': 23.0}]
+    return laps, stops
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_strategy_analysis(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(f1_data, 'np', None)
+    elif f1_data.np is None:
+        pytest.skip('numpy is not installed')
+    analysis = StrategyAnalysis(*race())
+    
+    ver = analysis.driver_stints('VER')
+    assert [(stint['stint'], stint['start'], stint['laps']) for stint in ver] == [(1, 1, 4), (2, 5, 6)]
+    assert ver[1]['slope'] == pytest.approx(0.0)
+    assert analysis.driver_stints('HAM')[0]['slope'] == pytest.approx(0.0)
+    
+    assert [stop['loss'] for stop in analysis.stops] == [pytest.approx(18.0), pytest.approx(20.0)]
+    assert analysis.pit_loss == pytest.approx(20.0)
+    assert analysis.finishing_order == ['VER', 'HAM']
+    
+    undercut = analysis.undercuts[0]
+    assert (undercut['driver'], undercut['rival'], undercut['lap'], undercut['rival_lap']) == ('VER', 'HAM', 4, 6)
+    assert undercut['passed']
+
+
+def test_strategy_without_stops_uses_the_default_pit_loss():
+    analysis = StrategyAnalysis(laps_of('VER', [90.0] * 5), [])
+    assert analysis.pit_loss == StrategyAnalysis.DEFAULT_PIT_LOSS
+    assert analysis.undercuts == []
+
+
+def test_project_rejoin():
+    timing = [
+        {'driver': 'VER', 'gap': 'Leader'},
+        {'driver': 'HAM', 'gap': '+5.000'},
+        {'driver': 'ALO', 'gap': '+25.500'},
+        {'driver': 'SAR', 'gap': '+1 Lap'}
+    ]
+    assert project_rejoin(timing, 22.0) == {'VER': 2, 'HAM': 3, 'ALO': 3}
+
+
+def test_lttb_keeps_ends_and_peaks():
+    points = [(x, 0.0) for x in range(100)]
+    points[50] = (50, 10.0)
+    sampled = lttb(points, 10)
+    assert len(sampled) == 10
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (50, 10.0) in sampled
+    assert [x for x, _ in sampled] == sorted(x for x, _ in sampled)
+    assert lttb(points[:5], 10) == points[:5]
+    assert lttb(points, 2) == points